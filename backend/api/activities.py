@@ -1,12 +1,13 @@
 """
 Activities API Router - Unified endpoint for all user activities
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from models.user import UserResponse
 from database import get_db, Database
 from api.deps import get_current_user, get_current_user_optional
+from utils.idempotency import run_idempotent
 from services.activity_service import (
     get_activities,
     get_activity_by_id,
@@ -256,31 +257,38 @@ def delete_activity_endpoint(
 @router.post("/{activity_id}/like", response_model=dict)
 def like_activity_endpoint(
     activity_id: int,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     Toggle like on an activity
 
     Returns: {"liked": true/false, "likes_count": number}
+
+    Toggle is not idempotent by itself, so retries with the same
+    Idempotency-Key return the first response instead of flipping again.
     """
 
-    # Verify activity exists
-    activity = get_activity_by_id(activity_id, current_user.id)
-    if not activity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Activity not found"
-        )
+    def toggle():
+        # Verify activity exists
+        activity = get_activity_by_id(activity_id, current_user.id)
+        if not activity:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Activity not found"
+            )
 
-    liked = like_activity(activity_id, current_user.id)
+        liked = like_activity(activity_id, current_user.id)
 
-    # Get updated count
-    updated_activity = get_activity_by_id(activity_id, current_user.id)
+        # Get updated count
+        updated_activity = get_activity_by_id(activity_id, current_user.id)
 
-    return {
-        "liked": liked,
-        "likes_count": updated_activity['likes_count']
-    }
+        return {
+            "liked": liked,
+            "likes_count": updated_activity['likes_count']
+        }
+
+    return run_idempotent(idempotency_key, current_user.id, "activity_like", {"activity_id": activity_id}, toggle)
 
 
 @router.get("/{activity_id}/comments", response_model=List[CommentResponse])
@@ -305,18 +313,22 @@ def get_comments_endpoint(
 def create_comment_endpoint(
     activity_id: int,
     comment_data: CommentCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """Create a comment on an activity"""
 
     try:
-        comment = create_activity_comment(
-            activity_id=activity_id,
-            user_id=current_user.id,
-            content=comment_data.content,
-            parent_comment_id=comment_data.parent_comment_id
+        return run_idempotent(
+            idempotency_key, current_user.id, "unified_activity_comment",
+            {"activity_id": activity_id, "comment": comment_data.model_dump(mode='json')},
+            lambda: CommentResponse(**create_activity_comment(
+                activity_id=activity_id,
+                user_id=current_user.id,
+                content=comment_data.content,
+                parent_comment_id=comment_data.parent_comment_id
+            ))
         )
-        return CommentResponse(**comment)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
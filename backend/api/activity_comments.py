@@ -2,7 +2,7 @@
 Activity Comments API Router
 피드 활동 댓글 엔드포인트
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from typing import List, Optional
 from pydantic import BaseModel
 from models.user import UserResponse
@@ -12,6 +12,7 @@ from services.activity_comment_service import (
     delete_activity_comment
 )
 from api.deps import get_current_user
+from utils.idempotency import run_idempotent
 
 router = APIRouter()
 
@@ -41,6 +42,7 @@ def get_comments(
 @router.post("/")
 def create_comment(
     request: ActivityCommentCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -53,15 +55,17 @@ def create_comment(
         )
 
     try:
-        comment = create_activity_comment(
-            current_user.id,
-            request.activity_type,
-            request.activity_user_id,
-            request.item_id,
-            request.content,
-            request.parent_comment_id
+        return run_idempotent(
+            idempotency_key, current_user.id, "activity_comment", request,
+            lambda: create_activity_comment(
+                current_user.id,
+                request.activity_type,
+                request.activity_user_id,
+                request.item_id,
+                request.content,
+                request.parent_comment_id
+            )
         )
-        return comment
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -4,6 +4,9 @@ Admin API - Temporary endpoints for database migrations
 """
 from fastapi import APIRouter, HTTPException, Body
 from database import db
+from services.catalog_service import bump_catalog_version
+from services.search_service import refresh_korean_search_keys
+from services.suggest_service import update_suggestions
 
 router = APIRouter()
 
@@ -1313,6 +1316,11 @@ def patch_korean_names(payload: dict = Body(...)):
             except Exception as e:
                 failed.append({"id": char_id, "error": str(e)})
 
+        # 초성 검색 키 / 자동완성 인덱스 갱신 (+ 카탈로그 버전: 상세 문서 / 검색 결과 캐시 무효화)
+        patched_ids = [int(char_id) for char_id in names_dict if str(char_id).isdigit()]
+        refresh_korean_search_keys('character', patched_ids)
+        update_suggestions('character', patched_ids, version=bump_catalog_version())
+
         # Also update activities table
         db.execute_update("""
             UPDATE activities
@@ -1441,6 +1449,11 @@ def patch_korean_names_from_json():
             except Exception as e:
                 failed.append({"id": char_id, "error": str(e)})
 
+        # 초성 검색 키 / 자동완성 인덱스 갱신 (+ 카탈로그 버전: 상세 문서 / 검색 결과 캐시 무효화)
+        patched_ids = [int(char_id) for char_id in names_dict if str(char_id).isdigit()]
+        refresh_korean_search_keys('character', patched_ids)
+        update_suggestions('character', patched_ids, version=bump_catalog_version())
+
         # Update activities table
         db.execute_update("""
             UPDATE activities
@@ -2205,7 +2218,7 @@ def clean_duplicate_character_ratings_by_name(dry_run: bool = True):
                     # Update canonical rating if needed
                     if keep_rating:
                         db.execute_update(
-                            "UPDATE character_ratings SET rating = ? WHERE user_id = ? AND character_id = ?",
+                            "UPDATE character_ratings SET rating = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND character_id = ?",
                             (keep_rating, user_id, canonical_id)
                         )
 
@@ -6,6 +6,9 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
 from pydantic import BaseModel
 from typing import Optional, List
 from database import db
+from services.catalog_service import bump_catalog_version
+from services.search_service import refresh_korean_search_keys, refresh_native_readings
+from services.suggest_service import update_suggestions
 from api.auth import get_current_user
 from utils.r2_storage import upload_file_bytes_to_r2, is_r2_configured, delete_from_r2, extract_object_key_from_url
 import os
@@ -214,6 +217,15 @@ def update_anime(
 
     db.execute_update(query, tuple(values))
 
+    # 원어 제목 정규화 키 / 초성 검색 키 갱신
+    if "title_native" in updates:
+        refresh_native_readings('anime', [anime_id])
+    if "title_korean" in updates or "title_native" in updates:
+        refresh_korean_search_keys('anime', [anime_id])
+
+    # 카탈로그 스냅샷/캐시 재구성 (자동완성 인덱스는 이 항목만 교체)
+    update_suggestions('anime', [anime_id], version=bump_catalog_version())
+
     return {"message": "Anime updated successfully", "updated_fields": list(updates.keys())}
 
 
@@ -319,6 +331,15 @@ def update_character(
     if verify_result:
         print(f"[Admin Editor] After update - image_url: {verify_result[0][0]}, image_local: {verify_result[0][1]}")
 
+    # 원어 이름 정규화 키 / 초성 검색 키 갱신
+    if "name_native" in updates:
+        refresh_native_readings('character', [character_id])
+    if "name_korean" in updates or "name_native" in updates:
+        refresh_korean_search_keys('character', [character_id])
+
+    # 캐릭터 이름/이미지가 들어간 애니 상세 캐시 무효화 (자동완성 인덱스는 이 항목만 교체)
+    update_suggestions('character', [character_id], version=bump_catalog_version())
+
     return {"message": "Character updated successfully", "updated_fields": list(updates.keys())}
 
 
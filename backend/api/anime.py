@@ -2,9 +2,9 @@
 Anime API Router
 애니메이션 조회, 검색
 """
-from fastapi import APIRouter, Query, HTTPException, status, Depends
+from fastapi import APIRouter, Query, Path, HTTPException, status, Depends, Request, Response
 from typing import Optional, List
-from models.anime import AnimeResponse, AnimeDetailResponse, AnimeListResponse
+from models.anime import AnimeResponse, AnimeDetailResponse, AnimeListResponse, TrendingAnimeResponse
 from services.anime_service import (
     get_anime_list,
     get_anime_by_id,
@@ -13,7 +13,10 @@ from services.anime_service import (
     get_top_rated_anime,
     get_all_genres
 )
+from services.trending_service import get_trending_anime
+from services.season_chart_service import get_season_chart, SEASONS
 from api.deps import get_current_user_optional
+from config import SEASON_CHART_BROWSER_MAX_AGE, SEASON_CHART_CDN_MAX_AGE, SEASON_CHART_STALE_WHILE_REVALIDATE
 
 router = APIRouter()
 
@@ -98,6 +101,54 @@ def top_rated(limit: int = Query(50, ge=1, le=100)):
     return get_top_rated_anime(limit=limit)
 
 
+@router.get("/trending", response_model=List[TrendingAnimeResponse])
+def trending(limit: int = Query(20, ge=1, le=100)):
+    """
+    트렌딩 애니메이션 (사이트 내)
+
+    최근 평가/리뷰/좋아요를 시간 감쇠로 합산한 점수 순 (AniList trending과 별개)
+    """
+    return get_trending_anime(limit=limit)
+
+
+@router.get("/seasons/{year}/{season}")
+def season_chart(
+    request: Request,
+    year: int = Path(..., ge=1960, le=2030),
+    season: str = Path(..., description="WINTER, SPRING, SUMMER, FALL")
+):
+    """
+    시즌 차트 (인기순, 장르 + 우리 사이트 평가 통계 포함)
+
+    사전 계산된 gzip JSON을 그대로 반환, CDN 캐시용 Cache-Control / ETag
+    """
+    season = season.upper()
+    if season not in SEASONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="season must be one of WINTER, SPRING, SUMMER, FALL"
+        )
+
+    chart = get_season_chart(year, season)
+    headers = {
+        'Cache-Control': (
+            f"public, max-age={SEASON_CHART_BROWSER_MAX_AGE}, s-maxage={SEASON_CHART_CDN_MAX_AGE}, "
+            f"stale-while-revalidate={SEASON_CHART_STALE_WHILE_REVALIDATE}"
+        ),
+        'ETag': chart.etag,
+        'Vary': 'Accept-Encoding',
+    }
+    if request.headers.get('if-none-match') == chart.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        return Response(
+            content=chart.payload,
+            media_type='application/json',
+            headers={**headers, 'Content-Encoding': 'gzip'}
+        )
+    return Response(content=chart.json_bytes(), media_type='application/json', headers=headers)
+
+
 @router.get("/genres", response_model=List[str])
 def genres():
     """
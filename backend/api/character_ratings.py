@@ -2,7 +2,7 @@
 Character Rating API Router
 캐릭터 평점 생성, 수정, 삭제, 조회 (애니메이션 평점 API와 동일한 구조)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from typing import Optional
 from pydantic import BaseModel, Field
 from models.user import UserResponse
@@ -14,6 +14,7 @@ from services.character_service import (
     delete_character_rating
 )
 from api.deps import get_current_user
+from utils.idempotency import run_idempotent
 
 router = APIRouter()
 
@@ -37,6 +38,7 @@ class CharacterRatingResponse(BaseModel):
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_rating(
     rating_data: CharacterRatingCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -59,11 +61,14 @@ def create_rating(
     # WANT_TO_KNOW 또는 NOT_INTERESTED일 때는 rating을 NULL로 설정
     final_rating = rating_data.rating if rating_data.status == 'RATED' else None
 
-    return create_or_update_character_rating(
-        current_user.id,
-        rating_data.character_id,
-        final_rating,
-        rating_data.status
+    return run_idempotent(
+        idempotency_key, current_user.id, "character_rating", rating_data,
+        lambda: create_or_update_character_rating(
+            current_user.id,
+            rating_data.character_id,
+            final_rating,
+            rating_data.status
+        )
     )
 
 
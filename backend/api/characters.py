@@ -14,6 +14,7 @@ from services.character_service import (
     get_user_character_stats,
     get_character_detail
 )
+from services.trending_service import get_trending_characters
 from api.deps import get_current_user
 
 router = APIRouter()
@@ -143,6 +144,16 @@ def get_my_character_stats(
     return get_user_character_stats(current_user.id)
 
 
+@router.get("/trending")
+def get_trending(limit: int = Query(20, ge=1, le=100)):
+    """
+    트렌딩 캐릭터 (사이트 내)
+
+    최근 평가/리뷰/좋아요를 시간 감쇠로 합산한 점수 순
+    """
+    return get_trending_characters(limit=limit)
+
+
 @router.get("/{character_id}")
 def get_character_by_id(
     character_id: int,
@@ -2,9 +2,9 @@
 Comment Likes API Router
 댓글 좋아요
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from services.comment_like_service import (
     like_comment,
     unlike_comment,
@@ -14,6 +14,7 @@ from services.comment_like_service import (
 )
 from models.user import UserResponse
 from api.deps import get_current_user
+from utils.idempotency import run_idempotent
 
 router = APIRouter()
 
@@ -25,23 +26,29 @@ class CommentLikeRequest(BaseModel):
 @router.post("/")
 def toggle_comment_like(
     request: CommentLikeRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     댓글 좋아요 토글 (좋아요 추가/취소)
+
+    토글이므로 재시도 시 Idempotency-Key로 두 번 뒤집히는 것을 방지
     """
-    # 이미 좋아요한 경우 취소
-    if is_comment_liked(current_user.id, request.comment_id):
-        unlike_comment(current_user.id, request.comment_id)
-        liked = False
-    else:
-        like_comment(current_user.id, request.comment_id)
-        liked = True
+    def toggle():
+        # 이미 좋아요한 경우 취소
+        if is_comment_liked(current_user.id, request.comment_id):
+            unlike_comment(current_user.id, request.comment_id)
+            liked = False
+        else:
+            like_comment(current_user.id, request.comment_id)
+            liked = True
 
-    return {
-        "liked": liked,
-        "like_count": get_comment_like_count(request.comment_id)
-    }
+        return {
+            "liked": liked,
+            "like_count": get_comment_like_count(request.comment_id)
+        }
+
+    return run_idempotent(idempotency_key, current_user.id, "comment_like_toggle", request, toggle)
 
 
 @router.get("/check/{comment_id}")
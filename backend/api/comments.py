@@ -2,7 +2,8 @@
 Comment API Router
 댓글 생성, 삭제, 조회, 좋아요
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from typing import Optional
 from models.comment import CommentCreate, ReplyCreate, CommentResponse, CommentListResponse
 from models.user import UserResponse
 from services.comment_service import (
@@ -14,6 +15,7 @@ from services.comment_service import (
     unlike_comment
 )
 from api.deps import get_current_user
+from utils.idempotency import run_idempotent
 
 router = APIRouter()
 
@@ -21,6 +23,7 @@ router = APIRouter()
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 def create(
     comment_data: CommentCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -30,13 +33,17 @@ def create(
     - **review_type**: "anime" (Phase 1)
     - **content**: 댓글 내용 (1~1000자)
     """
-    return create_comment(current_user.id, comment_data)
+    return run_idempotent(
+        idempotency_key, current_user.id, "review_comment", comment_data,
+        lambda: create_comment(current_user.id, comment_data)
+    )
 
 
 @router.post("/{comment_id}/reply", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 def reply(
     comment_id: int,
     reply_data: ReplyCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -44,7 +51,11 @@ def reply(
 
     댓글에만 답글 가능, 대댓글에는 불가 (최대 2 depth)
     """
-    return create_reply(comment_id, current_user.id, reply_data)
+    return run_idempotent(
+        idempotency_key, current_user.id, "review_comment_reply",
+        {"comment_id": comment_id, "reply": reply_data.model_dump(mode='json')},
+        lambda: create_reply(comment_id, current_user.id, reply_data)
+    )
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -77,6 +88,7 @@ def get_comments(
 @router.post("/{comment_id}/like", response_model=CommentResponse)
 def like(
     comment_id: int,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -84,15 +96,22 @@ def like(
 
     이미 좋아요한 경우 400 에러
     """
-    return like_comment(comment_id, current_user.id)
+    return run_idempotent(
+        idempotency_key, current_user.id, "review_comment_like", {"comment_id": comment_id},
+        lambda: like_comment(comment_id, current_user.id)
+    )
 
 
 @router.delete("/{comment_id}/like", response_model=CommentResponse)
 def unlike(
     comment_id: int,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     댓글 좋아요 취소
     """
-    return unlike_comment(comment_id, current_user.id)
+    return run_idempotent(
+        idempotency_key, current_user.id, "review_comment_unlike", {"comment_id": comment_id},
+        lambda: unlike_comment(comment_id, current_user.id)
+    )
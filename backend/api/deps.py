@@ -2,7 +2,8 @@
 API Dependencies
 FastAPI dependencies (get_current_user, pagination, etc.)
 """
-from fastapi import Depends, HTTPException, status
+import os
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from database import get_db, Database, dict_from_row
@@ -89,3 +90,11 @@ def get_current_user_optional(
 
     user_dict = dict_from_row(user_row)
     return UserResponse(**user_dict)
+
+
+def require_admin_secret(secret: Optional[str] = Query(None)):
+    """
+    내부 지표 엔드포인트용 관리자 확인 (?secret=ADMIN_SECRET, /api/admin/download-db와 같은 방식)
+    """
+    if secret != os.getenv("ADMIN_SECRET", "anipass-local-dev-2024"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid secret key")
@@ -11,9 +11,10 @@ from services.rating_page_service import (
     get_anime_for_rating_stats,
     get_characters_for_rating_stats,
     get_items_for_review_writing,
-    get_review_writing_stats
+    get_review_writing_stats,
+    get_rating_page_metrics
 )
-from api.deps import get_current_user
+from api.deps import get_current_user, require_admin_secret
 
 router = APIRouter()
 
@@ -21,6 +22,7 @@ router = APIRouter()
 @router.get("/anime")
 def get_anime_to_rate(
     limit: int = Query(50, ge=1, le=200, description="한 번에 가져올 개수"),
+    personalized: bool = Query(False, description="장르 선호도 기반 맞춤 순서"),
     current_user: UserResponse = Depends(get_current_user)
 ) -> Dict:
     """
@@ -29,6 +31,7 @@ def get_anime_to_rate(
     특징:
     - 미평가 + WANT_TO_WATCH 항목 반환
     - 매번 다른 랜덤 순서 (가중치 기반)
+    - personalized=true: 내 장르 선호도 × 인기도 순으로 후보 선택
     - 서브쿼리 0개
     - 목표: 0.1초 이내
     - 프론트엔드에서 페이지네이션 처리
@@ -39,7 +42,7 @@ def get_anime_to_rate(
             "total": 123
         }
     """
-    items = get_anime_for_rating(current_user.id, limit)
+    items = get_anime_for_rating(current_user.id, limit, personalized)
 
     return {
         'items': items,
@@ -67,6 +70,16 @@ def get_anime_rating_stats(
     return get_anime_for_rating_stats(current_user.id)
 
 
+@router.get("/anime/metrics", dependencies=[Depends(require_admin_secret)])
+def get_anime_rating_page_metrics() -> Dict:
+    """
+    평가 페이지 순서 모드별 지표 (인기순 vs 맞춤, 관리자 전용: ?secret=ADMIN_SECRET)
+
+    pages_per_rating: 새 평가(RATED) 1개당 페이지 요청 수 (낮을수록 좋음)
+    """
+    return get_rating_page_metrics()
+
+
 @router.get("/characters")
 def get_characters_to_rate(
     limit: int = Query(50, ge=1, le=200, description="한 번에 가져올 개수"),
@@ -2,8 +2,10 @@
 Rating API Router
 평점 생성, 수정, 삭제, 조회
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, BackgroundTasks, Header
 from typing import Optional
+import os
+import tempfile
 from models.rating import (
     RatingCreate,
     RatingUpdate,
@@ -19,7 +21,16 @@ from services.rating_service import (
     get_all_user_ratings,
     delete_rating
 )
+from services.rating_sync_service import get_rating_changes
+from services.import_service import (
+    SUPPORTED_SOURCES,
+    create_import_job,
+    get_import_job,
+    run_import_job
+)
+from config import MAX_IMPORT_FILE_BYTES, IMPORT_UPLOAD_CHUNK_BYTES
 from api.deps import get_current_user
+from utils.idempotency import run_idempotent
 
 router = APIRouter()
 
@@ -27,6 +38,7 @@ router = APIRouter()
 @router.post("/", response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
 def create_rating(
     rating_data: RatingCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -37,8 +49,100 @@ def create_rating(
     - **status**: RATED(평가함), WANT_TO_WATCH(보고싶어요), PASS(패스)
 
     이미 평점이 있으면 수정됨
+    Idempotency-Key 헤더가 같은 재요청은 저장된 응답 반환
+    """
+    return run_idempotent(
+        idempotency_key, current_user.id, "anime_rating", rating_data,
+        lambda: create_or_update_rating(current_user.id, rating_data)
+    )
+
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+def import_ratings(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    source: str = Query(..., description="mal (MyAnimeList XML) 또는 anilist (AniList JSON)"),
+    overwrite: bool = Query(False, description="기존 평점 덮어쓰기"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    외부 애니 리스트 가져오기 (비동기 작업)
+
+    - **source**: mal (MyAnimeList XML, .xml.gz 가능) / anilist (AniList JSON)
+    - **overwrite**: False면 이미 평가한 작품은 건너뜀
+
+    업로드 즉시 job_id를 반환하고, 진행 상황은 GET /import/{job_id}로 조회
+    """
+    if source not in SUPPORTED_SOURCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid source. Allowed: {', '.join(SUPPORTED_SOURCES)}"
+        )
+
+    # 업로드 파일은 응답 후 닫히므로 임시 파일로 옮겨서 백그라운드 작업에 전달
+    # (청크 단위로 복사하면서 크기 제한을 넘는 즉시 중단)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{source}") as tmp:
+        too_large = False
+        while chunk := file.file.read(IMPORT_UPLOAD_CHUNK_BYTES):
+            if tmp.tell() + len(chunk) > MAX_IMPORT_FILE_BYTES:
+                too_large = True
+                break
+            tmp.write(chunk)
+
+    if too_large:
+        os.remove(tmp.name)
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Import file too large"
+        )
+
+    job = create_import_job(current_user.id, source)
+    background_tasks.add_task(run_import_job, job['job_id'], tmp.name, overwrite)
+
+    return job
+
+
+@router.get("/import/{job_id}")
+def get_import_status(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    가져오기 작업 진행 상황
+
+    status: pending, running, completed, failed
+    processed / imported / skipped / unmatched 카운트 포함
+    """
+    job = get_import_job(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
+
+
+@router.get("/changes")
+def get_my_rating_changes(
+    since: Optional[str] = Query(None, description="이전 응답의 cursor (없으면 전체)"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    평점 델타 동기화 (애니 + 캐릭터)
+
+    since 이후 추가/수정된 평점(upserts)과 삭제된 항목 ID(deleted)만 반환
+    응답의 cursor를 다음 요청의 since로 사용
+    full_sync=True면 로컬 캐시를 버리고 upserts로 교체
+
+    Returns:
+        {
+            "cursor": "...",
+            "full_sync": false,
+            "anime": {"upserts": [...], "deleted": [...]},
+            "characters": {"upserts": [...], "deleted": [...]}
+        }
     """
-    return create_or_update_rating(current_user.id, rating_data)
+    return get_rating_changes(current_user.id, since)
 
 
 @router.get("/me/all")
@@ -0,0 +1,49 @@
+"""
+Recommendations API Router
+평점 기반 맞춤 추천
+"""
+from fastapi import APIRouter, Depends, Query
+from api.deps import get_current_user
+from models.user import UserResponse
+from services.recommendation_service import recommend_for_user, get_taste_twins, get_twins_loved
+
+router = APIRouter()
+
+
+@router.get("/me")
+def get_my_recommendations(
+    limit: int = Query(20, ge=1, le=50, description="결과 개수"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    내 평점 기반 추천 애니 (아이템-아이템 협업 필터링)
+
+    - predicted_rating: 예측 평점
+    - because_of: 추천에 가장 크게 기여한 내가 평가한 애니
+    - 평가가 min_ratings개 미만이면 items는 빈 목록
+    """
+    return recommend_for_user(current_user.id, limit)
+
+
+@router.get("/taste-twins")
+def get_my_taste_twins(
+    limit: int = Query(20, ge=1, le=50, description="결과 개수"),
+    exclude_following: bool = Query(False, description="이미 팔로우한 사용자 제외 (팔로우 추천)"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    나와 평점 취향이 비슷한 사용자 (주기적으로 미리 계산)
+
+    - similarity: 공통 평가 애니 기준 유사도
+    - overlap: 공통으로 평가한 애니 수
+    """
+    return get_taste_twins(current_user.id, limit, exclude_following)
+
+
+@router.get("/twins-loved")
+def get_my_twins_loved(
+    limit: int = Query(20, ge=1, le=50, description="결과 개수"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """취향이 비슷한 사용자들이 높게 평가한, 내가 아직 평가하지 않은 애니"""
+    return get_twins_loved(current_user.id, limit)
@@ -2,9 +2,12 @@
 Unified Search API - Public search for anime and characters
 통합 검색 API - 애니메이션과 캐릭터 동시 검색
 """
-from fastapi import APIRouter, Query
-from database import db
-import sqlite3
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from services.search_cache_service import unified_search as cached_unified_search, get_search_cache_stats
+from services.search_service import SEARCH_SORTS
+from services.suggest_service import suggest
+from api.deps import require_admin_secret
+from config import SUGGEST_MAX_LIMIT
 
 router = APIRouter()
 
@@ -19,121 +22,38 @@ def unified_search(
     통합 검색 - 애니메이션과 캐릭터를 동시에 검색
 
     sort options:
-    - popularity_desc: 인기순 (기본)
+    - popularity_desc: 관련도 × 인기순 (기본)
     - rating_desc: 평점 높은순
     - rating_asc: 평점 낮은순
     - title_asc: 제목순
     """
-    results = {"anime": [], "characters": []}
-    pattern = f"%{q}%"
+    if sort not in SEARCH_SORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort. Allowed: {', '.join(SEARCH_SORTS)}"
+        )
 
-    # 애니메이션 검색 (with site ratings calculated via subquery)
-    anime_order = {
-        "popularity_desc": "a.popularity DESC",
-        "rating_desc": "site_avg_rating DESC",
-        "rating_asc": "site_avg_rating ASC",
-        "title_asc": "COALESCE(a.title_korean, a.title_romaji, a.title_english) ASC",
-    }.get(sort, "a.popularity DESC")
+    # FTS5 인덱스 조회 (관련도 × 인기도 순, 다른 정렬은 후보 안에서 재정렬)
+    # 같은 (검색어, sort, limit)은 결과 캐시에서 응답
+    return cached_unified_search(q, sort, limit)
 
-    anime_query = f"""
-        SELECT
-            a.id, a.title_korean, a.title_romaji, a.title_english, a.title_native,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image,
-            a.format, a.episodes, a.status, a.season_year,
-            COALESCE(
-                (SELECT AVG(ur.rating) FROM user_ratings ur
-                 WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL),
-                a.average_score
-            ) as site_avg_rating,
-            (SELECT COUNT(*) FROM user_ratings ur
-             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-            a.popularity
-        FROM anime a
-        WHERE a.title_korean LIKE ?
-           OR a.title_romaji LIKE ?
-           OR a.title_english LIKE ?
-           OR a.title_native LIKE ?
-        ORDER BY {anime_order}
-        LIMIT ?
-    """
-    try:
-        anime_results = db.execute_query(
-            anime_query,
-            (pattern, pattern, pattern, pattern, limit)
-        )
-        results["anime"] = [
-            {
-                "id": row[0],
-                "title_korean": row[1],
-                "title_romaji": row[2],
-                "title_english": row[3],
-                "title_native": row[4],
-                "cover_image_url": row[5],  # Match field name expected by frontend
-                "format": row[6],
-                "episodes": row[7],
-                "status": row[8],
-                "season_year": row[9],
-                "rating": row[10],
-                "rating_count": row[11],
-                "popularity": row[12]
-            }
-            for row in anime_results
-        ]
-    except sqlite3.OperationalError:
-        pass  # Table doesn't exist in local dev
 
-    # 캐릭터 검색 (with site ratings calculated via subquery)
-    char_order = {
-        "popularity_desc": "c.favourites DESC",
-        "rating_desc": "site_avg_rating DESC",
-        "rating_asc": "site_avg_rating ASC",
-        "title_asc": "COALESCE(c.name_korean, c.name_full) ASC",
-    }.get(sort, "c.favourites DESC")
+@router.get("/cache-stats", dependencies=[Depends(require_admin_secret)])
+def search_cache_stats():
+    """통합 검색 결과 캐시 히트/미스 통계 (관리자 전용: ?secret=ADMIN_SECRET)"""
+    return get_search_cache_stats()
+
 
-    char_query = f"""
-        SELECT
-            c.id, c.name_korean, c.name_full, c.name_native,
-            COALESCE('/' || c.image_local, c.image_url) as image_large,
-            c.favourites,
-            (SELECT AVG(cr.rating) FROM character_ratings cr
-             WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_avg_rating,
-            (SELECT COUNT(*) FROM character_ratings cr
-             WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_rating_count,
-            a.id as anime_id,
-            a.title_korean as anime_title_korean,
-            a.title_romaji as anime_title_romaji
-        FROM character c
-        LEFT JOIN anime_character ac ON c.id = ac.character_id
-        LEFT JOIN anime a ON ac.anime_id = a.id
-        WHERE c.name_korean LIKE ?
-           OR c.name_full LIKE ?
-           OR c.name_native LIKE ?
-        GROUP BY c.id
-        ORDER BY {char_order}
-        LIMIT ?
+@router.get("/suggest")
+def search_suggest(
+    q: str = Query(..., min_length=1, description="입력 중인 검색어"),
+    limit: int = Query(10, ge=1, le=SUGGEST_MAX_LIMIT, description="결과 개수")
+):
     """
-    try:
-        char_results = db.execute_query(
-            char_query,
-            (pattern, pattern, pattern, limit)
-        )
-        results["characters"] = [
-            {
-                "id": row[0],
-                "name_korean": row[1],
-                "name_full": row[2],
-                "name_native": row[3],
-                "image_large": row[4],
-                "favourites": row[5],
-                "rating": row[6],
-                "rating_count": row[7],
-                "anime_id": row[8],
-                "anime_title_korean": row[9],
-                "anime_title_romaji": row[10]
-            }
-            for row in char_results
-        ]
-    except sqlite3.OperationalError:
-        pass  # Table doesn't exist in local dev
+    검색창 자동완성 - 제목/이름 접두사 일치 (애니 + 캐릭터, 인기순)
+    메모리 인덱스에서 바로 응답 (키 입력마다 호출해도 DB 조회 없음)
 
-    return results
+    - 띄어쓰기/대소문자 무시, 두 번째 단어부터 입력해도 일치 ("kyojin")
+    - 한국어는 초성으로도 일치 ("ㄱㅁ")
+    """
+    return {"query": q, "suggestions": suggest(q, limit)}
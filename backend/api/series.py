@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from pydantic import BaseModel
 from models.user import UserResponse
-from services.series_service import get_series_info
+from services.series_service import get_series_info, get_franchise
 from services.rating_service import create_or_update_rating
 from models.rating import RatingCreate, RatingStatus
 from api.deps import get_current_user
@@ -36,6 +36,23 @@ def get_anime_sequels(
     return series_info
 
 
+@router.get("/franchise/{anime_id}")
+def get_anime_franchise(
+    anime_id: int,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    애니메이션이 속한 프랜차이즈 전체 (방영 순, 시즌 번호 포함)
+    """
+    franchise = get_franchise(anime_id)
+    if not franchise:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anime not found"
+        )
+    return franchise
+
+
 @router.post("/bulk-rate")
 def bulk_rate_series(
     request: BulkRatingRequest,
@@ -3,6 +3,7 @@ User API Router
 사용자 프로필, 통계
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import List, Dict
 import os
 import shutil
@@ -30,6 +31,7 @@ from services.profile_service import (
     get_director_preferences,
     get_genre_radar_data
 )
+from services.export_service import iter_user_export, EXPORT_FORMATS
 from services.auth_service import update_user_profile, update_user_password, update_user_avatar
 from api.deps import get_current_user
 
@@ -318,6 +320,36 @@ def get_my_genre_radar(
     return get_genre_radar_data(current_user.id)
 
 
+@router.get("/me/export")
+def export_my_data(
+    format: str = Query("csv", description="csv 또는 jsonl"),
+    gzip: bool = Query(False, description="gzip 압축 여부"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    내 데이터 내보내기
+
+    애니 평점, 캐릭터 평점, 애니/캐릭터 리뷰를 CSV 또는 JSONL로 스트리밍
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format: {format}"
+        )
+
+    filename = f"anipass_{current_user.username}.{format}"
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        iter_user_export(current_user.id, format=format, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/{user_id}/profile", response_model=UserProfileResponse)
 def get_user_profile_by_id(user_id: int):
     """
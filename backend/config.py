@@ -71,6 +71,102 @@ MIN_RATINGS_FOR_RECOMMENDATION = 10
 RECOMMENDATION_CACHE_DAYS = 7
 TOP_K_SIMILAR_USERS = 20
 
+# 아이템-아이템 협업 필터링 (anime_similarity, 오프라인/주기 계산)
+ITEM_NEIGHBORS_K = 30  # 애니마다 저장하는 이웃 수
+ITEM_SIMILARITY_MIN_CO_RATERS = 3  # 이보다 적게 함께 평가된 애니 쌍은 무시
+ITEM_SIMILARITY_SHRINKAGE = 10  # 유사도 × n / (n + 축소값) (함께 평가한 수가 적으면 낮춤)
+ITEM_SIMILARITY_REFRESH_HOURS = int(os.getenv("ITEM_SIMILARITY_REFRESH_HOURS", "24"))
+RECOMMENDATION_PREDICTION_DAMPING = 1.0  # 예측 평점 분모에 더해 근거가 적은 후보를 평균 쪽으로
+RECOMMENDATION_MAX_SOURCE_RATINGS = 300  # 이웃을 읽을 평가 수 상한 (평균에서 먼 평가부터, 같으면 최근 것)
+RECOMMENDATION_REFRESH_CHECK_MINUTES = 15  # 백그라운드 재계산 확인 주기
+
+# 사용자-사용자 취향 이웃 (user_similarity, 평가가 바뀐 사용자만 재계산)
+USER_SIMILARITY_MIN_OVERLAP = 5  # 공통 평가 애니가 이보다 적으면 이웃 아님
+USER_SIMILARITY_SHRINKAGE = 10  # 유사도 × n / (n + 축소값)
+USER_SIMILARITY_BATCH_SIZE = 256  # 한 번에 계산하는 사용자 수
+TWINS_LOVED_MIN_RATING = 4.5  # "비슷한 취향이 좋아한" 기준 평점
+TWINS_LOVED_CACHE_SIZE = 50  # 사용자당 recommendation_cache에 저장하는 수
+
+# 장르/태그/스튜디오 기반 유사 애니 (anime_content_similarity, 특징 데이터가 바뀌면 재계산)
+CONTENT_NEIGHBORS_K = 30  # 애니마다 저장하는 이웃 수 (상세 페이지는 같은 프랜차이즈를 빼고 일부만 표시)
+CONTENT_COMMON_FEATURE_DF = 600  # 순수 Python 계산에서 이보다 흔한 특징은 후보 수집에 쓰지 않음
+
+# 사이트 내 트렌딩 (trending_bucket 시간 버킷 → trending_score)
+TRENDING_REFRESH_MINUTES = 10  # 새 활동 집계 / 점수 재계산 주기
+TRENDING_WINDOW_HOURS = 7 * 24  # 이보다 오래된 버킷은 삭제
+TRENDING_HALF_LIFE_HOURS = 24  # 활동 가중치가 절반이 되는 시간
+
+# 시즌 차트 (season_chart, gzip JSON blob)
+SEASON_CHART_CACHE_SIZE = 64  # 메모리에 두는 시즌 수
+SEASON_CHART_CHECK_SECONDS = 5 * 60  # 갱신 필요 여부 확인 주기
+SEASON_CHART_MIN_RATING_CHANGE = 10  # 사이트 평가 수가 이만큼 이상이면서
+SEASON_CHART_RATING_CHANGE_RATIO = 0.05  # 이 비율 이상 바뀌면 다시 만듦
+SEASON_CHART_MAX_AGE_HOURS = 24  # 평가 수 변화가 작아도 이 시간이 지나면 다시 만듦
+SEASON_CHART_BROWSER_MAX_AGE = 60  # Cache-Control max-age
+SEASON_CHART_CDN_MAX_AGE = 5 * 60  # Cache-Control s-maxage (CDN)
+SEASON_CHART_STALE_WHILE_REVALIDATE = 60 * 60
+
+# List import (MyAnimeList / AniList)
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_FILE_BYTES = 20 * 1024 * 1024  # 20MB
+IMPORT_UPLOAD_CHUNK_BYTES = 1024 * 1024  # 업로드를 임시 파일로 옮기는 단위
+MAX_IMPORT_DECOMPRESSED_BYTES = 200 * 1024 * 1024  # .gz 해제 후 최대 크기 (MAL XML은 스트리밍 파싱)
+
+# Idempotency-Key (평점/좋아요/댓글 재시도 중복 방지)
+IDEMPOTENCY_TTL_SECONDS = 10 * 60  # 10분
+IDEMPOTENCY_CACHE_SIZE = 10000
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# Rating delta sync (GET /api/ratings/changes)
+RATING_DELETION_RETENTION_DAYS = 90
+
+# In-memory anime catalog snapshot (crawl_meta.catalog_version 확인 주기)
+CATALOG_VERSION_CHECK_SECONDS = 30
+
+# 애니 상세 문서 캐시 ((anime_id, catalog_version) 키, 디렉터리를 지정하면 디스크에도 저장)
+ANIME_DETAIL_CACHE_SIZE = 2000
+ANIME_DETAIL_CACHE_DIR = os.getenv("ANIME_DETAIL_CACHE_DIR") or None
+
+# Search (FTS5 trigram 인덱스)
+SEARCH_MAX_CANDIDATES = 500  # bm25 상위 후보 수 (이 안에서 인기도 가중 재정렬)
+SEARCH_POPULARITY_WEIGHT = 0.5  # 점수 = bm25 관련도 × (1 + w × log10(1 + 인기도))
+SEARCH_BM25_MAX_MATCHES = 2000  # 이보다 많이 매칭되면 bm25 생략 (인기순)
+
+# 검색어 자동완성 (메모리 접두사 인덱스)
+SUGGEST_MAX_KEYS = int(os.getenv("SUGGEST_MAX_KEYS", "500000"))  # 메모리 예산 (항목 포함 키 1개 ≈ 180B → 약 90MB)
+SUGGEST_MAX_SCAN = 2000  # 이보다 넓은 접두사 범위는 상위 결과를 미리 계산
+SUGGEST_MAX_LIMIT = 20
+
+# 오타 허용 검색 (메모리 trigram 역색인, 정확/FTS 결과가 적을 때만)
+FUZZY_FALLBACK_MIN_RESULTS = 3  # 결과가 이보다 적으면 유사도 검색으로 보충
+FUZZY_MIN_SIMILARITY = 0.45  # max(Jaccard, 0.8 × 검색어 포함률) 하한
+FUZZY_MAX_POSTINGS = 30000  # 검색어당 집계하는 역색인 항목 수 상한 (드문 trigram부터)
+FUZZY_MAX_VARIANTS = int(os.getenv("FUZZY_MAX_VARIANTS", "300000"))  # 메모리 예산 (인기 낮은 항목부터 제외)
+
+# 통합 검색 결과 캐시 (카탈로그 버전이 바뀌면 비움, 사이트 평점 변화는 TTL로 반영)
+SEARCH_CACHE_SIZE = 2000
+SEARCH_CACHE_TTL_SECONDS = 120
+SEARCH_CACHE_PREWARM_COUNT = int(os.getenv("SEARCH_CACHE_PREWARM_COUNT", "100"))  # 시작 시 미리 채울 상위 검색어 (0이면 끔)
+SEARCH_QUERY_LOG_FLUSH_SECONDS = 60  # 검색어 횟수를 search_query_log에 저장하는 주기
+SEARCH_QUERY_LOG_MAX_ROWS = 10000  # search_query_log는 검색 횟수 상위 이만큼만 보관
+SEARCH_QUERY_LOG_RETENTION_DAYS = 30  # 이 기간 동안 검색되지 않은 검색어는 삭제
+
+# 애니 평가 페이지 후보 커서 (사용자별 평가/표시한 애니 비트셋 + 인기순 위치)
+RATING_CURSOR_CACHE_SIZE = 5000
+RATING_CURSOR_TTL_SECONDS = 30 * 60
+
+# 애니 평가 페이지 맞춤 순서 (personalized=true, 장르 선호도 × 인기도)
+RATING_AFFINITY_CACHE_SIZE = 1000  # 사용자당 순서 배열 ≈ 4B × RATING_AFFINITY_ORDER_SIZE
+RATING_AFFINITY_TTL_SECONDS = 60 * 60
+RATING_AFFINITY_ORDER_SIZE = 5000  # 맞춤 순서로 보여줄 상위 후보 수 (넘어가면 인기순)
+RATING_AFFINITY_REFRESH_RATINGS = 20  # 평가가 이만큼 늘면 백그라운드에서 다시 계산
+RATING_AFFINITY_WEIGHT = 1.0  # 점수 = log10(1 + 인기도) + w × 장르 선호도
+RATING_AFFINITY_SHRINKAGE = 5  # 장르 선호도 × n / (n + 축소값) (평가가 적은 장르는 약하게)
+
+# 캐릭터 평가 페이지 후보 (rateable_character + 사용자별 평가한 애니의 캐릭터 목록)
+CHARACTER_POOL_CACHE_SIZE = 2000
+CHARACTER_POOL_TTL_SECONDS = 30 * 60
+
 # Images
 COVER_IMAGES_DIR = DATA_DIR / "images" / "covers"
 IMAGE_BASE_URL = os.getenv("IMAGE_BASE_URL", "http://localhost:8000/images")
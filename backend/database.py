@@ -4,7 +4,7 @@ SQLite3 connection management
 """
 import sqlite3
 from contextlib import contextmanager
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
 from config import DATABASE_PATH
 
 
@@ -66,6 +66,32 @@ class Database:
                 cursor.execute(query)
             return cursor.rowcount
 
+    def iter_query(self, query: str, params: tuple = None, batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        """
+        대량 조회용 제너레이터 - 커서에서 batch_size씩 읽어 한 행씩 yield
+        StreamingResponse는 스레드풀의 여러 스레드에서 next()를 호출하므로
+        이 연결만 check_same_thread=False로 연다 (접근은 항상 순차적)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=60.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def execute_many(self, query: str, params_seq) -> int:
+        """executemany를 단일 트랜잭션으로 실행 후 영향받은 행 수 반환"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, params_seq)
+            return cursor.rowcount
+
 
 # Global database instance
 db = Database()
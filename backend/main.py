@@ -19,7 +19,7 @@ from config import ALLOWED_ORIGINS, COVER_IMAGES_DIR
 import os
 
 # Import API routers
-from api import auth, anime, ratings, reviews, comments, users, series, characters, character_ratings, feed, follows, activity_comments, comment_likes, user_posts, character_reviews, notifications, activities, rating_pages, admin, admin_fix, admin_editor, debug_promotion, bookmarks, search
+from api import auth, anime, ratings, reviews, comments, users, series, characters, character_ratings, feed, follows, activity_comments, comment_likes, user_posts, character_reviews, notifications, activities, rating_pages, admin, admin_fix, admin_editor, debug_promotion, bookmarks, search, recommendations
 
 # Try to import image_proxy router (may fail if dependencies missing)
 try:
@@ -230,6 +230,57 @@ async def startup_event():
         import traceback
         traceback.print_exc()
 
+    # 8.5. Franchise graph (franchise_id / season_number 사전 계산)
+    print("🔗 Building franchise index...")
+    try:
+        from services.series_service import get_franchise_graph
+        graph = get_franchise_graph()
+        print(f"✅ Franchise index ready ({len(graph.members)} franchises)\n")
+    except Exception as e:
+        print(f"WARNING: Failed to build franchise index: {e}\n")
+
+    # 8.6. Search suggest index (자동완성 접두사 인덱스)
+    print("🔤 Building search suggest index...")
+    try:
+        from services.suggest_service import get_suggest_index
+        stats = get_suggest_index().stats()
+        print(f"✅ Suggest index ready ({stats['items']} items, {stats['keys']} keys)\n")
+    except Exception as e:
+        print(f"WARNING: Failed to build suggest index: {e}\n")
+
+    # 8.7. Fuzzy search index (오타 허용 검색 trigram 역색인)
+    print("🔎 Building fuzzy search index...")
+    try:
+        from services.fuzzy_search_service import get_fuzzy_index
+        variants = sum(get_fuzzy_index(item_type).stats()['variants'] for item_type in ('anime', 'character'))
+        print(f"✅ Fuzzy search index ready ({variants} variants)\n")
+    except Exception as e:
+        print(f"WARNING: Failed to build fuzzy search index: {e}\n")
+
+    # 8.8. Search cache prewarm (search_query_log 상위 검색어)
+    try:
+        from services.search_cache_service import prewarm_search_cache
+        warmed = prewarm_search_cache()
+        print(f"✅ Search cache prewarmed ({warmed} queries)\n")
+    except Exception as e:
+        print(f"WARNING: Failed to prewarm search cache: {e}\n")
+
+    # 8.9. Item-item recommendations (오래되면 백그라운드에서 anime_similarity 재계산)
+    try:
+        from services.recommendation_service import start_similarity_refresher
+        start_similarity_refresher()
+        print("✅ Item similarity refresher started\n")
+    except Exception as e:
+        print(f"WARNING: Failed to start item similarity refresher: {e}\n")
+
+    # 8.10. On-site trending (새 활동을 시간 버킷에 집계, 감쇠 점수 재계산)
+    try:
+        from services.trending_service import start_trending_aggregator
+        start_trending_aggregator()
+        print("✅ Trending aggregator started\n")
+    except Exception as e:
+        print(f"WARNING: Failed to start trending aggregator: {e}\n")
+
     # 9. Debug: Log database info
     try:
         from config import DATABASE_PATH
@@ -355,6 +406,16 @@ app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
 # This duplicate was removed to prevent conflicts
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """검색어 횟수 등 메모리에 모아둔 기록 저장"""
+    try:
+        from services.search_cache_service import flush_query_log
+        flush_query_log()
+    except Exception as e:
+        print(f"[Shutdown] WARNING - Failed to flush search query log: {e}")
+
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -395,6 +456,7 @@ app.include_router(comment_likes.router, prefix="/api/comment-likes", tags=["Com
 app.include_router(user_posts.router, prefix="/api/user-posts", tags=["User Posts"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["Notifications"])
 app.include_router(bookmarks.router, prefix="/api/bookmarks", tags=["Bookmarks"])
+app.include_router(recommendations.router, prefix="/api/recommendations", tags=["Recommendations"])
 if IMAGE_PROXY_AVAILABLE:
     app.include_router(image_proxy.router, prefix="/api", tags=["Image Proxy"])  # Auto-download images from AniList
     print("[Startup] ✅ Image proxy router registered")
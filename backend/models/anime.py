@@ -31,7 +31,7 @@ class AnimeResponse(BaseModel):
     favourites: Optional[int]
     source: Optional[str]
     is_adult: bool
-    season_number: Optional[int] = None  # 시즌 번호 (PREQUEL 수 + 1)
+    season_number: Optional[int] = None  # 시즌 번호 (프랜차이즈 내 TV 시즌 순번, series_service에서 사전 계산)
     site_rating_count: Optional[int] = 0  # 우리 사이트 평가 수
     site_average_rating: Optional[float] = None  # 우리 사이트 평균 평점
     user_rating_status: Optional[str] = None  # 현재 사용자의 평가 상태 (RATED, WANT_TO_WATCH, PASS)
@@ -39,6 +39,14 @@ class AnimeResponse(BaseModel):
     airing_status: Optional[str] = None  # 방영 상태 (status 별칭)
 
 
+class TrendingAnimeResponse(AnimeResponse):
+    """트렌딩 애니메이션 (사이트 내 최근 활동 기준)"""
+    trending_score: float
+    trending_ratings: int = 0  # 집계 기간 내 새 평가 수
+    trending_reviews: int = 0  # 집계 기간 내 새 리뷰 수
+    trending_likes: int = 0  # 집계 기간 내 좋아요 수
+
+
 class AnimeDetailResponse(AnimeResponse):
     """애니메이션 상세 정보 (장르, 태그, 캐릭터, 스태프 등 포함)"""
     genres: List[str] = []
@@ -47,6 +55,7 @@ class AnimeDetailResponse(AnimeResponse):
     characters: List[dict] = []  # 캐릭터 & 성우
     staff: List[dict] = []  # 제작진 (감독, 각본 등)
     recommendations: List[dict] = []  # 추천 애니메이션
+    similar_anime: List[dict] = []  # 장르/태그/스튜디오가 비슷한 애니메이션
     external_links: List[dict] = []  # 외부 링크 (스트리밍 등)
     trailer_url: Optional[str]
     site_url: Optional[str]
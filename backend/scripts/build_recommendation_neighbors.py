@@ -0,0 +1,30 @@
+"""
+Build recommendation neighbors 오프라인 실행
+- anime_similarity (아이템-아이템 협업 필터링 이웃) 전체 재계산
+- user_similarity (취향 이웃) 평가가 바뀐 사용자만 재계산 (--all이면 전체)
+- anime_content_similarity (장르/태그/스튜디오 기반 이웃) 전체 재계산
+서버도 RECOMMENDATION_REFRESH_CHECK_MINUTES마다 백그라운드에서 같은 작업을 함
+
+Usage: python scripts/build_recommendation_neighbors.py [--all]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from scripts.ensure_schema import ensure_anime_similarity, ensure_user_similarity, ensure_anime_content_similarity
+from services.recommendation_service import build_item_similarities, refresh_user_similarities
+from services.content_similarity_service import build_content_similarities
+
+
+if __name__ == "__main__":
+    ensure_anime_similarity()
+    ensure_user_similarity()
+    ensure_anime_content_similarity()
+    build_item_similarities()
+    if '--all' in sys.argv:
+        user_ids = [row['user_id'] for row in db.execute_query("SELECT DISTINCT user_id FROM user_ratings")]
+        refresh_user_similarities(user_ids)
+    else:
+        refresh_user_similarities()
+    build_content_similarities()
@@ -60,11 +60,516 @@ def ensure_item_year_column():
         traceback.print_exc()
         raise
 
+def ensure_rating_sync_log():
+    """
+    Ensure delta-sync support for rating libraries
+    - (user_id, updated_at) indexes on user_ratings / character_ratings
+    - rating_deletions tombstone table filled by AFTER DELETE triggers
+    """
+    from config import RATING_DELETION_RETENTION_DAYS
+
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS rating_deletions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                item_type TEXT NOT NULL CHECK(item_type IN ('anime', 'character')),
+                item_id INTEGER NOT NULL,
+                deleted_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_rating_deletions_user_time ON rating_deletions(user_id, deleted_at)"
+        )
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_user_ratings_user_updated ON user_ratings(user_id, updated_at)"
+        )
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_character_ratings_user_updated ON character_ratings(user_id, updated_at)"
+        )
+
+        db.execute_update("""
+            CREATE TRIGGER IF NOT EXISTS log_anime_rating_delete
+            AFTER DELETE ON user_ratings
+            BEGIN
+                INSERT INTO rating_deletions (user_id, item_type, item_id)
+                VALUES (OLD.user_id, 'anime', OLD.anime_id);
+            END
+        """)
+        db.execute_update("""
+            CREATE TRIGGER IF NOT EXISTS log_character_rating_delete
+            AFTER DELETE ON character_ratings
+            BEGIN
+                INSERT INTO rating_deletions (user_id, item_type, item_id)
+                VALUES (OLD.user_id, 'character', OLD.character_id);
+            END
+        """)
+
+        # Old tombstones are useless: clients older than the retention window do a full sync
+        purged = db.execute_update(
+            "DELETE FROM rating_deletions WHERE deleted_at < datetime('now', ?)",
+            (f"-{RATING_DELETION_RETENTION_DAYS} days",)
+        )
+        print(f"✓ Rating sync log ready (purged {purged} old tombstones)")
+    except Exception as e:
+        print(f"Error ensuring rating sync log: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_catalog_version():
+    """Ensure crawl_meta has a catalog_version row (bumped on anime edits / crawls)"""
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS crawl_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        db.execute_update(
+            "INSERT OR IGNORE INTO crawl_meta (key, value) VALUES ('catalog_version', '1')"
+        )
+        print("✓ catalog_version ready")
+    except Exception as e:
+        print(f"Error ensuring catalog_version: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_franchise_columns():
+    """
+    Ensure precomputed franchise columns on anime
+    (filled by services.series_service from the anime_relation graph)
+    """
+    try:
+        columns = db.execute_query("PRAGMA table_info(anime)")
+        col_names = [col['name'] for col in columns]
+
+        for column in ('franchise_id', 'franchise_order', 'season_number'):
+            if column not in col_names:
+                print(f"Adding {column} column to anime table...")
+                db.execute_update(f"ALTER TABLE anime ADD COLUMN {column} INTEGER")
+
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_anime_franchise ON anime(franchise_id, franchise_order)"
+        )
+        print("✓ franchise columns ready")
+    except Exception as e:
+        print(f"Error ensuring franchise columns: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+# 일본어 원제/원어 이름의 정규화 키 (utils.kana, services.search_service.refresh_native_readings로 채움)
+NATIVE_READING_COLUMNS = (
+    ('anime', 'title_native', ('title_native_kana', 'title_native_reading')),
+    ('character', 'name_native', ('name_native_kana', 'name_native_reading')),
+)
+
+def ensure_native_reading_columns():
+    """
+    Ensure kana-folded / Korean reading columns for native titles and names
+    - *_kana: 히라가나·가타카나·반각 통일, 장음 제거
+    - *_reading: 가나로만 된 경우 한글 읽기 (한국어 발음 검색용)
+    """
+    from services.search_service import refresh_native_readings
+
+    try:
+        for table, _, reading_columns in NATIVE_READING_COLUMNS:
+            columns = db.execute_query(f"PRAGMA table_info({table})")
+            col_names = [col['name'] for col in columns]
+            for column in reading_columns:
+                if column not in col_names:
+                    print(f"Adding {column} column to {table} table...")
+                    db.execute_update(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+
+            changed = refresh_native_readings(table)
+            print(f"✓ {table} native reading columns ready, {changed} rows updated")
+    except Exception as e:
+        print(f"Error ensuring native reading columns: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+# FTS5 trigram 검색 인덱스 (공백 제거한 제목/이름, services.search_service에서 조회)
+SEARCH_INDEXES = (
+    ('anime_fts', 'anime', (
+        'title_romaji', 'title_english', 'title_native', 'title_korean',
+        'title_native_kana', 'title_native_reading',
+    )),
+    ('character_fts', 'character', ('name_full', 'name_native', 'name_korean', 'name_native_kana', 'name_native_reading')),
+)
+
+def ensure_search_index():
+    """
+    Ensure FTS5 search tables and their sync triggers
+    - trigram tokenizer: 한국어/일본어도 부분 문자열 검색 가능 (3글자 이상)
+    - INSERT OR REPLACE(크롤러)에서도 중복이 생기지 않도록 INSERT 트리거에서 먼저 DELETE
+    - 색인 컬럼이 바뀌었으면 테이블/트리거를 새로 만들고, 원본과 행 수가 다르면 전체 재구축
+    """
+    try:
+        for fts_table, table, columns in SEARCH_INDEXES:
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f"REPLACE(COALESCE(NEW.{c}, ''), ' ', '')" for c in columns)
+            select_values = ', '.join(f"REPLACE(COALESCE({c}, ''), ' ', '')" for c in columns)
+
+            indexed_columns = tuple(col['name'] for col in db.execute_query(f"PRAGMA table_info({fts_table})"))
+            if indexed_columns and indexed_columns != columns:
+                print(f"Recreating {fts_table} (columns changed)...")
+                for trigger in ('insert', 'update', 'delete'):
+                    db.execute_update(f"DROP TRIGGER IF EXISTS trg_{fts_table}_{trigger}")
+                db.execute_update(f"DROP TABLE {fts_table}")
+
+            db.execute_update(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+                USING fts5({column_list}, tokenize='trigram')
+            """)
+
+            db.execute_update(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    DELETE FROM {fts_table} WHERE rowid = NEW.id;
+                    INSERT INTO {fts_table} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+                END
+            """)
+            db.execute_update(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_update
+                AFTER UPDATE OF {column_list} ON {table}
+                BEGIN
+                    DELETE FROM {fts_table} WHERE rowid = OLD.id;
+                    INSERT INTO {fts_table} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+                END
+            """)
+            db.execute_update(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    DELETE FROM {fts_table} WHERE rowid = OLD.id;
+                END
+            """)
+
+            counts = db.execute_query(
+                f"SELECT (SELECT COUNT(*) FROM {table}) as source, (SELECT COUNT(*) FROM {fts_table}) as indexed",
+                fetch_one=True
+            )
+            if counts['source'] != counts['indexed']:
+                print(f"Rebuilding {fts_table} ({counts['indexed']} → {counts['source']} rows)...")
+                db.execute_update(f"DELETE FROM {fts_table}")
+                db.execute_update(f"""
+                    INSERT INTO {fts_table} (rowid, {column_list})
+                    SELECT id, {select_values} FROM {table}
+                """)
+            print(f"✓ {fts_table} ready")
+
+        # 검색 결과의 사이트 평점 / 대표 출연 애니 일괄 조회용
+        db.execute_update("CREATE INDEX IF NOT EXISTS idx_user_ratings_anime ON user_ratings(anime_id)")
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_character_ratings_character ON character_ratings(character_id)"
+        )
+        db.execute_update("CREATE INDEX IF NOT EXISTS idx_anime_char_char ON anime_character(character_id)")
+    except Exception as e:
+        print(f"Error ensuring search index: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_search_query_log():
+    """Ensure search_query_log (검색어별 횟수, 시작 시 검색 캐시 미리 채우기용)"""
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS search_query_log (
+                query TEXT NOT NULL,
+                sort TEXT NOT NULL,
+                result_limit INTEGER NOT NULL,
+                search_count INTEGER NOT NULL DEFAULT 0,
+                last_searched_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (query, sort, result_limit)
+            )
+        """)
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_search_query_log_count ON search_query_log(search_count DESC)"
+        )
+        print("✓ search_query_log ready")
+    except Exception as e:
+        print(f"Error ensuring search_query_log: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_anime_similarity():
+    """Ensure anime_similarity (아이템-아이템 협업 필터링 이웃, services/recommendation_service가 채움)"""
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS anime_similarity (
+                anime_id INTEGER NOT NULL,
+                similar_anime_id INTEGER NOT NULL,
+                similarity REAL NOT NULL,
+                co_raters INTEGER NOT NULL,
+                PRIMARY KEY (anime_id, similar_anime_id)
+            ) WITHOUT ROWID
+        """)
+        print("✓ anime_similarity ready")
+    except Exception as e:
+        print(f"Error ensuring anime_similarity: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_anime_content_similarity():
+    """Ensure anime_content_similarity (장르/태그/스튜디오 기반 이웃, services/content_similarity_service가 채움)"""
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS anime_content_similarity (
+                anime_id INTEGER NOT NULL,
+                similar_anime_id INTEGER NOT NULL,
+                similarity REAL NOT NULL,
+                PRIMARY KEY (anime_id, similar_anime_id)
+            ) WITHOUT ROWID
+        """)
+        print("✓ anime_content_similarity ready")
+    except Exception as e:
+        print(f"Error ensuring anime_content_similarity: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_rateable_character():
+    """
+    Ensure rateable_character (캐릭터 평가 페이지 후보: 역할/이름 필터를 미리 적용한 (애니, 캐릭터) 쌍)
+    비어 있으면 채움, 이후에는 카탈로그 버전이 바뀔 때 services/rating_page_service가 재구성
+    """
+    from services.rating_page_service import rebuild_rateable_characters
+
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS rateable_character (
+                anime_id INTEGER NOT NULL,
+                character_id INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                favourites INTEGER NOT NULL DEFAULT 0,
+                anime_rank INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (anime_id, character_id)
+            ) WITHOUT ROWID
+        """)
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_rateable_character_character ON rateable_character(character_id)"
+        )
+        if db.execute_query("SELECT 1 FROM rateable_character LIMIT 1", fetch_one=True) is None:
+            rebuild_rateable_characters()
+        print("✓ rateable_character ready")
+    except Exception as e:
+        print(f"Error ensuring rateable_character: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_rating_page_stats():
+    """
+    Ensure rating_page_stats (평가/리뷰 작성 페이지 통계 카운터, 사용자당 1행) and its triggers
+    트리거를 거치지 않은 변경(INSERT OR REPLACE 스크립트 등)도 맞도록 시작 시 전체 재집계
+    """
+    from services.rating_stats_service import install_rating_stats_triggers, recount_rating_stats
+
+    try:
+        install_rating_stats_triggers()
+        users = recount_rating_stats()
+        print(f"✓ rating_page_stats ready ({users} users)")
+    except Exception as e:
+        print(f"Error ensuring rating_page_stats: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_trending():
+    """
+    Ensure on-site trending tables
+    - trending_bucket: (항목, 시간) 별 평가/리뷰/좋아요 수 (TRENDING_WINDOW_HOURS만 보관)
+    - trending_score: 감쇠 점수 (services/trending_service가 주기적으로 다시 계산)
+    """
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS trending_bucket (
+                item_type TEXT NOT NULL CHECK(item_type IN ('anime', 'character')),
+                item_id INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                ratings INTEGER NOT NULL DEFAULT 0,
+                reviews INTEGER NOT NULL DEFAULT 0,
+                likes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (item_type, item_id, hour)
+            ) WITHOUT ROWID
+        """)
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS trending_score (
+                item_type TEXT NOT NULL CHECK(item_type IN ('anime', 'character')),
+                item_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                ratings INTEGER NOT NULL DEFAULT 0,
+                reviews INTEGER NOT NULL DEFAULT 0,
+                likes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (item_type, item_id)
+            ) WITHOUT ROWID
+        """)
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_trending_score_rank ON trending_score(item_type, score DESC)"
+        )
+        print("✓ trending tables ready")
+    except Exception as e:
+        print(f"Error ensuring trending tables: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_season_chart():
+    """Ensure season_chart (시즌별 차트 gzip JSON, services/season_chart_service가 필요할 때 다시 만듦)"""
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS season_chart (
+                season_year INTEGER NOT NULL,
+                season TEXT NOT NULL,
+                catalog_version TEXT,
+                data_hash TEXT NOT NULL,
+                rating_count INTEGER NOT NULL DEFAULT 0,
+                etag TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                built_at INTEGER NOT NULL,
+                PRIMARY KEY (season_year, season)
+            )
+        """)
+        print("✓ season_chart ready")
+    except Exception as e:
+        print(f"Error ensuring season_chart: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_character_primary_anime():
+    """
+    Ensure character_primary_anime (캐릭터별 대표 애니: MAIN 역할 → 애니 인기순)
+    비어 있으면 채움, 이후에는 카탈로그 버전이 바뀔 때 services/character_primary_anime_service가 재구성
+    """
+    from services.character_primary_anime_service import rebuild_character_primary_anime
+
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS character_primary_anime (
+                character_id INTEGER PRIMARY KEY,
+                anime_id INTEGER NOT NULL
+            )
+        """)
+        if db.execute_query("SELECT 1 FROM character_primary_anime LIMIT 1", fetch_one=True) is None:
+            rebuild_character_primary_anime()
+        print("✓ character_primary_anime ready")
+    except Exception as e:
+        print(f"Error ensuring character_primary_anime: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_user_similarity():
+    """
+    Ensure user-user taste neighbors
+    - user_similarity: 사용자별 상위 TOP_K_SIMILAR_USERS 이웃
+    - user_similarity_state: 사용자별 마지막 계산 시각 (평가가 바뀐 사용자만 재계산)
+    - recommendation_cache: "비슷한 취향이 좋아한" 애니 (RECOMMENDATION_CACHE_DAYS 후 만료)
+    """
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS user_similarity (
+                user_id INTEGER NOT NULL,
+                similar_user_id INTEGER NOT NULL,
+                similarity REAL NOT NULL,
+                overlap INTEGER NOT NULL,
+                PRIMARY KEY (user_id, similar_user_id)
+            ) WITHOUT ROWID
+        """)
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_user_similarity_similar ON user_similarity(similar_user_id)"
+        )
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS user_similarity_state (
+                user_id INTEGER PRIMARY KEY,
+                computed_at DATETIME NOT NULL
+            )
+        """)
+        # 마이그레이션 001의 recommendation_cache(predicted_rating, confidence_score, generated_at)는
+        # 다른 곳에서 읽지 않는 캐시이므로 score/reason 스키마로 다시 만듦
+        cache_columns = {col['name'] for col in db.execute_query("PRAGMA table_info(recommendation_cache)")}
+        if cache_columns and not {'score', 'reason', 'created_at'} <= cache_columns:
+            print("Recreating recommendation_cache (legacy schema)...")
+            db.execute_update("DROP TABLE recommendation_cache")
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS recommendation_cache (
+                user_id INTEGER,
+                anime_id INTEGER,
+                score REAL,
+                reason TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, anime_id)
+            )
+        """)
+        print("✓ user_similarity ready")
+    except Exception as e:
+        print(f"Error ensuring user_similarity: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+def ensure_korean_search_keys():
+    """
+    Ensure korean_search_key (초성 / 공백 제거 한국어 키) and resync it
+    관리자 편집·이름 동기화 스크립트가 바로 갱신하지만, 그 외 경로로 바뀐 이름도 시작 시 맞춤
+    """
+    from services.search_service import refresh_korean_search_keys
+
+    try:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS korean_search_key (
+                item_type TEXT NOT NULL CHECK(item_type IN ('anime', 'character')),
+                item_id INTEGER NOT NULL,
+                field TEXT NOT NULL,
+                compact TEXT NOT NULL,
+                chosung TEXT NOT NULL,
+                PRIMARY KEY (item_type, item_id, field)
+            )
+        """)
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_korean_search_chosung ON korean_search_key(item_type, chosung)"
+        )
+        db.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_korean_search_compact ON korean_search_key(item_type, compact)"
+        )
+
+        for item_type in ('anime', 'character'):
+            changed = refresh_korean_search_keys(item_type)
+            print(f"✓ korean_search_key ({item_type}) ready, {changed} keys updated")
+    except Exception as e:
+        print(f"Error ensuring korean search keys: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
 def main():
     """Run all schema updates"""
     print("Ensuring database schema is up to date...")
     ensure_name_korean_column()
     ensure_item_year_column()
+    ensure_rating_sync_log()
+    ensure_catalog_version()
+    ensure_franchise_columns()
+    ensure_native_reading_columns()
+    ensure_search_index()
+    ensure_korean_search_keys()
+    ensure_search_query_log()
+    ensure_anime_similarity()
+    ensure_user_similarity()
+    ensure_anime_content_similarity()
+    ensure_rateable_character()
+    ensure_character_primary_anime()
+    ensure_rating_page_stats()
+    ensure_trending()
+    ensure_season_chart()
     print("✓ Schema check complete")
 
 if __name__ == "__main__":
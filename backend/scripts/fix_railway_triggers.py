@@ -1,16 +1,17 @@
 """
-Fix Railway triggers to use INSERT OR REPLACE
-Railway 트리거를 INSERT OR REPLACE로 수정하여 UNIQUE constraint 에러 방지
+Fix Railway triggers
+평점 트리거는 ON CONFLICT DO UPDATE upsert (activity id 유지), user_posts는 INSERT OR REPLACE
 """
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import db
+from services.activity_sync_service import rating_activity_upsert_sql
 
 
 def fix_triggers():
-    """트리거를 재생성하여 INSERT OR REPLACE 사용"""
+    """트리거 재생성 (평점: upsert, user_posts: INSERT OR REPLACE)"""
 
     print("Dropping old triggers...")
 
@@ -19,9 +20,11 @@ def fix_triggers():
         'trg_anime_rating_insert',
         'trg_anime_rating_update',
         'trg_anime_rating_delete',
+        'trg_anime_rating_unrated',
         'trg_character_rating_insert',
         'trg_character_rating_update',
         'trg_character_rating_delete',
+        'trg_character_rating_unrated',
         'trg_user_post_insert',
         'trg_user_post_update',
         'trg_user_post_delete'
@@ -34,223 +37,56 @@ def fix_triggers():
         except Exception as e:
             print(f"✗ Failed to drop {trigger_name}: {e}")
 
-    print("\nCreating new triggers with INSERT OR REPLACE...")
-
-    # ===== Anime Rating Triggers =====
-
-    # INSERT trigger
-    db.execute_update("""
-        CREATE TRIGGER trg_anime_rating_insert
-        AFTER INSERT ON user_ratings
-        WHEN NEW.status = 'RATED' AND NEW.rating IS NOT NULL
-        BEGIN
-            INSERT OR REPLACE INTO activities (
-                activity_type, user_id, item_id, activity_time,
-                username, display_name, avatar_url, otaku_score,
-                item_title, item_title_korean, item_image,
-                rating, review_title, review_content, is_spoiler,
-                created_at, updated_at
-            )
-            SELECT
-                'anime_rating',
-                NEW.user_id,
-                NEW.anime_id,
-                COALESCE(r.created_at, NEW.updated_at),
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0),
-                a.title_romaji,
-                a.title_korean,
-                COALESCE('/' || a.cover_image_local, a.cover_image_url),
-                NEW.rating,
-                r.title,
-                r.content,
-                COALESCE(r.is_spoiler, 0),
-                NEW.created_at,
-                NEW.updated_at
-            FROM users u
-            JOIN anime a ON a.id = NEW.anime_id
-            LEFT JOIN user_stats us ON u.id = NEW.user_id
-            LEFT JOIN user_reviews r ON r.user_id = NEW.user_id AND r.anime_id = NEW.anime_id
-            WHERE u.id = NEW.user_id;
-        END
-    """)
-    print("✓ Created trg_anime_rating_insert")
-
-    # UPDATE trigger
-    db.execute_update("""
-        CREATE TRIGGER trg_anime_rating_update
-        AFTER UPDATE ON user_ratings
-        WHEN NEW.status = 'RATED' AND NEW.rating IS NOT NULL
-        BEGIN
-            INSERT OR REPLACE INTO activities (
-                activity_type, user_id, item_id, activity_time,
-                username, display_name, avatar_url, otaku_score,
-                item_title, item_title_korean, item_image,
-                rating, review_title, review_content, is_spoiler,
-                created_at, updated_at
-            )
-            SELECT
-                'anime_rating',
-                NEW.user_id,
-                NEW.anime_id,
-                COALESCE(r.created_at, OLD.created_at, NEW.updated_at),
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0),
-                a.title_romaji,
-                a.title_korean,
-                COALESCE('/' || a.cover_image_local, a.cover_image_url),
-                NEW.rating,
-                r.title,
-                r.content,
-                COALESCE(r.is_spoiler, 0),
-                OLD.created_at,
-                NEW.updated_at
-            FROM users u
-            JOIN anime a ON a.id = NEW.anime_id
-            LEFT JOIN user_stats us ON u.id = NEW.user_id
-            LEFT JOIN user_reviews r ON r.user_id = NEW.user_id AND r.anime_id = NEW.anime_id
-            WHERE u.id = NEW.user_id;
-        END
-    """)
-    print("✓ Created trg_anime_rating_update")
-
-    # DELETE trigger
-    db.execute_update("""
-        CREATE TRIGGER trg_anime_rating_delete
-        AFTER DELETE ON user_ratings
-        BEGIN
-            DELETE FROM activities
-            WHERE activity_type = 'anime_rating'
-              AND user_id = OLD.user_id
-              AND item_id = OLD.anime_id;
-        END
-    """)
-    print("✓ Created trg_anime_rating_delete")
-
-    # ===== Character Rating Triggers =====
-
-    # INSERT trigger
-    db.execute_update("""
-        CREATE TRIGGER trg_character_rating_insert
-        AFTER INSERT ON character_ratings
-        WHEN NEW.status = 'RATED' AND NEW.rating IS NOT NULL
-        BEGIN
-            INSERT OR REPLACE INTO activities (
-                activity_type, user_id, item_id, activity_time,
-                username, display_name, avatar_url, otaku_score,
-                item_title, item_title_korean, item_image,
-                rating, review_title, review_content, is_spoiler,
-                anime_id, anime_title, anime_title_korean,
-                created_at, updated_at
-            )
-            SELECT
-                'character_rating',
-                NEW.user_id,
-                NEW.character_id,
-                COALESCE(r.created_at, NEW.updated_at),
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0),
-                c.name_full,
-                c.name_korean,
-                COALESCE('/' || c.image_local, c.image_url),
-                NEW.rating,
-                r.title,
-                r.content,
-                COALESCE(r.is_spoiler, 0),
-                (SELECT a.id FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = NEW.character_id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1),
-                (SELECT a.title_romaji FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = NEW.character_id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1),
-                (SELECT a.title_korean FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = NEW.character_id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1),
-                NEW.created_at,
-                NEW.updated_at
-            FROM users u
-            JOIN character c ON c.id = NEW.character_id
-            LEFT JOIN user_stats us ON u.id = NEW.user_id
-            LEFT JOIN character_reviews r ON r.user_id = NEW.user_id AND r.character_id = NEW.character_id
-            WHERE u.id = NEW.user_id;
-        END
-    """)
-    print("✓ Created trg_character_rating_insert")
-
-    # UPDATE trigger
-    db.execute_update("""
-        CREATE TRIGGER trg_character_rating_update
-        AFTER UPDATE ON character_ratings
-        WHEN NEW.status = 'RATED' AND NEW.rating IS NOT NULL
-        BEGIN
-            INSERT OR REPLACE INTO activities (
-                activity_type, user_id, item_id, activity_time,
-                username, display_name, avatar_url, otaku_score,
-                item_title, item_title_korean, item_image,
-                rating, review_title, review_content, is_spoiler,
-                anime_id, anime_title, anime_title_korean,
-                created_at, updated_at
-            )
-            SELECT
-                'character_rating',
-                NEW.user_id,
-                NEW.character_id,
-                COALESCE(r.created_at, OLD.created_at, NEW.updated_at),
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0),
-                c.name_full,
-                c.name_korean,
-                COALESCE('/' || c.image_local, c.image_url),
-                NEW.rating,
-                r.title,
-                r.content,
-                COALESCE(r.is_spoiler, 0),
-                (SELECT a.id FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = NEW.character_id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1),
-                (SELECT a.title_romaji FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = NEW.character_id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1),
-                (SELECT a.title_korean FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = NEW.character_id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1),
-                OLD.created_at,
-                NEW.updated_at
-            FROM users u
-            JOIN character c ON c.id = NEW.character_id
-            LEFT JOIN user_stats us ON u.id = NEW.user_id
-            LEFT JOIN character_reviews r ON r.user_id = NEW.user_id AND r.character_id = NEW.character_id
-            WHERE u.id = NEW.user_id;
-        END
-    """)
-    print("✓ Created trg_character_rating_update")
-
-    # DELETE trigger
-    db.execute_update("""
-        CREATE TRIGGER trg_character_rating_delete
-        AFTER DELETE ON character_ratings
-        BEGIN
-            DELETE FROM activities
-            WHERE activity_type = 'character_rating'
-              AND user_id = OLD.user_id
-              AND item_id = OLD.character_id;
-        END
-    """)
-    print("✓ Created trg_character_rating_delete")
+    print("\nCreating new triggers...")
+
+    # ===== Anime / Character Rating Triggers =====
+    # activities 동기화 SQL은 services.activity_sync_service와 공유 (ON CONFLICT DO UPDATE)
+
+    for activity_type, table, item_column in (
+        ('anime_rating', 'user_ratings', 'anime_id'),
+        ('character_rating', 'character_ratings', 'character_id'),
+    ):
+        prefix = 'trg_anime_rating' if activity_type == 'anime_rating' else 'trg_character_rating'
+        upsert_sql = rating_activity_upsert_sql(activity_type, 'NEW.user_id', f'NEW.{item_column}')
+
+        # INSERT / UPDATE trigger (RATED)
+        for event in ('INSERT', 'UPDATE'):
+            db.execute_update(f"""
+                CREATE TRIGGER {prefix}_{event.lower()}
+                AFTER {event} ON {table}
+                WHEN NEW.status = 'RATED' AND NEW.rating IS NOT NULL
+                BEGIN
+                    {upsert_sql};
+                END
+            """)
+            print(f"✓ Created {prefix}_{event.lower()}")
+
+        # RATED가 아니게 되면 피드에서 제거
+        db.execute_update(f"""
+            CREATE TRIGGER {prefix}_unrated
+            AFTER UPDATE ON {table}
+            WHEN NEW.status != 'RATED' OR NEW.rating IS NULL
+            BEGIN
+                DELETE FROM activities
+                WHERE activity_type = '{activity_type}'
+                  AND user_id = NEW.user_id
+                  AND item_id = NEW.{item_column};
+            END
+        """)
+        print(f"✓ Created {prefix}_unrated")
+
+        # DELETE trigger
+        db.execute_update(f"""
+            CREATE TRIGGER {prefix}_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                DELETE FROM activities
+                WHERE activity_type = '{activity_type}'
+                  AND user_id = OLD.user_id
+                  AND item_id = OLD.{item_column};
+            END
+        """)
+        print(f"✓ Created {prefix}_delete")
 
     # ===== User Post Triggers =====
 
@@ -328,7 +164,7 @@ def fix_triggers():
     print("✓ Created trg_user_post_delete")
 
     print("\n=== Trigger fix complete ===")
-    print("All triggers now use INSERT OR REPLACE to avoid UNIQUE constraint errors")
+    print("Rating triggers upsert activities in place, user_post triggers use INSERT OR REPLACE")
 
 
 if __name__ == "__main__":
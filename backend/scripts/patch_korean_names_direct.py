@@ -13,6 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import db
 from config import DATABASE_PATH
+from services.catalog_service import bump_catalog_version
+from services.search_service import refresh_korean_search_keys
 
 # JSON 파일 경로 (로컬에서 생성한 데이터)
 KOREAN_NAMES_JSON = Path(__file__).parent / "korean_names_patch.json"
@@ -50,6 +52,9 @@ def patch_korean_names(names_dict):
         except Exception as e:
             failed.append({"id": char_id, "error": str(e)})
 
+    # 초성 검색 키 갱신
+    refresh_korean_search_keys('character', [int(char_id) for char_id in names_dict if str(char_id).isdigit()])
+
     # Also update activities table
     print("\n📝 activities 테이블 업데이트 중...")
     db.execute_update("""
@@ -63,6 +68,9 @@ def patch_korean_names(names_dict):
         AND item_id IS NOT NULL
     """)
 
+    # 애니 상세 문서 / 검색 결과 캐시가 이름을 담고 있으므로 카탈로그 버전 증가
+    print(f"📦 카탈로그 버전: v{bump_catalog_version()}")
+
     print(f"\n{'='*60}")
     print(f"✅ 패치 완료!")
     print(f"  성공: {updated}개")
@@ -9,6 +9,9 @@ import json
 import sqlite3
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.catalog_service import bump_catalog_version
+from services.search_service import refresh_korean_search_keys
+
 def sync_korean_names():
     """Sync Korean names from JSON file to database"""
     # JSON file is in the same directory as this script (scripts/)
@@ -59,9 +62,16 @@ def sync_korean_names():
             if count % 10000 == 0:
                 print(f"Progress: {count}/{len(korean_names)}")
 
+        # 초성 검색 키도 같은 트랜잭션에서 갱신
+        key_count = refresh_korean_search_keys('character', [int(char_id) for char_id in korean_names], conn=conn)
+        print(f"Updated {key_count} Korean search keys")
+
         cursor.execute("COMMIT")
         print(f"✓ Synced {count} Korean names")
 
+        # 애니 상세 문서 / 검색 결과 캐시가 이름을 담고 있으므로 카탈로그 버전 증가
+        bump_catalog_version()
+
     except Exception as e:
         cursor.execute("ROLLBACK")
         print(f"Error during sync: {e}")
@@ -0,0 +1,169 @@
+"""
+Activity Sync Service
+user_ratings / character_ratings → activities 동기화 (단일 upsert)
+
+트리거(NEW.* 참조)와 Python(바인딩 파라미터)이 같은 SQL을 사용
+- INSERT OR REPLACE / DELETE 후 재삽입 대신 ON CONFLICT DO UPDATE
+  → activity id가 유지되어 댓글/좋아요가 보존되고 인덱스 churn이 없음
+- RATED가 아니게 되면 트리거가 activity 삭제 (fix_railway_triggers 참고)
+- 캐릭터 activity의 대표 애니는 character_primary_anime에서 조회
+"""
+from typing import Optional
+from database import db
+from services.character_primary_anime_service import primary_anime_id_sql, ensure_character_primary_anime
+
+
+# activity_time
+# - 트리거: 새 activity면 리뷰 작성 시각/평가 시각, 기존 activity면 그대로 유지
+# - Python(touch=True): 현재 시각으로 올려서 피드 최신으로 이동
+_KEEP_TIME = {
+    'anime_rating': ("COALESCE(r.created_at, ur.updated_at)", "activities.activity_time"),
+    'character_rating': ("COALESCE(r.created_at, cr.updated_at)", "activities.activity_time"),
+}
+_TOUCH_TIME = ("CURRENT_TIMESTAMP", "CURRENT_TIMESTAMP")
+
+_ANIME_RATING_UPSERT = """
+    INSERT INTO activities (
+        activity_type, user_id, item_id, activity_time,
+        username, display_name, avatar_url, otaku_score,
+        item_title, item_title_korean, item_image,
+        rating, review_title, review_content, is_spoiler,
+        created_at, updated_at
+    )
+    SELECT
+        'anime_rating',
+        ur.user_id,
+        ur.anime_id,
+        {insert_time},
+        u.username,
+        u.display_name,
+        u.avatar_url,
+        COALESCE(us.otaku_score, 0),
+        a.title_romaji,
+        a.title_korean,
+        COALESCE('/' || a.cover_image_local, a.cover_image_url),
+        ur.rating,
+        r.title,
+        r.content,
+        COALESCE(r.is_spoiler, 0),
+        ur.created_at,
+        ur.updated_at
+    FROM user_ratings ur
+    JOIN users u ON u.id = ur.user_id
+    JOIN anime a ON a.id = ur.anime_id
+    LEFT JOIN user_stats us ON us.user_id = ur.user_id
+    LEFT JOIN user_reviews r ON r.user_id = ur.user_id AND r.anime_id = ur.anime_id
+    WHERE ur.user_id = {user_id} AND ur.anime_id = {item_id}
+      AND ur.status = 'RATED' AND ur.rating IS NOT NULL
+    ON CONFLICT(activity_type, user_id, item_id) DO UPDATE SET
+        activity_time = {conflict_time},
+        username = excluded.username,
+        display_name = excluded.display_name,
+        avatar_url = excluded.avatar_url,
+        otaku_score = excluded.otaku_score,
+        item_title = excluded.item_title,
+        item_title_korean = excluded.item_title_korean,
+        item_image = excluded.item_image,
+        rating = excluded.rating,
+        review_title = excluded.review_title,
+        review_content = excluded.review_content,
+        is_spoiler = excluded.is_spoiler,
+        updated_at = excluded.updated_at
+"""
+
+_CHARACTER_RATING_UPSERT = """
+    INSERT INTO activities (
+        activity_type, user_id, item_id, activity_time,
+        username, display_name, avatar_url, otaku_score,
+        item_title, item_title_korean, item_image,
+        rating, review_title, review_content, is_spoiler,
+        anime_id, anime_title, anime_title_korean,
+        created_at, updated_at
+    )
+    SELECT
+        'character_rating',
+        cr.user_id,
+        cr.character_id,
+        {insert_time},
+        u.username,
+        u.display_name,
+        u.avatar_url,
+        COALESCE(us.otaku_score, 0),
+        c.name_full,
+        COALESCE(c.name_korean, c.name_native),
+        COALESCE('/' || c.image_local, c.image_url),
+        cr.rating,
+        r.title,
+        r.content,
+        COALESCE(r.is_spoiler, 0),
+        pa.id,
+        pa.title_romaji,
+        pa.title_korean,
+        cr.created_at,
+        cr.updated_at
+    FROM character_ratings cr
+    JOIN users u ON u.id = cr.user_id
+    JOIN character c ON c.id = cr.character_id
+    LEFT JOIN user_stats us ON us.user_id = cr.user_id
+    LEFT JOIN character_reviews r ON r.user_id = cr.user_id AND r.character_id = cr.character_id
+    LEFT JOIN anime pa ON pa.id = {primary_anime_id}
+    WHERE cr.user_id = {user_id} AND cr.character_id = {item_id}
+      AND cr.status = 'RATED' AND cr.rating IS NOT NULL
+    ON CONFLICT(activity_type, user_id, item_id) DO UPDATE SET
+        activity_time = {conflict_time},
+        username = excluded.username,
+        display_name = excluded.display_name,
+        avatar_url = excluded.avatar_url,
+        otaku_score = excluded.otaku_score,
+        item_title = excluded.item_title,
+        item_title_korean = excluded.item_title_korean,
+        item_image = excluded.item_image,
+        rating = excluded.rating,
+        review_title = excluded.review_title,
+        review_content = excluded.review_content,
+        is_spoiler = excluded.is_spoiler,
+        anime_id = excluded.anime_id,
+        anime_title = excluded.anime_title,
+        anime_title_korean = excluded.anime_title_korean,
+        updated_at = excluded.updated_at
+"""
+
+_UPSERT_SQL = {
+    'anime_rating': _ANIME_RATING_UPSERT,
+    'character_rating': _CHARACTER_RATING_UPSERT,
+}
+
+
+def rating_activity_upsert_sql(activity_type: str, user_ref: str, item_ref: str, touch: bool = False) -> str:
+    """
+    평점 → activity upsert SQL
+
+    Args:
+        activity_type: 'anime_rating' 또는 'character_rating'
+        user_ref / item_ref: 트리거에서는 'NEW.user_id' 등, Python에서는 ':user_id' 등
+        touch: True면 activity_time을 현재 시각으로 갱신
+    """
+    insert_time, conflict_time = _TOUCH_TIME if touch else _KEEP_TIME[activity_type]
+    return _UPSERT_SQL[activity_type].format(
+        user_id=user_ref,
+        item_id=item_ref,
+        insert_time=insert_time,
+        conflict_time=conflict_time,
+        primary_anime_id=primary_anime_id_sql('cr.character_id'),
+    )
+
+
+def upsert_rating_activity(activity_type: str, user_id: int, item_id: int, touch: bool = False) -> Optional[str]:
+    """
+    평점 activity를 한 문장으로 생성/갱신하고 activity_time 반환
+
+    RATED 평점이 없으면 아무것도 쓰지 않고 None 반환
+    """
+    if activity_type == 'character_rating':
+        ensure_character_primary_anime()
+    row = db.execute_query(
+        rating_activity_upsert_sql(activity_type, ':user_id', ':item_id', touch=touch) + " RETURNING activity_time",
+        {'user_id': user_id, 'item_id': item_id},
+        fetch_one=True
+    )
+    return row['activity_time'] if row else None
@@ -6,7 +6,44 @@ from typing import List, Optional, Dict
 import random
 from database import db, dict_from_row, dicts_from_rows
 from models.anime import AnimeResponse, AnimeDetailResponse, AnimeListResponse
-from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.relation_loader import attach_anime_relations
+from services.catalog_service import get_catalog, get_catalog_version
+from services.series_service import get_franchise_graph
+from services.search_service import search_anime_ids
+from services.content_similarity_service import get_similar_anime
+from utils.cache import VersionedDocumentCache
+from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ANIME_DETAIL_CACHE_SIZE, ANIME_DETAIL_CACHE_DIR
+
+
+# 애니 상세 문서 캐시 (카탈로그 버전이 바뀌면 자동 무효화)
+_anime_documents = VersionedDocumentCache(
+    'anime_detail', maxsize=ANIME_DETAIL_CACHE_SIZE, directory=ANIME_DETAIL_CACHE_DIR
+)
+
+# 목록 응답 컬럼 (시즌 번호 포함, 로컬 이미지 우선)
+_ANIME_LIST_COLUMNS = """
+    a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean, a.title_korean_official,
+    a.type, a.format, a.status, a.description,
+    a.season, a.season_year, a.episodes, a.duration,
+    COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+    a.cover_image_color, a.banner_image_url,
+    a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
+    COALESCE(a.season_number, 1) as season_number
+"""
+
+
+def _hydrate_anime_rows(anime_ids: List[int]) -> List:
+    """카탈로그에서 고른 페이지의 행을 순서 그대로 조회"""
+    if not anime_ids:
+        return []
+
+    placeholders = ','.join('?' * len(anime_ids))
+    rows = db.execute_query(
+        f"SELECT {_ANIME_LIST_COLUMNS} FROM anime a WHERE a.id IN ({placeholders})",
+        tuple(anime_ids)
+    )
+    by_id = {row['id']: row for row in rows}
+    return [by_id[anime_id] for anime_id in anime_ids if anime_id in by_id]
 
 
 def get_anime_list(
@@ -20,119 +57,55 @@ def get_anime_list(
     sort_by: str = "popularity",
     exclude_user_id: Optional[int] = None
 ) -> AnimeListResponse:
-    """애니메이션 목록 조회 (필터링, 페이지네이션)"""
+    """
+    애니메이션 목록 조회 (필터링, 페이지네이션)
+
+    필터/정렬/페이지네이션은 메모리 카탈로그 스냅샷에서 처리하고
+    SQLite에서는 최종 페이지 행만 조회
+    """
 
     # 페이지 크기 제한
     page_size = min(page_size, MAX_PAGE_SIZE)
     offset = (page - 1) * page_size
 
-    # 기본 쿼리
-    where_clauses = []
-    params = []
-
-    # 필터 조건
-    if genre:
-        where_clauses.append("""
-            id IN (
-                SELECT anime_id FROM anime_genre ag
-                JOIN genre g ON ag.genre_id = g.id
-                WHERE g.name = ?
-            )
-        """)
-        params.append(genre)
-
-    if season:
-        where_clauses.append("season = ?")
-        params.append(season)
-
-    if year:
-        where_clauses.append("season_year = ?")
-        params.append(year)
-
-    if format:
-        where_clauses.append("format = ?")
-        params.append(format)
-
-    if status:
-        where_clauses.append("status = ?")
-        params.append(status)
+    # season_number 컬럼이 현재 카탈로그 버전 기준인지 확인 (바뀌었으면 재계산)
+    get_franchise_graph()
 
     # 이미 평가한 항목 제외 (RATED, PASS 제외, WANT_TO_WATCH는 별도 처리)
+    exclude_ids = None
     if exclude_user_id:
-        where_clauses.append("""
-            id NOT IN (
+        exclude_ids = {
+            row['anime_id'] for row in db.execute_query(
+                """
                 SELECT anime_id FROM user_ratings
                 WHERE user_id = ? AND status IN ('RATED', 'PASS', 'WANT_TO_WATCH')
+                """,
+                (exclude_user_id,)
             )
-        """)
-        params.append(exclude_user_id)
-
-    where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-    # 정렬
-    sort_column = {
-        "popularity": "(popularity + (RANDOM() % 3000)) DESC",  # 랜덤성 추가
-        "score": "average_score DESC",
-        "trending": "trending DESC",
-        "favourites": "favourites DESC",
-        "title": "title_romaji ASC",
-        "recent": "season_year DESC, season DESC"
-    }.get(sort_by, "(popularity + (RANDOM() % 3000)) DESC")
-
-    # 전체 개수 조회
-    count_query = f"SELECT COUNT(*) as total FROM anime WHERE {where_clause}"
-    total = db.execute_query(count_query, tuple(params), fetch_one=True)['total']
-
-    # 목록 조회 (시즌 번호 포함, 로컬 이미지 우선, 우리 사이트 평가 통계, 사용자 평가 상태)
-    user_status_query = ""
-    if exclude_user_id:
-        user_status_query = f"""
-               ,(SELECT ur.status FROM user_ratings ur
-                 WHERE ur.anime_id = a.id AND ur.user_id = {exclude_user_id}) as user_rating_status
-        """
-
-    list_query = f"""
-        SELECT a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean, a.title_korean_official,
-               a.type, a.format, a.status, a.description,
-               a.season, a.season_year, a.episodes, a.duration,
-               COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-               a.cover_image_color, a.banner_image_url,
-               a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM anime_relation ar
-                WHERE ar.anime_id = a.id AND ar.relation_type = 'PREQUEL') + 1 as season_number,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
-               {user_status_query}
-        FROM anime a
-        WHERE {where_clause}
-        ORDER BY {sort_column}
-        LIMIT ? OFFSET ?
-    """
+        }
+
+    catalog = get_catalog()
+    indices = catalog.filter(
+        genre=genre,
+        season=season,
+        year=year,
+        format=format,
+        status=status,
+        exclude_ids=exclude_ids
+    )
+    total = len(indices)
+    indices = catalog.sort(indices, sort_by)
 
     # exclude_user_id가 있으면 WANT_TO_WATCH 3개를 섞어서 포함
-    all_rows = []
     if exclude_user_id and page_size >= 3:
-        # 1. 일반 애니메이션 (page_size - 3)개 가져오기
-        regular_count = page_size - 3
-        regular_rows = db.execute_query(list_query, tuple(params + [regular_count, offset]))
-        all_rows.extend(regular_rows)
+        # 1. 일반 애니메이션 (page_size - 3)개
+        page_ids = [catalog.ids[i] for i in indices[offset:offset + page_size - 3]]
+        all_rows = _hydrate_anime_rows(page_ids)
 
         # 2. WANT_TO_WATCH에서 3개 랜덤하게 가져오기
-        watchlist_query = f"""
-            SELECT a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean, a.title_korean_official,
-                   a.type, a.format, a.status, a.description,
-                   a.season, a.season_year, a.episodes, a.duration,
-                   COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-                   a.cover_image_color, a.banner_image_url,
-                   a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-                   (SELECT COUNT(*) FROM anime_relation ar
-                    WHERE ar.anime_id = a.id AND ar.relation_type = 'PREQUEL') + 1 as season_number,
-                   (SELECT COUNT(*) FROM user_ratings ur
-                    WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-                   (SELECT AVG(ur.rating) FROM user_ratings ur
-                    WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating,
+        watchlist_rows = db.execute_query(
+            f"""
+            SELECT {_ANIME_LIST_COLUMNS},
                    'WANT_TO_WATCH' as user_rating_status
             FROM anime a
             WHERE a.id IN (
@@ -141,34 +114,23 @@ def get_anime_list(
             )
             ORDER BY RANDOM()
             LIMIT 3
-        """
-        watchlist_rows = db.execute_query(watchlist_query, (exclude_user_id,))
+            """,
+            (exclude_user_id,)
+        )
         all_rows.extend(watchlist_rows)
 
         # 3. 섞기
         random.shuffle(all_rows)
     else:
         # exclude_user_id가 없거나 page_size가 작으면 기존 로직
-        all_rows = db.execute_query(list_query, tuple(params + [page_size, offset]))
+        page_ids = [catalog.ids[i] for i in indices[offset:offset + page_size]]
+        all_rows = _hydrate_anime_rows(page_ids)
 
-    # 각 애니메이션에 장르 정보 추가
+    # 장르, 우리 사이트 평가 통계는 페이지 전체를 한 번에 조회
+    anime_dicts = attach_anime_relations(dicts_from_rows(all_rows), genres=True, site_stats=True)
     items = []
-    for row in all_rows:
-        anime_dict = dict_from_row(row)
+    for anime_dict in anime_dicts:
         anime_dict['airing_status'] = anime_dict.get('status')  # airing_status 별칭 추가
-
-        # 장르 가져오기
-        genre_rows = db.execute_query(
-            """
-            SELECT g.name
-            FROM anime_genre ag
-            JOIN genre g ON ag.genre_id = g.id
-            WHERE ag.anime_id = ?
-            """,
-            (anime_dict['id'],)
-        )
-        anime_dict['genres'] = [g['name'] for g in genre_rows]
-
         items.append(AnimeResponse(**anime_dict))
 
     return AnimeListResponse(
@@ -181,7 +143,82 @@ def get_anime_list(
 
 
 def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailResponse]:
-    """애니메이션 상세 정보 조회 (user_id가 있으면 캐릭터별 내 별점 포함)"""
+    """
+    애니메이션 상세 정보 조회 (user_id가 있으면 캐릭터별 내 별점 포함)
+
+    정적인 카탈로그 부분은 (anime_id, catalog_version) 문서 캐시에서 가져오고
+    사이트 평점 통계와 내 별점만 요청마다 덧씌움
+    """
+    version = get_catalog_version()
+    document = _anime_documents.get(anime_id, version)
+    if document is None:
+        document = _build_anime_document(anime_id)
+        if document is None:
+            return None
+        _anime_documents.set(anime_id, version, document)
+
+    anime_dict = dict(document)
+    anime_dict['characters'] = [dict(c) for c in document['characters']]
+    anime_dict['recommendations'] = [dict(r) for r in document['recommendations']]
+
+    # 우리 사이트 평점 분포 (0.5 단위) → 평가 수/평균도 여기서 계산
+    rating_dist_rows = db.execute_query(
+        """
+        SELECT
+            rating,
+            COUNT(*) as count
+        FROM user_ratings
+        WHERE anime_id = ? AND status = 'RATED' AND rating IS NOT NULL
+        GROUP BY rating
+        ORDER BY rating DESC
+        """,
+        (anime_id,)
+    )
+    distribution = [dict_from_row(row) for row in rating_dist_rows]
+    rating_count = sum(d['count'] for d in distribution)
+    anime_dict['site_rating_distribution'] = distribution
+    anime_dict['site_rating_count'] = rating_count
+    anime_dict['site_average_rating'] = (
+        sum(d['rating'] * d['count'] for d in distribution) / rating_count if rating_count else None
+    )
+
+    # 비슷한 애니메이션 (백그라운드에서 다시 계산되므로 문서 캐시에 넣지 않음)
+    anime_dict['similar_anime'] = get_similar_anime(
+        anime_id, limit=6, exclude_ids=[r['id'] for r in anime_dict['recommendations']]
+    )
+
+    # 추천 / 비슷한 애니메이션의 사이트 평가 통계
+    attach_anime_relations(
+        anime_dict['recommendations'] + anime_dict['similar_anime'], genres=False, site_stats=True
+    )
+
+    # 캐릭터별 내 별점
+    my_ratings = {}
+    if user_id and anime_dict['characters']:
+        character_ids = [c['character_id'] for c in anime_dict['characters']]
+        placeholders = ','.join('?' * len(character_ids))
+        rows = db.execute_query(
+            f"""
+            SELECT character_id, rating
+            FROM character_ratings
+            WHERE user_id = ? AND character_id IN ({placeholders})
+            """,
+            (user_id, *character_ids)
+        )
+        my_ratings = {row['character_id']: row['rating'] for row in rows}
+    for character in anime_dict['characters']:
+        character['my_rating'] = my_ratings.get(character['character_id'])
+
+    return AnimeDetailResponse(**anime_dict)
+
+
+def get_anime_document_cache_stats() -> Dict:
+    """상세 문서 캐시 통계"""
+    return _anime_documents.stats()
+
+
+def _build_anime_document(anime_id: int) -> Optional[Dict]:
+    """상세 페이지의 정적 부분 (기본 정보, 장르/태그/스튜디오, 캐릭터, 스태프, 추천, 외부 링크)"""
 
     # 기본 정보 (로컬 이미지 우선)
     anime_row = db.execute_query(
@@ -204,108 +241,40 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
     if anime_row is None:
         return None
 
-    anime_dict = dict_from_row(anime_row)
+    document = dict_from_row(anime_row)
 
-    # 장르
-    genre_rows = db.execute_query(
-        """
-        SELECT g.name
-        FROM anime_genre ag
-        JOIN genre g ON ag.genre_id = g.id
-        WHERE ag.anime_id = ?
-        """,
-        (anime_id,)
-    )
-    anime_dict['genres'] = [row['name'] for row in genre_rows]
+    # 장르, 태그 (상위 10개), 스튜디오
+    attach_anime_relations([document], genres=True, tags=True, studios=True)
 
-    # 태그 (상위 10개)
-    tag_rows = db.execute_query(
+    # 캐릭터 & 성우 (상위 12명, 내 별점은 요청마다 덧씌움)
+    character_rows = db.execute_query(
         """
-        SELECT t.id, t.name, t.description, t.category, at.rank, at.is_spoiler
-        FROM anime_tag at
-        JOIN tag t ON at.tag_id = t.id
-        WHERE at.anime_id = ?
-        ORDER BY at.rank DESC
-        LIMIT 10
-        """,
-        (anime_id,)
-    )
-    anime_dict['tags'] = [dict_from_row(row) for row in tag_rows]
-
-    # 스튜디오
-    studio_rows = db.execute_query(
-        """
-        SELECT s.id, s.name, s.is_animation_studio, ast.is_main
-        FROM anime_studio ast
-        JOIN studio s ON ast.studio_id = s.id
-        WHERE ast.anime_id = ?
-        ORDER BY ast.is_main DESC
+        SELECT
+            c.id as character_id,
+            c.name_full as character_name,
+            c.name_korean as character_name_korean,
+            COALESCE('/' || c.image_local, c.image_url) as character_image,
+            ac.role as character_role,
+            s.id as voice_actor_id,
+            s.name_full as voice_actor_name,
+            s.image_url as voice_actor_image
+        FROM anime_character ac
+        JOIN character c ON ac.character_id = c.id
+        LEFT JOIN character_voice_actor cva ON cva.character_id = c.id AND cva.anime_id = ac.anime_id
+        LEFT JOIN staff s ON cva.staff_id = s.id
+        WHERE ac.anime_id = ?
+        ORDER BY
+            CASE ac.role
+                WHEN 'MAIN' THEN 1
+                WHEN 'SUPPORTING' THEN 2
+                ELSE 3
+            END,
+            c.favourites DESC
+        LIMIT 12
         """,
         (anime_id,)
     )
-    anime_dict['studios'] = [dict_from_row(row) for row in studio_rows]
-
-    # 캐릭터 & 성우 (상위 12명) - user_id가 있으면 내 별점 포함
-    if user_id:
-        character_rows = db.execute_query(
-            """
-            SELECT
-                c.id as character_id,
-                c.name_full as character_name,
-                c.name_korean as character_name_korean,
-                COALESCE('/' || c.image_local, c.image_url) as character_image,
-                ac.role as character_role,
-                s.id as voice_actor_id,
-                s.name_full as voice_actor_name,
-                s.image_url as voice_actor_image,
-                cr.rating as my_rating
-            FROM anime_character ac
-            JOIN character c ON ac.character_id = c.id
-            LEFT JOIN character_voice_actor cva ON cva.character_id = c.id AND cva.anime_id = ac.anime_id
-            LEFT JOIN staff s ON cva.staff_id = s.id
-            LEFT JOIN character_ratings cr ON cr.character_id = c.id AND cr.user_id = ?
-            WHERE ac.anime_id = ?
-            ORDER BY
-                CASE ac.role
-                    WHEN 'MAIN' THEN 1
-                    WHEN 'SUPPORTING' THEN 2
-                    ELSE 3
-                END,
-                c.favourites DESC
-            LIMIT 12
-            """,
-            (user_id, anime_id)
-        )
-    else:
-        character_rows = db.execute_query(
-            """
-            SELECT
-                c.id as character_id,
-                c.name_full as character_name,
-                c.name_korean as character_name_korean,
-                COALESCE('/' || c.image_local, c.image_url) as character_image,
-                ac.role as character_role,
-                s.id as voice_actor_id,
-                s.name_full as voice_actor_name,
-                s.image_url as voice_actor_image,
-                NULL as my_rating
-            FROM anime_character ac
-            JOIN character c ON ac.character_id = c.id
-            LEFT JOIN character_voice_actor cva ON cva.character_id = c.id AND cva.anime_id = ac.anime_id
-            LEFT JOIN staff s ON cva.staff_id = s.id
-            WHERE ac.anime_id = ?
-            ORDER BY
-                CASE ac.role
-                    WHEN 'MAIN' THEN 1
-                    WHEN 'SUPPORTING' THEN 2
-                    ELSE 3
-                END,
-                c.favourites DESC
-            LIMIT 12
-            """,
-            (anime_id,)
-        )
-    anime_dict['characters'] = [dict_from_row(row) for row in character_rows]
+    document['characters'] = [dict_from_row(row) for row in character_rows]
 
     # 스태프 (감독, 각본 등 - 상위 10명)
     staff_rows = db.execute_query(
@@ -330,7 +299,7 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
         """,
         (anime_id,)
     )
-    anime_dict['staff'] = [dict_from_row(row) for row in staff_rows]
+    document['staff'] = [dict_from_row(row) for row in staff_rows]
 
     # 추천 애니메이션 (상위 6개)
     recommendation_rows = db.execute_query(
@@ -343,11 +312,7 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
             a.title_korean_official,
             COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
             a.average_score,
-            ar.rating as recommendation_score,
-            (SELECT COUNT(*) FROM user_ratings ur
-             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-            (SELECT AVG(ur.rating) FROM user_ratings ur
-             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+            ar.rating as recommendation_score
         FROM anime_recommendation ar
         JOIN anime a ON ar.recommended_anime_id = a.id
         WHERE ar.anime_id = ?
@@ -356,7 +321,7 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
         """,
         (anime_id,)
     )
-    anime_dict['recommendations'] = [dict_from_row(row) for row in recommendation_rows]
+    document['recommendations'] = [dict_from_row(row) for row in recommendation_rows]
 
     # 외부 링크 (스트리밍 사이트 등)
     external_link_rows = db.execute_query(
@@ -373,39 +338,9 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
         """,
         (anime_id,)
     )
-    anime_dict['external_links'] = [dict_from_row(row) for row in external_link_rows]
-
-    # 우리 사이트 평가 통계
-    site_stats_row = db.execute_query(
-        """
-        SELECT
-            COUNT(*) as rating_count,
-            AVG(rating) as average_rating
-        FROM user_ratings
-        WHERE anime_id = ? AND status = 'RATED' AND rating IS NOT NULL
-        """,
-        (anime_id,),
-        fetch_one=True
-    )
-    anime_dict['site_rating_count'] = site_stats_row['rating_count'] if site_stats_row else 0
-    anime_dict['site_average_rating'] = site_stats_row['average_rating'] if site_stats_row else None
-
-    # 우리 사이트 평점 분포 (0.5 단위)
-    rating_dist_rows = db.execute_query(
-        """
-        SELECT
-            rating,
-            COUNT(*) as count
-        FROM user_ratings
-        WHERE anime_id = ? AND status = 'RATED' AND rating IS NOT NULL
-        GROUP BY rating
-        ORDER BY rating DESC
-        """,
-        (anime_id,)
-    )
-    anime_dict['site_rating_distribution'] = [dict_from_row(row) for row in rating_dist_rows]
+    document['external_links'] = [dict_from_row(row) for row in external_link_rows]
 
-    return AnimeDetailResponse(**anime_dict)
+    return document
 
 
 def search_anime(
@@ -413,52 +348,17 @@ def search_anime(
     page: int = 1,
     page_size: int = DEFAULT_PAGE_SIZE
 ) -> AnimeListResponse:
-    """애니메이션 검색 (제목 기반, 띄어쓰기 무시)"""
+    """애니메이션 검색 (FTS5 제목 인덱스, 띄어쓰기 무시, 관련도 × 인기도 순)"""
 
     page_size = min(page_size, MAX_PAGE_SIZE)
     offset = (page - 1) * page_size
 
-    # 띄어쓰기 제거한 검색 패턴
-    search_pattern = f"%{query.replace(' ', '')}%"
-
-    # 전체 개수 (띄어쓰기 무시)
-    total = db.execute_query(
-        """
-        SELECT COUNT(*) as total FROM anime
-        WHERE REPLACE(title_romaji, ' ', '') LIKE ?
-           OR REPLACE(title_english, ' ', '') LIKE ?
-           OR REPLACE(title_native, ' ', '') LIKE ?
-           OR REPLACE(title_korean, ' ', '') LIKE ?
-        """,
-        (search_pattern, search_pattern, search_pattern, search_pattern),
-        fetch_one=True
-    )['total']
-
-    # 검색 결과 (로컬 이미지 우선, 우리 사이트 평가 통계, 띄어쓰기 무시)
-    rows = db.execute_query(
-        """
-        SELECT a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean, a.title_korean_official,
-               a.type, a.format, a.status, a.description,
-               a.season, a.season_year, a.episodes, a.duration,
-               COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-               a.cover_image_color, a.banner_image_url,
-               a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
-        FROM anime a
-        WHERE REPLACE(a.title_romaji, ' ', '') LIKE ?
-           OR REPLACE(a.title_english, ' ', '') LIKE ?
-           OR REPLACE(a.title_native, ' ', '') LIKE ?
-           OR REPLACE(a.title_korean, ' ', '') LIKE ?
-        ORDER BY a.popularity DESC
-        LIMIT ? OFFSET ?
-        """,
-        (search_pattern, search_pattern, search_pattern, search_pattern, page_size, offset)
-    )
+    # 전체 매칭 ID (카탈로그 규모라 후보 제한 없이 조회)
+    anime_ids = search_anime_ids(query, max_results=None)
+    total = len(anime_ids)
 
-    items = [AnimeResponse(**dict_from_row(row)) for row in rows]
+    rows = _hydrate_anime_rows(anime_ids[offset:offset + page_size])
+    items = [AnimeResponse(**d) for d in attach_anime_relations(dicts_from_rows(rows), genres=True, site_stats=True)]
 
     return AnimeListResponse(
         items=items,
@@ -479,11 +379,7 @@ def get_popular_anime(limit: int = 50) -> List[AnimeResponse]:
                a.season, a.season_year, a.episodes, a.duration,
                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                a.cover_image_color, a.banner_image_url,
-               a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+               a.average_score, a.popularity, a.favourites, a.source, a.is_adult
         FROM anime a
         ORDER BY a.popularity DESC
         LIMIT ?
@@ -491,7 +387,7 @@ def get_popular_anime(limit: int = 50) -> List[AnimeResponse]:
         (limit,)
     )
 
-    return [AnimeResponse(**dict_from_row(row)) for row in rows]
+    return [AnimeResponse(**d) for d in attach_anime_relations(dicts_from_rows(rows), genres=True, site_stats=True)]
 
 
 def get_top_rated_anime(limit: int = 50) -> List[AnimeResponse]:
@@ -504,11 +400,7 @@ def get_top_rated_anime(limit: int = 50) -> List[AnimeResponse]:
                a.season, a.season_year, a.episodes, a.duration,
                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                a.cover_image_color, a.banner_image_url,
-               a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+               a.average_score, a.popularity, a.favourites, a.source, a.is_adult
         FROM anime a
         WHERE a.average_score IS NOT NULL
         ORDER BY a.average_score DESC, a.popularity DESC
@@ -517,7 +409,7 @@ def get_top_rated_anime(limit: int = 50) -> List[AnimeResponse]:
         (limit,)
     )
 
-    return [AnimeResponse(**dict_from_row(row)) for row in rows]
+    return [AnimeResponse(**d) for d in attach_anime_relations(dicts_from_rows(rows), genres=True, site_stats=True)]
 
 
 def get_all_genres() -> List[str]:
@@ -0,0 +1,262 @@
+"""
+Catalog Service
+프로세스 메모리의 애니 카탈로그 스냅샷 (목록 필터/정렬/페이지네이션용)
+
+- 카탈로그(~3,000개)는 거의 바뀌지 않으므로 정렬/필터 컬럼만 메모리에 올려두고
+  SQLite는 최종 페이지 행 조회에만 사용
+- NumPy가 설치되어 있으면 벡터 연산, 없으면 순수 Python으로 같은 결과
+- crawl_meta.catalog_version이 바뀌면(어드민 수정, 크롤러) 다음 요청 때 재구성
+"""
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from database import db
+from config import CATALOG_VERSION_CHECK_SECONDS
+
+try:
+    import numpy as np
+except ImportError:  # numpy는 선택 의존성
+    np = None
+
+
+CATALOG_VERSION_KEY = 'catalog_version'
+
+# 목록 정렬 (SQL 버전과 동일: popularity는 ±3000 랜덤성, 나머지는 NULL이 뒤로)
+SORT_OPTIONS = ('popularity', 'score', 'trending', 'favourites', 'title', 'recent')
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_version_checked_at = 0.0
+_known_version = None
+
+
+class CatalogSnapshot:
+    """카탈로그 컬럼 스냅샷 (인덱스 i = i번째 애니)"""
+
+    def __init__(self, version: str, rows: List, genre_rows: List):
+        self.version = version
+        self.size = len(rows)
+        self.ids = [row['id'] for row in rows]
+        self.index_of = {anime_id: i for i, anime_id in enumerate(self.ids)}
+
+        self.popularity = [row['popularity'] or 0 for row in rows]
+        # 인기순 인덱스 (ORDER BY COALESCE(popularity, 0) DESC, 같으면 행 순서)
+        self.popularity_order = sorted(range(self.size), key=lambda i: -self.popularity[i])
+        self.average_score = [row['average_score'] for row in rows]
+        self.trending = [row['trending'] for row in rows]
+        self.favourites = [row['favourites'] for row in rows]
+        self.season_year = [row['season_year'] for row in rows]
+        self.title_romaji = [row['title_romaji'] or '' for row in rows]
+        self.season_name = [row['season'] for row in rows]
+
+        # 문자열 컬럼은 코드 배열로 (필터는 정수 비교)
+        self.season, self.season_codes = _encode([row['season'] for row in rows])
+        self.format, self.format_codes = _encode([row['format'] for row in rows])
+        self.status, self.status_codes = _encode([row['status'] for row in rows])
+
+        # 장르 비트셋 (장르 수가 적어 int 하나에 들어감)
+        self.genre_bits = {}
+        genre_masks = [0] * self.size
+        for row in genre_rows:
+            i = self.index_of.get(row['anime_id'])
+            if i is None:
+                continue
+            bit = self.genre_bits.setdefault(row['name'], 1 << len(self.genre_bits))
+            genre_masks[i] |= bit
+        self.genre_masks = genre_masks
+
+        if np is not None:
+            self._np = {
+                'season': np.array(self.season, dtype=np.int16),
+                'format': np.array(self.format, dtype=np.int16),
+                'status': np.array(self.status, dtype=np.int16),
+                'season_year': np.array([y if y is not None else -1 for y in self.season_year], dtype=np.int32),
+                'genre_masks': np.array(genre_masks, dtype=np.int64) if len(self.genre_bits) < 63 else None,
+                'popularity': np.array(self.popularity, dtype=np.int64),
+            }
+
+    def filter(
+        self,
+        genre: Optional[str] = None,
+        season: Optional[str] = None,
+        year: Optional[int] = None,
+        format: Optional[str] = None,
+        status: Optional[str] = None,
+        exclude_ids: Optional[set] = None
+    ) -> List[int]:
+        """조건에 맞는 스냅샷 인덱스 목록"""
+        # 없는 값으로 필터하면 결과 없음
+        if genre and genre not in self.genre_bits:
+            return []
+        conditions = []
+        for column, codes, value in (
+            ('season', self.season_codes, season),
+            ('format', self.format_codes, format),
+            ('status', self.status_codes, status),
+        ):
+            if value:
+                if value not in codes:
+                    return []
+                conditions.append((column, codes[value]))
+
+        if np is not None:
+            indices = self._filter_numpy(genre, conditions, year)
+        else:
+            indices = self._filter_python(genre, conditions, year)
+
+        if exclude_ids:
+            excluded = {self.index_of[a] for a in exclude_ids if a in self.index_of}
+            indices = [i for i in indices if i not in excluded]
+        return indices
+
+    def _filter_numpy(self, genre, conditions, year) -> List[int]:
+        arrays = self._np
+        mask = np.ones(self.size, dtype=bool)
+        for column, code in conditions:
+            mask &= arrays[column] == code
+        if year:
+            mask &= arrays['season_year'] == year
+        if genre:
+            bit = self.genre_bits[genre]
+            if arrays['genre_masks'] is not None:
+                mask &= (arrays['genre_masks'] & bit) != 0
+            else:
+                mask &= np.array([(m & bit) != 0 for m in self.genre_masks], dtype=bool)
+        return np.flatnonzero(mask).tolist()
+
+    def _filter_python(self, genre, conditions, year) -> List[int]:
+        columns = [(getattr(self, column), code) for column, code in conditions]
+        bit = self.genre_bits[genre] if genre else 0
+        return [
+            i for i in range(self.size)
+            if all(values[i] == code for values, code in columns)
+            and (not year or self.season_year[i] == year)
+            and (not bit or self.genre_masks[i] & bit)
+        ]
+
+    def sort(self, indices: List[int], sort_by: str) -> List[int]:
+        """SQL ORDER BY와 같은 순서로 정렬"""
+        if sort_by == 'score':
+            return _sort_desc_nulls_last(indices, self.average_score)
+        if sort_by == 'trending':
+            return _sort_desc_nulls_last(indices, self.trending)
+        if sort_by == 'favourites':
+            return _sort_desc_nulls_last(indices, self.favourites)
+        if sort_by == 'title':
+            return sorted(indices, key=self.title_romaji.__getitem__)
+        if sort_by == 'recent':
+            return sorted(
+                indices,
+                key=lambda i: (
+                    self.season_year[i] is not None, self.season_year[i] or 0,
+                    self.season_name[i] is not None, self.season_name[i] or ''
+                ),
+                reverse=True
+            )
+
+        # popularity (+ RANDOM() % 3000 과 같은 랜덤성)
+        if np is not None:
+            idx = np.array(indices, dtype=np.int64)
+            keys = self._np['popularity'][idx] + np.random.randint(-2999, 3000, size=len(idx))
+            return idx[np.argsort(-keys, kind='stable')].tolist()
+        keyed = [(self.popularity[i] + random.randint(-2999, 2999), i) for i in indices]
+        keyed.sort(reverse=True)
+        return [i for _, i in keyed]
+
+
+def get_catalog() -> CatalogSnapshot:
+    """현재 카탈로그 스냅샷 (버전이 바뀌었으면 재구성)"""
+    global _snapshot
+
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = _build_snapshot(version)
+        return _snapshot
+
+
+def bump_catalog_version() -> str:
+    """
+    카탈로그 버전 증가 (애니 데이터 수정 후 호출)
+    이 프로세스의 스냅샷은 즉시 무효화
+    """
+    global _known_version, _version_checked_at
+
+    db.execute_update(
+        """
+        INSERT INTO crawl_meta (key, value, updated_at)
+        VALUES (?, '1', CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET
+            value = CAST(COALESCE(CAST(value AS INTEGER), 0) + 1 AS TEXT),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (CATALOG_VERSION_KEY,)
+    )
+    _known_version = None
+    _version_checked_at = 0.0
+    return get_catalog_version()
+
+
+def get_catalog_version() -> str:
+    """
+    현재 카탈로그 버전 (스냅샷/캐시 키에 사용)
+    crawl_meta 조회는 CATALOG_VERSION_CHECK_SECONDS마다 한 번만
+    """
+    global _known_version, _version_checked_at
+
+    now = time.monotonic()
+    if _known_version is not None and now - _version_checked_at < CATALOG_VERSION_CHECK_SECONDS:
+        return _known_version
+
+    row = db.execute_query(
+        "SELECT value FROM crawl_meta WHERE key = ?",
+        (CATALOG_VERSION_KEY,),
+        fetch_one=True
+    )
+    _known_version = row['value'] if row and row['value'] else '0'
+    _version_checked_at = now
+    return _known_version
+
+
+def _build_snapshot(version: str) -> CatalogSnapshot:
+    started = time.perf_counter()
+    rows = db.execute_query(
+        """
+        SELECT id, title_romaji, format, status, season, season_year,
+               average_score, popularity, trending, favourites
+        FROM anime
+        """
+    )
+    genre_rows = db.execute_query(
+        """
+        SELECT ag.anime_id, g.name
+        FROM anime_genre ag
+        JOIN genre g ON ag.genre_id = g.id
+        """
+    )
+    snapshot = CatalogSnapshot(version, rows, genre_rows)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"[Catalog] Snapshot v{version} built: {snapshot.size} anime in {elapsed:.0f}ms "
+          f"({'numpy' if np is not None else 'python'})")
+    return snapshot
+
+
+def _encode(values: List[Optional[str]]):
+    """문자열 → 정수 코드 (None은 0)"""
+    codes: Dict[str, int] = {}
+    encoded = []
+    for value in values:
+        if value is None:
+            encoded.append(0)
+        else:
+            encoded.append(codes.setdefault(value, len(codes) + 1))
+    return encoded, codes
+
+
+def _sort_desc_nulls_last(indices: List[int], values: List) -> List[int]:
+    return sorted(indices, key=lambda i: (values[i] is not None, values[i] or 0), reverse=True)
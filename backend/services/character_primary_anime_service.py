@@ -0,0 +1,114 @@
+"""
+Character Primary Anime Service
+캐릭터별 대표 애니 (character_primary_anime) 사전 계산
+
+- 대표 애니: MAIN 역할 우선 → 애니 인기순 → anime_id
+- 피드 / 활동 동기화(트리거 포함) / 검색이 요청마다 anime_character 전체에
+  ROW_NUMBER 윈도우를 돌리거나 정렬 서브쿼리를 실행하는 대신 PK 조회
+- anime_character는 크롤링/관리자 편집으로 바뀌고 둘 다 카탈로그 버전을 올리므로
+  버전이 바뀌면 백그라운드 재구성 (그동안 기존 테이블 사용)
+  읽는 쪽(피드, 검색 캐릭터 결과, 캐릭터 평가 쓰기/활동 동기화)이 ensure_character_primary_anime로 확인
+- 재구성 전에 새로 생긴 캐릭터는 primary_anime_id_sql의 폴백 서브쿼리로 계산
+"""
+import threading
+from database import db
+from services.catalog_service import get_catalog_version
+
+
+CHARACTER_PRIMARY_ANIME_VERSION_KEY = 'character_primary_anime_version'
+
+# {ac}: anime_character 별칭, {a}: anime 별칭
+_PRIMARY_ORDER = "{ac}.role = 'MAIN' DESC, COALESCE({a}.popularity, 0) DESC, {ac}.anime_id"
+
+_primary_version = None
+_primary_rebuilding = False
+_primary_lock = threading.Lock()
+
+
+def primary_anime_id_sql(character_ref: str) -> str:
+    """
+    캐릭터(character_ref: SQL 식)의 대표 anime_id 식 (테이블에 없으면 직접 계산)
+    바깥 쿼리의 별칭과 겹치지 않도록 서브쿼리 별칭은 cpa_*
+    """
+    return f"""COALESCE(
+        (SELECT cpa.anime_id FROM character_primary_anime cpa WHERE cpa.character_id = {character_ref}),
+        (SELECT cpa_ac.anime_id FROM anime_character cpa_ac
+         JOIN anime cpa_a ON cpa_a.id = cpa_ac.anime_id
+         WHERE cpa_ac.character_id = {character_ref}
+         ORDER BY {_PRIMARY_ORDER.format(ac='cpa_ac', a='cpa_a')}
+         LIMIT 1)
+    )"""
+
+
+def rebuild_character_primary_anime() -> int:
+    """character_primary_anime 전체 재구성"""
+    global _primary_version
+
+    with _primary_lock:
+        version = get_catalog_version()
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM character_primary_anime")
+            conn.execute(
+                f"""
+                INSERT INTO character_primary_anime (character_id, anime_id)
+                SELECT character_id, anime_id
+                FROM (
+                    SELECT
+                        ac.character_id,
+                        ac.anime_id,
+                        ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY {_PRIMARY_ORDER.format(ac='ac', a='a')}) as rn
+                    FROM anime_character ac
+                    JOIN anime a ON a.id = ac.anime_id
+                )
+                WHERE rn = 1
+                """
+            )
+            count = conn.execute("SELECT COUNT(*) FROM character_primary_anime").fetchone()[0]
+            conn.execute(
+                """
+                INSERT INTO crawl_meta (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+                """,
+                (CHARACTER_PRIMARY_ANIME_VERSION_KEY, version)
+            )
+            conn.commit()
+
+        _primary_version = version
+        print(f"[CharacterPrimaryAnime] Rebuilt for catalog v{version}: {count} characters")
+        return count
+
+
+def ensure_character_primary_anime():
+    """카탈로그 버전이 바뀌었으면 백그라운드에서 재구성"""
+    global _primary_version, _primary_rebuilding
+
+    version = get_catalog_version()
+    if _primary_version == version:
+        return
+
+    row = db.execute_query(
+        "SELECT value FROM crawl_meta WHERE key = ?",
+        (CHARACTER_PRIMARY_ANIME_VERSION_KEY,),
+        fetch_one=True
+    )
+    if row and row['value'] == version:
+        # 다른 프로세스가 이미 재구성
+        _primary_version = version
+        return
+
+    with _primary_lock:
+        if _primary_rebuilding:
+            return
+        _primary_rebuilding = True
+
+    def rebuild():
+        global _primary_rebuilding
+        try:
+            rebuild_character_primary_anime()
+        except Exception as e:
+            print(f"[CharacterPrimaryAnime] Rebuild failed: {e}")
+        finally:
+            _primary_rebuilding = False
+
+    threading.Thread(target=rebuild, daemon=True).start()
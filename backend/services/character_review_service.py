@@ -5,6 +5,7 @@ Character Review Service
 from typing import List, Optional
 from fastapi import HTTPException, status
 from database import db, dict_from_row
+from services.activity_sync_service import upsert_rating_activity
 from models.character_review import (
     CharacterReviewCreate,
     CharacterReviewUpdate,
@@ -52,7 +53,7 @@ def create_character_review(user_id: int, review_data: CharacterReviewCreate) ->
     if review_data.rating is not None:
         try:
             from services.character_service import rate_character
-            # 별점 저장 (이미 _sync_character_rating_to_activities 호출됨)
+            # 별점 저장 (activities 동기화 포함)
             rate_character(user_id, review_data.character_id, review_data.rating)
         except Exception as e:
             # 별점 저장 실패해도 리뷰는 계속 진행
@@ -70,19 +71,8 @@ def create_character_review(user_id: int, review_data: CharacterReviewCreate) ->
          review_data.content, 1 if review_data.is_spoiler else 0)
     )
 
-    # Sync to activities (리뷰 생성 시 activities 업데이트)
-    from services.character_service import _sync_character_rating_to_activities
-    _sync_character_rating_to_activities(user_id, review_data.character_id)
-
-    # Update activity_time to current time (move to recent feed)
-    db.execute_update("""
-        UPDATE activities
-        SET activity_time = CURRENT_TIMESTAMP,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE activity_type = 'character_rating'
-          AND user_id = ?
-          AND item_id = ?
-    """, (user_id, review_data.character_id))
+    # Sync to activities (리뷰 생성 시 activities 업데이트 + 피드 최신으로 이동)
+    upsert_rating_activity('character_rating', user_id, review_data.character_id, touch=True)
 
     return get_character_review_by_id(review_id)
 
@@ -141,20 +131,8 @@ def update_character_review(review_id: int, user_id: int, review_data: Character
             tuple(params)
         )
 
-    # Sync to activities (리뷰 수정 시 activities도 업데이트)
-    # Note: 별점 업데이트 시 이미 sync가 호출되었지만, 리뷰 내용도 반영하기 위해 다시 호출
-    from services.character_service import _sync_character_rating_to_activities
-    _sync_character_rating_to_activities(user_id, character_id)
-
-    # Update activity_time to current time (move to recent feed)
-    db.execute_update("""
-        UPDATE activities
-        SET activity_time = CURRENT_TIMESTAMP,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE activity_type = 'character_rating'
-          AND user_id = ?
-          AND item_id = ?
-    """, (user_id, character_id))
+    # Sync to activities (리뷰 내용 반영 + 피드 최신으로 이동)
+    upsert_rating_activity('character_rating', user_id, character_id, touch=True)
 
     return get_character_review_by_id(review_id)
 
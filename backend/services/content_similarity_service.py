@@ -0,0 +1,269 @@
+"""
+Content Similarity Service
+장르 / 태그 / 스튜디오 / 원작 기반 애니 유사도 (평가가 적은 신작도 비슷한 작품을 보여주기 위함)
+
+- 특징 가중치: TF-IDF 형태 (idf = log(전체 애니 수 / 특징을 가진 애니 수))
+  태그는 rank/100, 메인이 아닌 스튜디오는 절반, 특징 종류별로 _FEATURE_WEIGHTS를 곱함
+- 애니별 벡터를 L2 정규화한 뒤 코사인 상위 CONTENT_NEIGHBORS_K개를 anime_content_similarity에 저장
+- SciPy가 있으면 배치 희소 행렬 곱 (전체 카탈로그 정확 계산),
+  없으면 역색인 근사: 드문 특징으로 후보를 모은 뒤 상위 후보만 정확히 채점
+  (흔한 장르/태그는 idf가 작아 순위에 주는 영향이 적음)
+- 장르/태그/스튜디오/원작 데이터가 바뀌면 (지문 비교) recommendation_service의 백그라운드 작업이 다시 계산
+  (제목 수정처럼 특징과 무관한 카탈로그 변경으로는 다시 계산하지 않음)
+"""
+import heapq
+import math
+import threading
+import time
+from typing import Dict, List
+from database import db, dict_from_row
+from config import CONTENT_NEIGHBORS_K, CONTENT_COMMON_FEATURE_DF
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy / scipy는 선택 의존성
+    np = None
+    sparse = None
+
+
+CONTENT_SIMILARITY_FINGERPRINT_KEY = 'content_similarity_fingerprint'
+
+# 특징 종류별 가중치
+_FEATURE_WEIGHTS = {
+    'genre': 1.0,
+    'tag': 1.0,
+    'studio': 0.8,
+    'source': 0.5,
+}
+
+# 한 번에 곱하는 애니 수 (배치 × 전체 애니 밀집 행렬)
+_BATCH_SIZE = 1024
+
+_build_lock = threading.Lock()
+
+
+def build_content_similarities() -> Dict:
+    """anime_content_similarity 전체 재계산"""
+    with _build_lock:
+        started = time.perf_counter()
+        fingerprint = _feature_fingerprint()
+        vectors = _load_feature_vectors()
+
+        if sparse is not None:
+            neighbors = _neighbors_scipy(vectors)
+        else:
+            neighbors = _neighbors_python(vectors)
+
+        rows = [
+            (anime_id, other_id, round(similarity, 6))
+            for anime_id, items in neighbors.items()
+            for similarity, other_id in items
+        ]
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM anime_content_similarity")
+            conn.executemany(
+                """
+                INSERT INTO anime_content_similarity (anime_id, similar_anime_id, similarity)
+                VALUES (?, ?, ?)
+                """,
+                rows
+            )
+            conn.execute(
+                """
+                INSERT INTO crawl_meta (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+                """,
+                (CONTENT_SIMILARITY_FINGERPRINT_KEY, fingerprint)
+            )
+            conn.commit()
+
+        elapsed = (time.perf_counter() - started) * 1000
+        stats = {
+            'anime': len(vectors),
+            'pairs': len(rows),
+            'elapsed_ms': round(elapsed),
+            'engine': 'scipy' if sparse is not None else 'python',
+        }
+        print(f"[ContentSimilarity] Built: {stats}")
+        return stats
+
+
+def content_similarities_are_stale() -> bool:
+    """마지막 계산 이후 특징 데이터가 바뀌었는지"""
+    row = db.execute_query(
+        "SELECT value FROM crawl_meta WHERE key = ?",
+        (CONTENT_SIMILARITY_FINGERPRINT_KEY,),
+        fetch_one=True
+    )
+    return row is None or row['value'] != _feature_fingerprint()
+
+
+def get_similar_anime(anime_id: int, limit: int = 6, exclude_ids=()) -> List[Dict]:
+    """장르/태그/스튜디오가 비슷한 애니 (같은 프랜차이즈와 exclude_ids 제외)"""
+    rows = db.execute_query(
+        """
+        SELECT
+            a.id,
+            a.title_romaji,
+            a.title_english,
+            a.title_korean,
+            a.title_korean_official,
+            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+            a.average_score,
+            s.similarity
+        FROM anime_content_similarity s
+        JOIN anime a ON a.id = s.similar_anime_id
+        WHERE s.anime_id = ?
+          AND (a.franchise_id IS NULL
+               OR a.franchise_id IS NOT (SELECT franchise_id FROM anime WHERE id = s.anime_id))
+        ORDER BY s.similarity DESC
+        """,
+        (anime_id,)
+    )
+    excluded = set(exclude_ids)
+    similar = []
+    for row in rows:
+        if row['id'] in excluded:
+            continue
+        item = dict_from_row(row)
+        item['similarity'] = round(item['similarity'], 3)
+        similar.append(item)
+        if len(similar) >= limit:
+            break
+    return similar
+
+
+def _feature_fingerprint() -> str:
+    """특징 테이블의 행 수 + 내용 합 (전체 스캔이지만 정수 집계라 빠름)"""
+    row = db.execute_query(
+        """
+        SELECT
+            (SELECT COUNT(*) || ':' || COALESCE(SUM(anime_id * 31 + genre_id), 0) FROM anime_genre) || '/' ||
+            (SELECT COUNT(*) || ':' || COALESCE(SUM(anime_id * 31 + tag_id * 7 + COALESCE(rank, 0)), 0) FROM anime_tag) || '/' ||
+            (SELECT COUNT(*) || ':' || COALESCE(SUM(anime_id * 31 + studio_id * 2 + is_main), 0) FROM anime_studio) || '/' ||
+            (SELECT COUNT(*) || ':' || COALESCE(SUM(id * unicode(source) * length(source)), 0)
+             FROM anime WHERE source IS NOT NULL) as fingerprint
+        """,
+        fetch_one=True
+    )
+    return row['fingerprint']
+
+
+def _load_feature_vectors() -> Dict[int, Dict[str, float]]:
+    """anime_id → {특징: 정규화한 가중치} (인기순)"""
+    raw: Dict[int, Dict[str, float]] = {}
+
+    for row in db.iter_query("SELECT id, source FROM anime ORDER BY popularity DESC"):
+        raw[row['id']] = {f"source:{row['source']}": 1.0} if row['source'] else {}
+    for row in db.iter_query("SELECT anime_id, genre_id FROM anime_genre"):
+        if row['anime_id'] in raw:
+            raw[row['anime_id']][f"genre:{row['genre_id']}"] = 1.0
+    for row in db.iter_query("SELECT anime_id, tag_id, rank FROM anime_tag"):
+        if row['anime_id'] in raw and row['rank']:
+            raw[row['anime_id']][f"tag:{row['tag_id']}"] = row['rank'] / 100
+    for row in db.iter_query("SELECT anime_id, studio_id, is_main FROM anime_studio"):
+        if row['anime_id'] in raw:
+            raw[row['anime_id']][f"studio:{row['studio_id']}"] = 1.0 if row['is_main'] else 0.5
+
+    raw = {anime_id: features for anime_id, features in raw.items() if features}
+    document_frequency: Dict[str, int] = {}
+    for features in raw.values():
+        for feature in features:
+            document_frequency[feature] = document_frequency.get(feature, 0) + 1
+
+    total = len(raw)
+    vectors = {}
+    for anime_id, features in raw.items():
+        weighted = {
+            feature: weight * _FEATURE_WEIGHTS[feature.split(':', 1)[0]] * math.log(total / document_frequency[feature])
+            for feature, weight in features.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weighted.values()))
+        if norm:
+            vectors[anime_id] = {feature: w / norm for feature, w in weighted.items() if w}
+    return vectors
+
+
+def _neighbors_python(vectors: Dict[int, Dict[str, float]]) -> Dict[int, List[tuple]]:
+    """
+    역색인으로 근사 계산
+    - CONTENT_COMMON_FEATURE_DF 이하로 드문 특징(idf가 커서 유사도를 좌우)으로만 내적을 누적 (Σ df² 폭증 방지)
+    - 부분 점수 상위 후보만 흔한 특징까지 더해 정확히 다시 채점
+    - 드문 특징이 없으면 가장 덜 흔한 특징의 인기 애니를 후보로
+    """
+    postings: Dict[str, List[tuple]] = {}
+    for anime_id, features in vectors.items():
+        for feature, weight in features.items():
+            postings.setdefault(feature, []).append((anime_id, weight))
+
+    candidate_count = CONTENT_NEIGHBORS_K * 5
+    neighbors = {}
+    for anime_id, features in vectors.items():
+        partial: Dict[int, float] = {}
+        common = []
+        for feature, weight in features.items():
+            if len(postings[feature]) > CONTENT_COMMON_FEATURE_DF:
+                common.append((feature, weight))
+                continue
+            for other_id, other_weight in postings[feature]:
+                partial[other_id] = partial.get(other_id, 0.0) + weight * other_weight
+        partial.pop(anime_id, None)
+
+        candidates = heapq.nlargest(candidate_count, partial, key=partial.get)
+        if len(candidates) < candidate_count:
+            rarest = min(features, key=lambda feature: len(postings[feature]))
+            extra = set(candidates)
+            for other_id, _ in postings[rarest]:
+                if len(extra) >= candidate_count:
+                    break
+                if other_id != anime_id:
+                    extra.add(other_id)
+            candidates = list(extra)
+
+        # 드문 특징 내적은 이미 정확하므로 흔한 특징만 더함
+        scored = []
+        for other_id in candidates:
+            other = vectors[other_id]
+            dot = partial.get(other_id, 0.0)
+            for feature, weight in common:
+                dot += weight * other.get(feature, 0.0)
+            if dot > 0:
+                scored.append((dot, other_id))
+        top = heapq.nlargest(CONTENT_NEIGHBORS_K, scored)
+        if top:
+            neighbors[anime_id] = top
+    return neighbors
+
+
+def _neighbors_scipy(vectors: Dict[int, Dict[str, float]]) -> Dict[int, List[tuple]]:
+    """정규화한 특징 행렬 F로 F_batch F^T를 배치 단위로 계산해 행마다 상위 K개"""
+    anime_ids = list(vectors)
+    feature_index: Dict[str, int] = {}
+    rows, cols, values = [], [], []
+    for i, anime_id in enumerate(anime_ids):
+        for feature, weight in vectors[anime_id].items():
+            rows.append(i)
+            cols.append(feature_index.setdefault(feature, len(feature_index)))
+            values.append(weight)
+
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(anime_ids), len(feature_index)), dtype=np.float32)
+    transposed = matrix.T.tocsc()
+    k = min(CONTENT_NEIGHBORS_K, len(anime_ids) - 1)
+
+    neighbors = {}
+    for start in range(0, len(anime_ids), _BATCH_SIZE):
+        scores = (matrix[start:start + _BATCH_SIZE] @ transposed).toarray()
+        scores[np.arange(scores.shape[0]), np.arange(start, start + scores.shape[0])] = 0
+        if k <= 0:
+            break
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for offset, columns in enumerate(top):
+            items = sorted(
+                ((float(scores[offset, j]), anime_ids[j]) for j in columns if scores[offset, j] > 0),
+                reverse=True
+            )
+            if items:
+                neighbors[anime_ids[start + offset]] = items
+    return neighbors
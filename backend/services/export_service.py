@@ -0,0 +1,151 @@
+"""
+Export Service
+사용자 데이터 내보내기 (애니/캐릭터 평점, 리뷰)
+
+DB 커서에서 바로 읽어 청크 단위로 내보내므로 행 수와 무관하게 메모리 사용량 일정
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Iterator
+from database import db
+
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+EXPORT_COLUMNS = [
+    'type', 'item_id', 'title', 'title_korean', 'title_native',
+    'rating', 'status', 'review_title', 'review_content', 'is_spoiler',
+    'created_at', 'updated_at',
+]
+
+# 이 행 수마다 한 번씩 청크를 내보냄
+EXPORT_CHUNK_ROWS = 500
+
+_EXPORT_QUERIES = [
+    (
+        'anime_rating',
+        """
+        SELECT ur.anime_id as item_id, a.title_romaji as title, a.title_korean, a.title_native,
+               ur.rating, ur.status, NULL as review_title, NULL as review_content, NULL as is_spoiler,
+               ur.created_at, ur.updated_at
+        FROM user_ratings ur
+        JOIN anime a ON ur.anime_id = a.id
+        WHERE ur.user_id = ?
+        ORDER BY ur.id
+        """
+    ),
+    (
+        'character_rating',
+        """
+        SELECT cr.character_id as item_id, c.name_full as title, c.name_korean as title_korean, c.name_native as title_native,
+               cr.rating, cr.status, NULL as review_title, NULL as review_content, NULL as is_spoiler,
+               cr.created_at, cr.updated_at
+        FROM character_ratings cr
+        JOIN character c ON cr.character_id = c.id
+        WHERE cr.user_id = ?
+        ORDER BY cr.id
+        """
+    ),
+    (
+        'anime_review',
+        """
+        SELECT r.anime_id as item_id, a.title_romaji as title, a.title_korean, a.title_native,
+               NULL as rating, NULL as status, r.title as review_title, r.content as review_content, r.is_spoiler,
+               r.created_at, r.updated_at
+        FROM user_reviews r
+        JOIN anime a ON r.anime_id = a.id
+        WHERE r.user_id = ?
+        ORDER BY r.id
+        """
+    ),
+    (
+        'character_review',
+        """
+        SELECT r.character_id as item_id, c.name_full as title, c.name_korean as title_korean, c.name_native as title_native,
+               NULL as rating, NULL as status, r.title as review_title, r.content as review_content, r.is_spoiler,
+               r.created_at, r.updated_at
+        FROM character_reviews r
+        JOIN character c ON r.character_id = c.id
+        WHERE r.user_id = ?
+        ORDER BY r.id
+        """
+    ),
+]
+
+
+def iter_user_export(user_id: int, format: str = 'csv', compress: bool = False) -> Iterator[bytes]:
+    """
+    사용자 데이터 내보내기 스트림 (StreamingResponse용)
+
+    Args:
+        user_id: 사용자 ID
+        format: csv 또는 jsonl
+        compress: True면 gzip으로 압축된 바이트 스트림
+    """
+    if format == 'jsonl':
+        chunks = _iter_jsonl(user_id)
+    else:
+        chunks = _iter_csv(user_id)
+
+    if compress:
+        chunks = _gzip_chunks(chunks)
+
+    return chunks
+
+
+def _iter_rows(user_id: int) -> Iterator[dict]:
+    """4개 테이블을 순서대로 커서에서 한 행씩 읽음"""
+    for row_type, query in _EXPORT_QUERIES:
+        for row in db.iter_query(query, (user_id,), batch_size=EXPORT_CHUNK_ROWS):
+            item = {'type': row_type}
+            item.update(zip(row.keys(), row))
+            yield item
+
+
+def _iter_csv(user_id: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    buffer.write('﻿')
+    writer.writeheader()
+
+    pending = 0
+    for item in _iter_rows(user_id):
+        writer.writerow(item)
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield _drain(buffer)
+            pending = 0
+
+    yield _drain(buffer)
+
+
+def _iter_jsonl(user_id: int) -> Iterator[bytes]:
+    lines = []
+    for item in _iter_rows(user_id):
+        lines.append(json.dumps(item, ensure_ascii=False))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode('utf-8')
+    buffer.seek(0)
+    buffer.truncate(0)
+    return data
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """스트림 gzip 압축 (wbits=31 → gzip 헤더 포함)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
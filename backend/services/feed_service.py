@@ -5,12 +5,19 @@ Feed Service
 import json
 from typing import List, Dict
 from database import db, dict_from_row
+from services.character_primary_anime_service import primary_anime_id_sql, ensure_character_primary_anime
+
+
+_CHARACTER_PRIMARY_ANIME_ID = primary_anime_id_sql('c.id')
+_ACTIVITY_PRIMARY_ANIME_ID = primary_anime_id_sql('ch.id')
 
 
 def get_following_feed(user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
     """
     팔로잉하는 사용자들의 활동 피드 (UNION ALL로 최적화)
     """
+    ensure_character_primary_anime()
+
     # 팔로잉 사용자 ID 목록 조회 (자기 자신 제외)
     following_ids = db.execute_query(
         """
@@ -97,12 +104,7 @@ def get_following_feed(user_id: int, limit: int = 50, offset: int = 0) -> List[D
             JOIN character c ON cr.character_id = c.id
             LEFT JOIN user_stats us ON u.id = us.user_id
             LEFT JOIN character_reviews rev ON cr.user_id = rev.user_id AND cr.character_id = rev.character_id
-            LEFT JOIN (
-                SELECT DISTINCT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            ) a ON c.id = a.character_id AND a.rn = 1
+            LEFT JOIN anime a ON a.id = {_CHARACTER_PRIMARY_ANIME_ID}
             WHERE cr.rating IS NOT NULL
                 AND cr.user_id IN ({placeholders})
 
@@ -138,12 +140,7 @@ def get_following_feed(user_id: int, limit: int = 50, offset: int = 0) -> List[D
             JOIN users u ON cr.user_id = u.id
             JOIN character c ON cr.character_id = c.id
             LEFT JOIN user_stats us ON u.id = us.user_id
-            LEFT JOIN (
-                SELECT DISTINCT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            ) a ON c.id = a.character_id AND a.rn = 1
+            LEFT JOIN anime a ON a.id = {_CHARACTER_PRIMARY_ANIME_ID}
             WHERE cr.user_id IN ({placeholders})
             AND NOT EXISTS (
                 SELECT 1 FROM character_ratings cr2
@@ -289,9 +286,11 @@ def get_global_feed(limit: int = 50, offset: int = 0) -> List[Dict]:
     - 정규화: anime/character 테이블에서 타이틀 동적 조회
     """
 
+    ensure_character_primary_anime()
+
     # activities 테이블 + JOIN으로 조회 (정규화)
     rows = db.execute_query(
-        """
+        f"""
         SELECT
             a.id,
             a.activity_type,
@@ -355,17 +354,8 @@ def get_global_feed(limit: int = 50, offset: int = 0) -> List[Dict]:
         LEFT JOIN anime an ON a.activity_type IN ('anime_rating', 'anime_review') AND a.item_id = an.id
         -- JOIN character for character activities
         LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
-        -- JOIN anime for character (only ONE anime per character using subquery with ROW_NUMBER)
-        LEFT JOIN (
-            SELECT character_id, id, title_romaji, title_korean, title_native
-            FROM (
-                SELECT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.popularity DESC) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            )
-            WHERE rn = 1
-        ) char_anime ON ch.id = char_anime.character_id
+        -- JOIN anime for character (character_primary_anime: 캐릭터당 대표 애니 1개)
+        LEFT JOIN anime char_anime ON ch.id IS NOT NULL AND char_anime.id = {_ACTIVITY_PRIMARY_ANIME_ID}
         ORDER BY a.activity_time DESC,
                  CASE a.activity_type
                      WHEN 'rank_promotion' THEN 1
@@ -465,6 +455,8 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
     - 최근 30일 이내의 rank_promotion은 항상 포함
     """
 
+    ensure_character_primary_anime()
+
     # 먼저 최근 30일 이내의 rank_promotion 가져오기 (rank_promotion은 item이 없으므로 JOIN 불필요)
     recent_promotions = db.execute_query(
         """
@@ -505,7 +497,7 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
 
     # activities 테이블 + JOIN으로 조회 (정규화)
     rows = db.execute_query(
-        """
+        f"""
         SELECT
             a.id,
             a.activity_type,
@@ -570,17 +562,8 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
         LEFT JOIN anime an ON a.activity_type IN ('anime_rating', 'anime_review') AND a.item_id = an.id
         -- JOIN character for character activities
         LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
-        -- JOIN anime for character (only ONE anime per character using subquery with ROW_NUMBER)
-        LEFT JOIN (
-            SELECT character_id, id, title_romaji, title_korean, title_native
-            FROM (
-                SELECT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.popularity DESC) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            )
-            WHERE rn = 1
-        ) char_anime ON ch.id = char_anime.character_id
+        -- JOIN anime for character (character_primary_anime: 캐릭터당 대표 애니 1개)
+        LEFT JOIN anime char_anime ON ch.id IS NOT NULL AND char_anime.id = {_ACTIVITY_PRIMARY_ANIME_ID}
         WHERE a.user_id = ?
         ORDER BY a.activity_time DESC,
                  CASE a.activity_type
@@ -0,0 +1,221 @@
+"""
+Fuzzy Search Service
+오타 허용 검색 (메모리 trigram 역색인)
+
+- 모든 제목/이름 변형을 정규화(NFKC, 소문자, 공백·기호 제거, 한글은 자모 분해)한 뒤
+  양 끝을 채운 trigram → 변형 ID 역색인으로 보관
+- 검색어 trigram 중 드문 것부터 후보를 모으고 (DB 조회 없음),
+  후보는 trigram 집합 유사도로 다시 채점:
+  max(Jaccard, 0.8 × 검색어 포함률) ≥ FUZZY_MIN_SIMILARITY
+- 한글 자모 분해로 "거잉" ↔ "거인" 같은 받침 오타도 trigram 대부분이 겹침
+- search_service가 정확/FTS 결과가 FUZZY_FALLBACK_MIN_RESULTS개보다 적을 때만 호출
+- 카탈로그 버전이 바뀌면 백그라운드 재구성 (그동안 기존 색인 사용)
+- NumPy가 있으면 후보 집계를 벡터 연산으로
+"""
+import heapq
+import threading
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from database import db
+from services.catalog_service import get_catalog_version
+from config import FUZZY_MAX_VARIANTS, FUZZY_MAX_POSTINGS, FUZZY_MIN_SIMILARITY
+
+try:
+    import numpy as np
+except ImportError:  # numpy는 선택 의존성
+    np = None
+
+
+# 항목 종류별 색인 컬럼 (weight: 같은 점수일 때 인기순)
+_SOURCES = {
+    'anime': (
+        "SELECT id, popularity as weight, title_romaji, title_english, title_native, title_korean FROM anime"
+    ),
+    'character': (
+        "SELECT id, favourites as weight, name_full, name_native, name_korean FROM character"
+    ),
+}
+
+# 후보 집계에서 유사도를 다시 계산할 상위 후보 수
+_VERIFY_CANDIDATES = 300
+
+# 검색어 포함률 가중치 (긴 제목의 일부만 입력한 경우)
+_CONTAINMENT_WEIGHT = 0.8
+
+_PAD = '\x00'
+
+_indexes: Dict[str, 'FuzzyIndex'] = {}
+_index_lock = threading.Lock()
+_rebuilding = set()
+
+
+class FuzzyIndex:
+    """trigram → 변형 번호 역색인 (변형 번호 i → 항목 ID / 정규화 문자열)"""
+
+    def __init__(self, item_type: str, version: str, rows: List):
+        self.item_type = item_type
+        self.version = version
+
+        variants = []
+        # 인기순으로 넣다가 예산을 넘으면 중단
+        for row in sorted(rows, key=lambda r: r['weight'] or 0, reverse=True):
+            names = {normalize_fuzzy(value) for value in tuple(row)[2:] if value}
+            names.discard('')
+            if len(variants) + len(names) > FUZZY_MAX_VARIANTS:
+                break
+            variants.extend((row['id'], row['weight'] or 0, name) for name in sorted(names))
+
+        self.item_ids = array('i', (v[0] for v in variants))
+        self.weights = array('q', (v[1] for v in variants))
+        self.texts = [v[2] for v in variants]
+
+        postings: Dict[str, List[int]] = {}
+        for i, text in enumerate(self.texts):
+            for gram in trigrams(text):
+                postings.setdefault(gram, []).append(i)
+        self.postings = {gram: array('i', ids) for gram, ids in postings.items()}
+
+    def search(self, query: str, limit: int, exclude_ids: Optional[set] = None) -> List[Tuple[int, float]]:
+        """(항목 ID, 유사도) 유사도 높은 순 (같으면 인기순)"""
+        query_grams = trigrams(normalize_fuzzy(query))
+        if not query_grams:
+            return []
+
+        # 드문 trigram부터 후보 집계 (흔한 trigram은 후보만 늘리고 구분력이 없음)
+        probes = sorted(
+            (self.postings[gram] for gram in query_grams if gram in self.postings),
+            key=len
+        )
+        selected = []
+        total = 0
+        for postings in probes:
+            if selected and total + len(postings) > FUZZY_MAX_POSTINGS:
+                break
+            selected.append(postings)
+            total += len(postings)
+        if not selected:
+            return []
+
+        best: Dict[int, Tuple[float, int]] = {}
+        for i in self._top_candidates(selected):
+            item_id = self.item_ids[i]
+            if exclude_ids and item_id in exclude_ids:
+                continue
+            score = similarity(query_grams, trigrams(self.texts[i]))
+            if score >= FUZZY_MIN_SIMILARITY and score > best.get(item_id, (0.0,))[0]:
+                best[item_id] = (score, self.weights[i])
+
+        ranked = heapq.nlargest(limit, best.items(), key=lambda e: e[1])
+        return [(item_id, score) for item_id, (score, _) in ranked]
+
+    def stats(self) -> Dict:
+        return {
+            'version': self.version,
+            'variants': len(self.texts),
+            'trigrams': len(self.postings),
+            'postings': sum(len(p) for p in self.postings.values()),
+        }
+
+    def _top_candidates(self, selected: List[array]) -> List[int]:
+        """겹치는 trigram 수 상위 변형 번호"""
+        if np is not None:
+            counts = np.bincount(
+                np.concatenate([np.frombuffer(p, dtype=np.int32) for p in selected]),
+                minlength=len(self.texts)
+            )
+            if len(counts) > _VERIFY_CANDIDATES:
+                top = np.argpartition(counts, -_VERIFY_CANDIDATES)[-_VERIFY_CANDIDATES:]
+            else:
+                top = np.arange(len(counts))
+            return [int(i) for i in top if counts[i] > 0]
+
+        counts = Counter()
+        for postings in selected:
+            counts.update(postings)
+        return [i for i, _ in counts.most_common(_VERIFY_CANDIDATES)]
+
+
+def normalize_fuzzy(text: str) -> str:
+    """
+    유사도 비교용 정규화
+    NFKC → 소문자 → 글자/숫자만 → NFD (한글 음절을 자모로, 탁점·악센트 분리)
+    """
+    folded = ''.join(
+        char for char in unicodedata.normalize('NFKC', text).lower()
+        if char.isalnum()
+    )
+    return unicodedata.normalize('NFD', folded)
+
+
+def trigrams(text: str) -> set:
+    """양 끝을 채운 trigram 집합 (짧은 문자열도 비교 가능)"""
+    if not text:
+        return set()
+    padded = _PAD + _PAD + text + _PAD
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(query_grams: set, grams: set) -> float:
+    """max(Jaccard, 0.8 × 검색어 trigram 포함률)"""
+    common = len(query_grams & grams)
+    if not common:
+        return 0.0
+    jaccard = common / (len(query_grams) + len(grams) - common)
+    return max(jaccard, _CONTAINMENT_WEIGHT * common / len(query_grams))
+
+
+def get_fuzzy_index(item_type: str) -> FuzzyIndex:
+    """
+    현재 카탈로그 버전의 색인
+    처음에는 동기 구성, 이후 버전이 바뀌면 백그라운드 재구성하는 동안 기존 색인 사용
+    """
+    index = _indexes.get(item_type)
+    if index is None:
+        with _index_lock:
+            if item_type not in _indexes:
+                _indexes[item_type] = _build_index(item_type, get_catalog_version())
+            return _indexes[item_type]
+
+    version = get_catalog_version()
+    if index.version != version:
+        _start_rebuild(item_type, version)
+    return index
+
+
+def fuzzy_search_ids(item_type: str, query: str, limit: int, exclude_ids: Optional[set] = None) -> List[int]:
+    """오타를 허용한 검색 결과 ID (유사도 순)"""
+    return [item_id for item_id, _ in get_fuzzy_index(item_type).search(query, limit, exclude_ids)]
+
+
+def get_fuzzy_stats() -> Dict:
+    return {item_type: index.stats() for item_type, index in _indexes.items()}
+
+
+def _start_rebuild(item_type: str, version: str):
+    with _index_lock:
+        if item_type in _rebuilding:
+            return
+        _rebuilding.add(item_type)
+
+    def rebuild():
+        try:
+            _indexes[item_type] = _build_index(item_type, version)
+        except Exception as e:
+            print(f"[Fuzzy] Rebuild failed ({item_type}): {e}")
+        finally:
+            _rebuilding.discard(item_type)
+
+    threading.Thread(target=rebuild, daemon=True).start()
+
+
+def _build_index(item_type: str, version: str) -> FuzzyIndex:
+    started = time.perf_counter()
+    index = FuzzyIndex(item_type, version, db.execute_query(_SOURCES[item_type]))
+    elapsed = (time.perf_counter() - started) * 1000
+    stats = index.stats()
+    print(f"[Fuzzy] {item_type} index v{version} built: {stats['variants']} variants, "
+          f"{stats['trigrams']} trigrams in {elapsed:.0f}ms ({'numpy' if np is not None else 'python'})")
+    return index
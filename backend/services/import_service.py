@@ -0,0 +1,343 @@
+"""
+Import Service
+외부 애니 리스트 가져오기 (MyAnimeList XML / AniList JSON)
+
+- MAL XML은 iterparse로 스트리밍 파싱 (메모리 사용량 일정)
+- AniList JSON은 전체를 읽으므로 업로드 제한(MAX_IMPORT_FILE_BYTES)을 해제 후 크기에도 적용
+  (.gz 폭탄 방지: MAL도 MAX_IMPORT_DECOMPRESSED_BYTES까지만 읽음)
+- 외부 ID는 anime.id_mal(MAL) / anime.id(AniList)로 매핑
+- IMPORT_BATCH_SIZE 단위로 bulk_upsert_ratings에 기록, 통계 재계산은 마지막에 한 번
+- 진행 상황은 프로세스 메모리의 작업 테이블로 조회
+"""
+import gzip
+import json
+import os
+import threading
+import uuid
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from database import db
+from config import IMPORT_BATCH_SIZE, MAX_IMPORT_FILE_BYTES, MAX_IMPORT_DECOMPRESSED_BYTES
+from models.rating import RatingStatus
+from services.rating_service import bulk_upsert_ratings, _update_user_stats
+
+
+SUPPORTED_SOURCES = ('mal', 'anilist')
+
+# 완료된 작업은 최근 것만 보관
+MAX_TRACKED_JOBS = 200
+
+_jobs: Dict[str, Dict] = {}
+_jobs_lock = threading.Lock()
+
+# MAL 상태 (텍스트 또는 구버전 숫자 코드)
+_MAL_PLANNING = {'plan to watch', '6'}
+_MAL_DROPPED = {'dropped', '4'}
+
+# AniList 점수 체계별 만점
+_ANILIST_SCORE_SCALE = {
+    'POINT_100': 100,
+    'POINT_10_DECIMAL': 10,
+    'POINT_10': 10,
+    'POINT_5': 5,
+    'POINT_3': 3,
+}
+
+
+def create_import_job(user_id: int, source: str) -> Dict:
+    """가져오기 작업 등록 (상태: pending)"""
+    job = {
+        'job_id': uuid.uuid4().hex,
+        'user_id': user_id,
+        'source': source,
+        'status': 'pending',
+        'processed': 0,
+        'imported': 0,
+        'skipped': 0,
+        'unmatched': 0,
+        'error': None,
+        'created_at': datetime.utcnow().isoformat(),
+        'finished_at': None,
+    }
+
+    with _jobs_lock:
+        _jobs[job['job_id']] = job
+        _evict_finished_jobs()
+
+    return dict(job)
+
+
+def get_import_job(job_id: str, user_id: int) -> Optional[Dict]:
+    """작업 상태 조회 (본인 작업만)"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None or job['user_id'] != user_id:
+            return None
+        return dict(job)
+
+
+def run_import_job(job_id: str, file_path: str, overwrite: bool = False):
+    """
+    가져오기 실행 (BackgroundTasks에서 호출)
+    업로드 임시 파일은 끝나면 삭제
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return
+
+    _update_job(job_id, status='running')
+
+    try:
+        max_bytes = MAX_IMPORT_DECOMPRESSED_BYTES if job['source'] == 'mal' else MAX_IMPORT_FILE_BYTES
+        with _open_export(file_path, max_bytes) as f:
+            if job['source'] == 'mal':
+                entries = _iter_mal_entries(f)
+            else:
+                entries = _iter_anilist_entries(f)
+
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    _import_batch(job_id, job['user_id'], batch, overwrite)
+                    batch = []
+            if batch:
+                _import_batch(job_id, job['user_id'], batch, overwrite)
+
+        # 통계/승급 재계산은 전체 작업에 대해 한 번만
+        _update_user_stats(job['user_id'])
+
+        _update_job(job_id, status='completed', finished_at=datetime.utcnow().isoformat())
+    except Exception as e:
+        print(f"[Import] Job {job_id} failed: {e}")
+        _update_job(job_id, status='failed', error=str(e), finished_at=datetime.utcnow().isoformat())
+    finally:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+def _import_batch(job_id: str, user_id: int, batch: List[Dict], overwrite: bool):
+    """외부 ID 매핑 후 한 배치를 기록"""
+    mal_ids = [e['external_id'] for e in batch if e['id_type'] == 'mal']
+    anilist_ids = [e['external_id'] for e in batch if e['id_type'] == 'anilist']
+
+    id_map = {}
+    if mal_ids:
+        placeholders = ','.join('?' * len(mal_ids))
+        rows = db.execute_query(
+            f"SELECT id, id_mal FROM anime WHERE id_mal IN ({placeholders})",
+            tuple(mal_ids)
+        )
+        id_map.update({('mal', row['id_mal']): row['id'] for row in rows})
+    if anilist_ids:
+        placeholders = ','.join('?' * len(anilist_ids))
+        rows = db.execute_query(
+            f"SELECT id FROM anime WHERE id IN ({placeholders})",
+            tuple(anilist_ids)
+        )
+        id_map.update({('anilist', row['id']): row['id'] for row in rows})
+
+    # 같은 작품이 여러 번 나오면 마지막 항목 사용
+    mapped = {}
+    matched = 0
+    skipped = 0
+    unmatched = 0
+    for entry in batch:
+        if entry['status'] is None:
+            skipped += 1
+            continue
+        anime_id = id_map.get((entry['id_type'], entry['external_id']))
+        if anime_id is None:
+            unmatched += 1
+            continue
+        matched += 1
+        mapped[anime_id] = {
+            'anime_id': anime_id,
+            'rating': entry['rating'],
+            'status': entry['status'],
+            'updated_at': entry['updated_at'],
+        }
+
+    imported = bulk_upsert_ratings(user_id, list(mapped.values()), overwrite=overwrite)
+
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job['processed'] += len(batch)
+        job['imported'] += imported
+        # 중복 항목, 기존 평점 유지로 기록되지 않은 항목도 skipped
+        job['skipped'] += skipped + (matched - imported)
+        job['unmatched'] += unmatched
+
+
+def _iter_mal_entries(f) -> Iterator[Dict]:
+    """
+    MAL XML 스트리밍 파싱
+    <anime> 단위로 yield 후 root를 비워 메모리 사용량을 일정하게 유지
+    """
+    root = None
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if root is None:
+            root = elem
+        if event != 'end' or elem.tag != 'anime':
+            continue
+
+        external_id = _to_int(elem.findtext('series_animedb_id'))
+        if external_id:
+            score = _to_float(elem.findtext('my_score'))
+            mal_status = (elem.findtext('my_status') or '').strip().lower()
+            rating = _normalize_score(score, 10)
+            yield {
+                'id_type': 'mal',
+                'external_id': external_id,
+                'rating': rating,
+                'status': _map_status(rating, mal_status in _MAL_PLANNING, mal_status in _MAL_DROPPED),
+                'updated_at': _mal_date(elem.findtext('my_finish_date')),
+            }
+
+        root.clear()
+
+
+def _iter_anilist_entries(f) -> Iterator[Dict]:
+    """
+    AniList JSON 파싱
+    MediaListCollection 응답({"data": {...}} 포함) 또는 항목 배열 모두 지원
+    """
+    data = json.load(f)
+
+    score_format = None
+    if isinstance(data, dict):
+        data = data.get('data', data)
+        data = data.get('MediaListCollection', data)
+        options = (data.get('user') or {}).get('mediaListOptions') or {}
+        score_format = options.get('scoreFormat') or data.get('scoreFormat')
+        lists = data.get('lists') or []
+        entries = (entry for lst in lists for entry in (lst.get('entries') or []))
+    else:
+        entries = iter(data)
+
+    for entry in entries:
+        media = entry.get('media') or {}
+        external_id = _to_int(entry.get('mediaId') or media.get('id'))
+        if not external_id:
+            continue
+
+        score = _to_float(entry.get('score'))
+        scale = _ANILIST_SCORE_SCALE.get(score_format) or (100 if score and score > 10 else 10)
+        anilist_status = (entry.get('status') or '').upper()
+        rating = _normalize_score(score, scale)
+        updated_at = _to_int(entry.get('updatedAt'))
+
+        yield {
+            'id_type': 'anilist',
+            'external_id': external_id,
+            'rating': rating,
+            'status': _map_status(rating, anilist_status == 'PLANNING', anilist_status == 'DROPPED'),
+            'updated_at': datetime.utcfromtimestamp(updated_at).strftime('%Y-%m-%d %H:%M:%S') if updated_at else None,
+        }
+
+
+def _map_status(rating: Optional[float], planning: bool, dropped: bool) -> Optional[str]:
+    """
+    외부 상태 → 우리 상태
+    - 보고 싶어요 목록 → WANT_TO_WATCH
+    - 점수가 있으면 → RATED
+    - 점수 없이 하차 → PASS
+    - 그 외 (점수 없는 시청 기록) → 가져오지 않음
+    """
+    if planning:
+        return RatingStatus.WANT_TO_WATCH.value
+    if rating is not None:
+        return RatingStatus.RATED.value
+    if dropped:
+        return RatingStatus.PASS.value
+    return None
+
+
+def _normalize_score(score: Optional[float], scale: int) -> Optional[float]:
+    """외부 점수를 0.5~5.0 (0.5 단위)로 변환, 0점은 미평가"""
+    if not score or score <= 0:
+        return None
+    rating = round(score / scale * 10) / 2
+    return min(max(rating, 0.5), 5.0)
+
+
+def _mal_date(value: Optional[str]) -> Optional[str]:
+    """MAL 날짜(YYYY-MM-DD, 미입력 시 0000-00-00) → SQLite DATETIME"""
+    if not value or value.startswith('0000'):
+        return None
+    try:
+        return datetime.strptime(value.strip(), '%Y-%m-%d').strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def _open_export(file_path: str, max_bytes: int):
+    """
+    MAL 내보내기는 .xml.gz로 받는 경우가 많아 gzip 자동 감지
+    해제한 내용이 max_bytes를 넘으면 읽는 도중 ValueError
+    """
+    with open(file_path, 'rb') as f:
+        magic = f.read(2)
+    if magic == b'\x1f\x8b':
+        return _LimitedReader(gzip.open(file_path, 'rb'), max_bytes)
+    return _LimitedReader(open(file_path, 'rb'), max_bytes)
+
+
+class _LimitedReader:
+    """최대 max_bytes까지만 읽는 파일 래퍼"""
+
+    def __init__(self, f, max_bytes: int):
+        self._f = f
+        self._remaining = max_bytes
+
+    def read(self, size: int = -1) -> bytes:
+        # 제한보다 1바이트 더 읽어서 초과 여부 판단
+        if size is None or size < 0 or size > self._remaining + 1:
+            size = self._remaining + 1
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        if self._remaining < 0:
+            raise ValueError("Import file too large")
+        return data
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _update_job(job_id: str, **fields):
+    with _jobs_lock:
+        if job_id in _jobs:
+            _jobs[job_id].update(fields)
+
+
+def _evict_finished_jobs():
+    """오래된 완료/실패 작업 정리 (_jobs_lock 안에서 호출)"""
+    if len(_jobs) <= MAX_TRACKED_JOBS:
+        return
+    finished = [job_id for job_id, job in _jobs.items() if job['status'] in ('completed', 'failed')]
+    for job_id in finished[:len(_jobs) - MAX_TRACKED_JOBS]:
+        del _jobs[job_id]
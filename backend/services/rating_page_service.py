@@ -2,21 +2,61 @@
 Rating Page Service - Ultra-optimized queries for rating pages
 평가 페이지 전용 초고속 쿼리 (목표: 0.1초 이내)
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
+import heapq
+import math
 import random
+import threading
+from array import array
 from database import db, dict_from_row
+from services.catalog_service import get_catalog, get_catalog_version
+from services.profile_service import get_genre_preferences
+from services.rating_stats_service import get_rating_stats
+from services.relation_loader import fetch_by_ids
+from utils.cache import TTLCache
+from config import (
+    RATING_CURSOR_CACHE_SIZE, RATING_CURSOR_TTL_SECONDS, CHARACTER_POOL_CACHE_SIZE, CHARACTER_POOL_TTL_SECONDS,
+    RATING_AFFINITY_CACHE_SIZE, RATING_AFFINITY_TTL_SECONDS, RATING_AFFINITY_ORDER_SIZE,
+    RATING_AFFINITY_REFRESH_RATINGS, RATING_AFFINITY_WEIGHT, RATING_AFFINITY_SHRINKAGE
+)
 
 
-def get_anime_for_rating(user_id: int, limit: int = 50) -> List[Dict]:
+RATEABLE_CHARACTER_VERSION_KEY = 'rateable_character_version'
+
+# 사용자별 애니 평가 후보 커서 (RatingCursor)
+_rating_cursors = TTLCache(maxsize=RATING_CURSOR_CACHE_SIZE, ttl=RATING_CURSOR_TTL_SECONDS)
+
+# 사용자별 캐릭터 평가 후보 ((rateable 버전, 평가한 애니 수, ID 합), 후보 목록)
+_character_pools = TTLCache(maxsize=CHARACTER_POOL_CACHE_SIZE, ttl=CHARACTER_POOL_TTL_SECONDS)
+
+# 사용자별 맞춤 후보 순서 (AffinityOrder)
+_affinity_orders = TTLCache(maxsize=RATING_AFFINITY_CACHE_SIZE, ttl=RATING_AFFINITY_TTL_SECONDS)
+_affinity_refreshing = set()
+_affinity_lock = threading.Lock()
+
+# 페이지 요청당 새 평가 수 측정 (모드별 페이지 수 / 다음 요청까지 늘어난 평가 수)
+_page_metrics = {mode: {'pages': 0, 'ratings': 0} for mode in ('popularity', 'personalized')}
+_last_pages = TTLCache(maxsize=RATING_CURSOR_CACHE_SIZE, ttl=RATING_CURSOR_TTL_SECONDS)
+_metrics_lock = threading.Lock()
+
+# rateable_character를 마지막으로 확인한 카탈로그 버전
+_rateable_version = None
+_rateable_lock = threading.Lock()
+_rateable_rebuilding = False
+
+
+def get_anime_for_rating(user_id: int, limit: int = 50, personalized: bool = False) -> List[Dict]:
     """
     애니메이션 평가 페이지 전용 - 초고속 쿼리
 
     최적화:
-    - 서브쿼리 0개
-    - LEFT JOIN으로 user_rating_status만 확인
+    - 미평가 후보는 카탈로그 스냅샷의 인기순 배열 + 사용자별 비트셋 커서에서
+      (전체 애니 정렬 / user_ratings 안티 조인 없음, 앞쪽의 평가한 구간은 다시 훑지 않음)
+    - 커서는 사용자 평가 지문(개수, ID 합)이 바뀌면 다시 구성 → 어떤 경로로 평가해도 반영
+    - personalized: 장르 선호도 × 인기도 순서 (사용자별 캐시, 평가가 늘면 백그라운드 갱신)
+      선호도를 아직 계산할 수 없으면 인기순
     - site stats 제거 (불필요)
-    - 가중치 랜덤 정렬: 인기도 기반, Python에서 랜덤 섞기
-    - 인덱스 활용
+    - 가중치 랜덤 정렬: 인기도(또는 맞춤 점수) 기반, Python에서 랜덤 섞기
     - WANT_TO_WATCH는 소수만 포함 (10%)
 
     목표: 0.1초 이내
@@ -29,65 +69,238 @@ def get_anime_for_rating(user_id: int, limit: int = 50) -> List[Dict]:
     want_to_watch_limit = max(int(limit * 0.10), 5)  # At least 5 items
     unrated_limit = fetch_limit - want_to_watch_limit
 
-    # Fetch unrated anime (majority)
-    unrated_rows = db.execute_query(
+    catalog = get_catalog()
+    cursor = _get_rating_cursor(user_id, catalog)
+
+    affinity = _get_affinity_order(user_id, catalog, cursor.rated_count) if personalized else None
+    if affinity is not None:
+        unrated = cursor.next_unrated(affinity.order, unrated_limit, 'affinity')
+        if len(unrated) < unrated_limit:
+            # 맞춤 순서 상위 구간을 다 본 사용자는 나머지를 인기순으로
+            picked = set(unrated)
+            unrated += [
+                i for i in cursor.next_unrated(catalog.popularity_order, unrated_limit + len(unrated))
+                if i not in picked
+            ][:unrated_limit - len(unrated)]
+    else:
+        unrated = cursor.next_unrated(catalog.popularity_order, unrated_limit)
+    _record_page(user_id, 'personalized' if affinity is not None else 'popularity', cursor.rated_count)
+
+    unrated_ids = [catalog.ids[i] for i in unrated]
+    want_to_watch_ids = [catalog.ids[i] for i in cursor.want_to_watch[:want_to_watch_limit]]
+
+    rows = {
+        row['id']: dict_from_row(row)
+        for _, row in fetch_by_ids(
+            """
+            SELECT
+                a.id,
+                a.title_romaji,
+                a.title_english,
+                a.title_native,
+                a.title_korean,
+                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+                a.format,
+                a.episodes,
+                a.season,
+                a.season_year,
+                a.average_score,
+                a.popularity
+            FROM anime a
+            WHERE a.id IN ({placeholders})
+            """,
+            unrated_ids + want_to_watch_ids,
+            key='id'
+        )
+    }
+
+    # Combine results (인기순 유지: 미평가 → WANT_TO_WATCH)
+    items = []
+    for anime_ids, status in ((unrated_ids, None), (want_to_watch_ids, 'WANT_TO_WATCH')):
+        for anime_id in anime_ids:
+            if anime_id in rows:
+                items.append({**rows[anime_id], 'user_rating_status': status})
+
+    return _tier_shuffle(items, limit)
+
+
+class RatingCursor:
+    """
+    사용자별 애니 평가 후보 커서 (카탈로그 버전별)
+    - seen: 카탈로그 인덱스 비트셋 (평가/보고싶어요/관심없음 중 하나라도 있으면 1)
+    - starts: 순서(인기순 / 맞춤)별 첫 미평가 위치 (앞쪽은 전부 평가한 구간이라 건너뜀)
+    """
+
+    def __init__(self, catalog, fingerprint: tuple, rows: List):
+        self.version = catalog.version
+        self.fingerprint = fingerprint
+        self.rated_count = fingerprint[3]  # RATED 평가 수 (보고싶어요/관심없음 제외)
+        self.seen = bytearray((catalog.size + 7) // 8)
+        self.starts = {}
+
+        want_to_watch = []
+        for row in rows:
+            i = catalog.index_of.get(row['anime_id'])
+            if i is None:
+                continue
+            self.seen[i >> 3] |= 1 << (i & 7)
+            if row['status'] == 'WANT_TO_WATCH':
+                want_to_watch.append(i)
+        # popularity_order와 같은 순서 (인기 내림차순, 같으면 인덱스 순)
+        self.want_to_watch = sorted(want_to_watch, key=lambda i: (-catalog.popularity[i], i))
+
+    def next_unrated(self, order, count: int, name: str = 'popularity') -> List[int]:
+        """order의 첫 미평가 위치부터 미평가 인덱스 count개"""
+        seen = self.seen
+        found = []
+        position = self.starts.get(name, 0)
+        while position < len(order) and len(found) < count:
+            i = order[position]
+            if not seen[i >> 3] & (1 << (i & 7)):
+                if not found:
+                    self.starts[name] = position
+                found.append(i)
+            position += 1
+        if not found:
+            self.starts[name] = position
+        return found
+
+
+def _get_rating_cursor(user_id: int, catalog) -> RatingCursor:
+    """캐시된 커서 (카탈로그 버전이나 평가 지문이 바뀌었으면 다시 구성)"""
+    row = db.execute_query(
         """
         SELECT
-            a.id,
-            a.title_romaji,
-            a.title_english,
-            a.title_native,
-            a.title_korean,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-            a.format,
-            a.episodes,
-            a.season,
-            a.season_year,
-            a.average_score,
-            a.popularity,
-            NULL as user_rating_status
-        FROM anime a
-        LEFT JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ?
-        WHERE ur.id IS NULL
-        ORDER BY COALESCE(a.popularity, 0) DESC
-        LIMIT ?
+            COUNT(*) as cnt,
+            COALESCE(SUM(anime_id), 0) as id_sum,
+            COALESCE(SUM(CASE WHEN status = 'WANT_TO_WATCH' THEN anime_id ELSE 0 END), 0) as want_sum,
+            COALESCE(SUM(CASE WHEN status = 'RATED' THEN 1 ELSE 0 END), 0) as rated
+        FROM user_ratings
+        WHERE user_id = ?
         """,
-        (user_id, unrated_limit)
+        (user_id,),
+        fetch_one=True
     )
+    fingerprint = (row['cnt'], row['id_sum'], row['want_sum'], row['rated'])
 
-    # Fetch WANT_TO_WATCH anime (small portion)
-    want_to_watch_rows = db.execute_query(
-        """
-        SELECT
-            a.id,
-            a.title_romaji,
-            a.title_english,
-            a.title_native,
-            a.title_korean,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-            a.format,
-            a.episodes,
-            a.season,
-            a.season_year,
-            a.average_score,
-            a.popularity,
-            ur.status as user_rating_status
-        FROM anime a
-        INNER JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ?
-        WHERE ur.status = 'WANT_TO_WATCH'
-        ORDER BY COALESCE(a.popularity, 0) DESC
-        LIMIT ?
-        """,
-        (user_id, want_to_watch_limit)
+    cursor = _rating_cursors.get(user_id)
+    if cursor is not None and cursor.version == catalog.version and cursor.fingerprint == fingerprint:
+        return cursor
+
+    rows = db.execute_query(
+        "SELECT anime_id, status FROM user_ratings WHERE user_id = ?",
+        (user_id,)
     )
+    cursor = RatingCursor(catalog, fingerprint, rows)
+    _rating_cursors.set(user_id, cursor)
+    return cursor
 
-    # Combine results
-    items = [dict_from_row(row) for row in unrated_rows] + [dict_from_row(row) for row in want_to_watch_rows]
 
-    # Weighted random: shuffle within popularity tiers
-    # Top 30%: high popularity items
-    # Middle 40%: medium popularity items
-    # Bottom 30%: lower popularity items
+class AffinityOrder:
+    """
+    사용자별 맞춤 후보 순서 (카탈로그 인덱스, 상위 RATING_AFFINITY_ORDER_SIZE개)
+    점수 = log10(1 + 인기도) + RATING_AFFINITY_WEIGHT × 장르 선호도 합
+    장르 선호도 = (장르 평균 평점 - 전체 평균) × n / (n + RATING_AFFINITY_SHRINKAGE)
+    """
+
+    def __init__(self, catalog, rated_count: int, preferences: List[Dict]):
+        self.version = catalog.version
+        self.rated_count = rated_count
+
+        total = sum(p['count'] for p in preferences)
+        mean = sum(p['avg_rating'] * p['count'] for p in preferences) / total
+        bit_weights = [
+            (catalog.genre_bits[p['genre']],
+             (p['avg_rating'] - mean) * p['count'] / (p['count'] + RATING_AFFINITY_SHRINKAGE))
+            for p in preferences
+            if p['genre'] in catalog.genre_bits
+        ]
+
+        # 장르 조합 수는 애니 수보다 훨씬 적으므로 조합별로 한 번만 계산
+        mask_scores: Dict[int, float] = {}
+        for mask in set(catalog.genre_masks):
+            mask_scores[mask] = sum(weight for bit, weight in bit_weights if mask & bit)
+
+        popularity, masks = catalog.popularity, catalog.genre_masks
+        self.order = array('i', heapq.nlargest(
+            RATING_AFFINITY_ORDER_SIZE,
+            range(catalog.size),
+            key=lambda i: math.log10(1 + popularity[i]) + RATING_AFFINITY_WEIGHT * mask_scores[masks[i]]
+        ))
+
+
+def get_rating_page_metrics() -> Dict:
+    """모드별 페이지 요청 수와 그 사이에 늘어난 평가 수 (평가 1개당 페이지 수 비교용)"""
+    with _metrics_lock:
+        return {
+            mode: {
+                **counts,
+                'pages_per_rating': round(counts['pages'] / counts['ratings'], 3) if counts['ratings'] else None,
+            }
+            for mode, counts in _page_metrics.items()
+        }
+
+
+def _get_affinity_order(user_id: int, catalog, rated_count: int) -> Optional[AffinityOrder]:
+    """
+    캐시된 맞춤 순서 (처음에는 바로 계산)
+    평가가 RATING_AFFINITY_REFRESH_RATINGS개 이상 늘었거나 카탈로그가 바뀌면 백그라운드에서 다시 계산
+    """
+    affinity = _affinity_orders.get(user_id)
+    if affinity is None:
+        affinity = _build_affinity_order(user_id, catalog, rated_count)
+        _affinity_orders.set(user_id, affinity or False)
+        return affinity
+    if affinity is False:
+        affinity = None
+
+    stale_at = (affinity.rated_count if affinity else 0) + RATING_AFFINITY_REFRESH_RATINGS
+    if (affinity and affinity.version != catalog.version) or rated_count >= stale_at:
+        with _affinity_lock:
+            if user_id in _affinity_refreshing:
+                return affinity
+            _affinity_refreshing.add(user_id)
+
+        def refresh():
+            try:
+                _affinity_orders.set(user_id, _build_affinity_order(user_id, catalog, rated_count) or False)
+            except Exception as e:
+                print(f"[RatingPage] Affinity refresh failed (user {user_id}): {e}")
+            finally:
+                _affinity_refreshing.discard(user_id)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    if affinity and affinity.version != catalog.version:
+        return None  # 카탈로그 인덱스가 달라졌으므로 갱신될 때까지 인기순
+    return affinity
+
+
+def _build_affinity_order(user_id: int, catalog, rated_count: int) -> Optional[AffinityOrder]:
+    """장르 선호도가 없으면 (평가 부족) None"""
+    preferences = get_genre_preferences(user_id, limit=len(catalog.genre_bits))
+    if not preferences:
+        return None
+    return AffinityOrder(catalog, rated_count, preferences)
+
+
+def _record_page(user_id: int, mode: str, rated_count: int):
+    """이번 요청 모드의 페이지 수 +1, 지난 요청 뒤 늘어난 평가는 지난 요청 모드에 합산"""
+    previous = _last_pages.get(user_id)
+    _last_pages.set(user_id, (mode, rated_count))
+    with _metrics_lock:
+        _page_metrics[mode]['pages'] += 1
+        if previous is not None and rated_count > previous[1]:
+            _page_metrics[previous[0]]['ratings'] += rated_count - previous[1]
+
+
+def _tier_shuffle(items: List[Dict], limit: int) -> List[Dict]:
+    """
+    Weighted random: shuffle within popularity tiers (items는 인기순 또는 맞춤 점수순)
+    Top 30%: high popularity items
+    Middle 40%: medium popularity items
+    Bottom 30%: lower popularity items
+    """
     if len(items) > limit:
         tier_size = len(items) // 3
         top_tier = items[:tier_size]
@@ -117,11 +330,10 @@ def get_characters_for_rating(user_id: int, limit: int = 50) -> List[Dict]:
     캐릭터 평가 페이지 전용 - 초고속 쿼리
 
     최적화:
-    - 단일 쿼리로 단순화
-    - CTE 제거
-    - 평가한 애니의 캐릭터 중 미평가만
+    - 역할/이름 필터는 rateable_character에 미리 적용 (카탈로그 버전이 바뀌면 재구성)
+    - 평가한 애니의 캐릭터 후보(인기순)는 사용자별로 캐시, 평가한 애니가 바뀔 때만 다시 조회
+    - 요청마다는 내가 평가한 캐릭터만 빼고 상위 후보를 채움
     - 가중치 랜덤 정렬: 인기도 기반, Python에서 랜덤 섞기
-    - 인덱스 활용
 
     목표: 0.1초 이내
     """
@@ -129,149 +341,245 @@ def get_characters_for_rating(user_id: int, limit: int = 50) -> List[Dict]:
     # Fetch more items than needed (3x) for randomization
     fetch_limit = limit * 3
 
-    rows = db.execute_query(
-        """
-        SELECT
-            c.id,
-            c.name_full,
-            c.name_native,
-            c.name_korean,
-            COALESCE('/' || c.image_local, c.image_url) as image_url,
-            c.gender,
-            c.favourites,
-            ac.role,
-            a.id as anime_id,
-            a.title_romaji as anime_title,
-            a.title_korean as anime_title_korean,
-            a.title_native as anime_title_native,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as anime_cover
-        FROM character c
-        INNER JOIN anime_character ac ON c.id = ac.character_id
-        INNER JOIN anime a ON ac.anime_id = a.id
-        INNER JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ? AND ur.status = 'RATED'
-        LEFT JOIN character_ratings cr ON c.id = cr.character_id AND cr.user_id = ?
-        WHERE cr.id IS NULL
-            AND ac.role IN ('MAIN', 'SUPPORTING')
-            AND c.name_full NOT LIKE '%Narrator%'
-            AND c.name_full NOT LIKE '%Unknown%'
-            AND c.name_full NOT LIKE '%Extra%'
-            AND c.name_full NOT LIKE '%Background%'
-        GROUP BY c.id
-        ORDER BY COALESCE(c.favourites, 0) DESC
-        LIMIT ?
-        """,
-        (user_id, user_id, fetch_limit)
-    )
+    rated_characters = {
+        row['character_id'] for row in db.execute_query(
+            "SELECT character_id FROM character_ratings WHERE user_id = ?",
+            (user_id,)
+        )
+    }
+    picked = []
+    for character_id, anime_id, role in _get_character_pool(user_id):
+        if character_id not in rated_characters:
+            picked.append((character_id, anime_id, role))
+            if len(picked) >= fetch_limit:
+                break
+    if not picked:
+        return []
+
+    characters = {
+        row['id']: dict_from_row(row)
+        for _, row in fetch_by_ids(
+            """
+            SELECT
+                c.id,
+                c.name_full,
+                c.name_native,
+                c.name_korean,
+                COALESCE('/' || c.image_local, c.image_url) as image_url,
+                c.gender,
+                c.favourites
+            FROM character c
+            WHERE c.id IN ({placeholders})
+            """,
+            [character_id for character_id, _, _ in picked],
+            key='id'
+        )
+    }
+    anime = {
+        row['anime_id']: dict_from_row(row)
+        for _, row in fetch_by_ids(
+            """
+            SELECT
+                a.id as anime_id,
+                a.title_romaji as anime_title,
+                a.title_korean as anime_title_korean,
+                a.title_native as anime_title_native,
+                COALESCE('/' || a.cover_image_local, a.cover_image_url) as anime_cover
+            FROM anime a
+            WHERE a.id IN ({placeholders})
+            """,
+            {anime_id for _, anime_id, _ in picked},
+            key='anime_id'
+        )
+    }
 
-    items = [dict_from_row(row) for row in rows]
+    items = [
+        {**characters[character_id], 'role': role, **anime[anime_id]}
+        for character_id, anime_id, role in picked
+        if character_id in characters and anime_id in anime
+    ]
 
     # Weighted random: shuffle within popularity tiers
-    if len(items) > limit:
-        tier_size = len(items) // 3
-        top_tier = items[:tier_size]
-        mid_tier = items[tier_size:tier_size*2]
-        low_tier = items[tier_size*2:]
+    return _tier_shuffle(items, limit)
 
-        random.shuffle(top_tier)
-        random.shuffle(mid_tier)
-        random.shuffle(low_tier)
-
-        top_count = int(limit * 0.5)
-        mid_count = int(limit * 0.3)
-        low_count = limit - top_count - mid_count
-
-        result = top_tier[:top_count] + mid_tier[:mid_count] + low_tier[:low_count]
-        random.shuffle(result)
-        return result
-    else:
-        random.shuffle(items)
-        return items
 
+def rebuild_rateable_characters() -> int:
+    """
+    rateable_character 재구성 (평가 페이지에 나올 수 있는 (애니, 캐릭터) 쌍)
+    - MAIN / SUPPORTING 역할만, 나레이터·엑스트라 등 이름 필터
+    - anime_rank: 캐릭터별 대표 애니 순위 (MAIN 역할 → 애니 인기순, 0이 대표 애니)
+    """
+    global _rateable_version
+
+    with _rateable_lock:
+        version = get_catalog_version()
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM rateable_character")
+            conn.execute(
+                """
+                INSERT INTO rateable_character (anime_id, character_id, role, favourites, anime_rank)
+                SELECT anime_id, character_id, role, favourites, anime_rank
+                FROM (
+                    SELECT
+                        ac.anime_id,
+                        ac.character_id,
+                        ac.role,
+                        COALESCE(c.favourites, 0) as favourites,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY ac.character_id
+                            ORDER BY ac.role = 'MAIN' DESC, COALESCE(a.popularity, 0) DESC, ac.anime_id
+                        ) - 1 as anime_rank
+                    FROM anime_character ac
+                    INNER JOIN character c ON c.id = ac.character_id
+                    INNER JOIN anime a ON a.id = ac.anime_id
+                    WHERE ac.role IN ('MAIN', 'SUPPORTING')
+                        AND c.name_full NOT LIKE '%Narrator%'
+                        AND c.name_full NOT LIKE '%Unknown%'
+                        AND c.name_full NOT LIKE '%Extra%'
+                        AND c.name_full NOT LIKE '%Background%'
+                )
+                """
+            )
+            count = conn.execute("SELECT COUNT(*) FROM rateable_character").fetchone()[0]
+            conn.execute(
+                """
+                INSERT INTO crawl_meta (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+                """,
+                (RATEABLE_CHARACTER_VERSION_KEY, version)
+            )
+            conn.commit()
+
+        _rateable_version = version
+        _character_pools.clear()
+        print(f"[RatingPage] rateable_character rebuilt for catalog v{version}: {count} pairs")
+        return count
+
+
+def _ensure_rateable_characters():
+    """카탈로그 버전이 바뀌었으면 백그라운드에서 rateable_character 재구성 (그동안 기존 테이블 사용)"""
+    global _rateable_version, _rateable_rebuilding
+
+    version = get_catalog_version()
+    if _rateable_version == version:
+        return
 
-def get_anime_for_rating_stats(user_id: int) -> Dict:
+    row = db.execute_query(
+        "SELECT value FROM crawl_meta WHERE key = ?",
+        (RATEABLE_CHARACTER_VERSION_KEY,),
+        fetch_one=True
+    )
+    if row and row['value'] == version:
+        # 다른 프로세스가 이미 재구성
+        if _rateable_version is not None:
+            _character_pools.clear()
+        _rateable_version = version
+        return
+    if row is None:
+        rebuild_rateable_characters()
+        return
+
+    with _rateable_lock:
+        if _rateable_rebuilding:
+            return
+        _rateable_rebuilding = True
+
+    def rebuild():
+        global _rateable_rebuilding
+        try:
+            rebuild_rateable_characters()
+        except Exception as e:
+            print(f"[RatingPage] rateable_character rebuild failed: {e}")
+        finally:
+            _rateable_rebuilding = False
+
+    threading.Thread(target=rebuild, daemon=True).start()
+
+
+def _get_character_pool(user_id: int) -> List[tuple]:
     """
-    애니메이션 평가 페이지 통계 - 빠른 집계
+    평가한(RATED) 애니의 캐릭터 후보 [(character_id, anime_id, role)] 인기순
+    캐릭터가 여러 평가한 애니에 나오면 대표 순위가 가장 높은 애니로 표시
+    평가한 애니 지문(개수, ID 합)이 바뀌면 다시 조회
     """
+    _ensure_rateable_characters()
 
     row = db.execute_query(
         """
-        SELECT
-            COUNT(*) as total,
-            SUM(CASE WHEN ur.status = 'RATED' THEN 1 ELSE 0 END) as rated,
-            SUM(CASE WHEN ur.status = 'WANT_TO_WATCH' THEN 1 ELSE 0 END) as watch_later,
-            SUM(CASE WHEN ur.status = 'PASS' THEN 1 ELSE 0 END) as pass,
-            AVG(CASE WHEN ur.status = 'RATED' AND ur.rating IS NOT NULL THEN ur.rating END) as average_rating
-        FROM user_ratings ur
-        WHERE ur.user_id = ?
+        SELECT COUNT(*) as cnt, COALESCE(SUM(anime_id), 0) as id_sum
+        FROM user_ratings
+        WHERE user_id = ? AND status = 'RATED'
         """,
         (user_id,),
         fetch_one=True
     )
+    fingerprint = (_rateable_version, row['cnt'], row['id_sum'])
 
-    stats = dict_from_row(row) if row else {}
+    cached = _character_pools.get(user_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
 
-    # Total anime count (cached value)
-    total_anime = db.execute_query(
-        "SELECT COUNT(*) as cnt FROM anime",
-        fetch_one=True
-    )['cnt']
+    best: Dict[int, tuple] = {}
+    for candidate in db.iter_query(
+        """
+        SELECT rc.character_id, rc.anime_id, rc.role, rc.favourites, rc.anime_rank
+        FROM user_ratings ur
+        INNER JOIN rateable_character rc ON rc.anime_id = ur.anime_id
+        WHERE ur.user_id = ? AND ur.status = 'RATED'
+        """,
+        (user_id,)
+    ):
+        current = best.get(candidate['character_id'])
+        if current is None or candidate['anime_rank'] < current[4]:
+            best[candidate['character_id']] = tuple(candidate)
+
+    pool = [
+        (character_id, anime_id, role)
+        for character_id, anime_id, role, _, _ in sorted(best.values(), key=lambda c: -c[3])
+    ]
+    _character_pools.set(user_id, (fingerprint, pool))
+    return pool
+
+
+def get_anime_for_rating_stats(user_id: int) -> Dict:
+    """
+    애니메이션 평가 페이지 통계 - rating_page_stats 1행 + 카탈로그 스냅샷 크기
+    """
+    stats = get_rating_stats(user_id)
+    total_anime = get_catalog().size
 
     return {
         'total': total_anime,
-        'rated': stats.get('rated', 0),
-        'watchLater': stats.get('watch_later', 0),
-        'pass': stats.get('pass', 0),
-        'remaining': total_anime - stats.get('rated', 0) - stats.get('pass', 0),
-        'averageRating': stats.get('average_rating', 0) or 0
+        'rated': stats['anime_rated'],
+        'watchLater': stats['anime_want_to_watch'],
+        'pass': stats['anime_pass'],
+        'remaining': total_anime - stats['anime_rated'] - stats['anime_pass'],
+        'averageRating': _average(stats['anime_rating_sum'], stats['anime_rating_count'])
     }
 
 
 def get_characters_for_rating_stats(user_id: int) -> Dict:
     """
-    캐릭터 평가 페이지 통계 - 빠른 집계
+    캐릭터 평가 페이지 통계 - rating_page_stats 1행
     """
-
-    row = db.execute_query(
-        """
-        SELECT
-            COUNT(*) as total,
-            SUM(CASE WHEN cr.status = 'RATED' THEN 1 ELSE 0 END) as rated,
-            SUM(CASE WHEN cr.status = 'WANT_TO_KNOW' THEN 1 ELSE 0 END) as want_to_know,
-            SUM(CASE WHEN cr.status = 'NOT_INTERESTED' THEN 1 ELSE 0 END) as not_interested,
-            AVG(CASE WHEN cr.status = 'RATED' AND cr.rating IS NOT NULL THEN cr.rating END) as average_rating
-        FROM character_ratings cr
-        WHERE cr.user_id = ?
-        """,
-        (user_id,),
-        fetch_one=True
-    )
-
-    stats = dict_from_row(row) if row else {}
-
-    # Available characters (from rated anime)
-    available = db.execute_query(
-        """
-        SELECT COUNT(DISTINCT c.id) as cnt
-        FROM character c
-        INNER JOIN anime_character ac ON c.id = ac.character_id
-        INNER JOIN user_ratings ur ON ac.anime_id = ur.anime_id
-        WHERE ur.user_id = ? AND ur.status = 'RATED'
-            AND ac.role IN ('MAIN', 'SUPPORTING')
-        """,
-        (user_id,),
-        fetch_one=True
-    )['cnt']
+    stats = get_rating_stats(user_id)
+    available = stats['available_characters']
 
     return {
         'total': available,
-        'rated': stats.get('rated', 0),
-        'wantToKnow': stats.get('want_to_know', 0),
-        'notInterested': stats.get('not_interested', 0),
-        'remaining': available - stats.get('rated', 0) - stats.get('not_interested', 0),
-        'averageRating': stats.get('average_rating', 0) or 0
+        'rated': stats['character_rated'],
+        'wantToKnow': stats['character_want_to_know'],
+        'notInterested': stats['character_not_interested'],
+        'remaining': available - stats['character_rated'] - stats['character_not_interested'],
+        'averageRating': _average(stats['character_rating_sum'], stats['character_rating_count'])
     }
 
 
+def _average(total: float, count: int) -> float:
+    return total / count if count else 0
+
+
 def get_items_for_review_writing(user_id: int, limit: int = 50) -> List[Dict]:
     """
     리뷰 작성 페이지 전용 - 초고속 쿼리 (0.1초 목표)
@@ -337,45 +645,21 @@ def get_items_for_review_writing(user_id: int, limit: int = 50) -> List[Dict]:
 
 def get_review_writing_stats(user_id: int) -> Dict:
     """
-    리뷰 작성 페이지 통계 - 초고속 집계
+    리뷰 작성 페이지 통계 - rating_page_stats 1행
     """
-
-    # 단일 쿼리로 모든 통계 계산
-    stats = db.execute_query(
-        """
-        SELECT
-            SUM(CASE WHEN activity_type = 'anime_rating'
-                AND (review_content IS NOT NULL AND review_content != '')
-                THEN 1 ELSE 0 END) as anime_reviewed,
-            SUM(CASE WHEN activity_type = 'anime_rating'
-                AND (review_content IS NULL OR review_content = '')
-                THEN 1 ELSE 0 END) as anime_pending,
-            SUM(CASE WHEN activity_type = 'character_rating'
-                AND (review_content IS NOT NULL AND review_content != '')
-                THEN 1 ELSE 0 END) as character_reviewed,
-            SUM(CASE WHEN activity_type = 'character_rating'
-                AND (review_content IS NULL OR review_content = '')
-                THEN 1 ELSE 0 END) as character_pending
-        FROM activities
-        WHERE user_id = ? AND activity_type IN ('anime_rating', 'character_rating')
-        """,
-        (user_id,),
-        fetch_one=True
-    )
-
-    result = dict_from_row(stats) if stats else {}
+    stats = get_rating_stats(user_id)
 
     return {
         'anime': {
-            'reviewed': result.get('anime_reviewed', 0),
-            'pending': result.get('anime_pending', 0)
+            'reviewed': stats['anime_reviewed'],
+            'pending': stats['anime_review_pending']
         },
         'character': {
-            'reviewed': result.get('character_reviewed', 0),
-            'pending': result.get('character_pending', 0)
+            'reviewed': stats['character_reviewed'],
+            'pending': stats['character_review_pending']
         },
         'total': {
-            'reviewed': result.get('anime_reviewed', 0) + result.get('character_reviewed', 0),
-            'pending': result.get('anime_pending', 0) + result.get('character_pending', 0)
+            'reviewed': stats['anime_reviewed'] + stats['character_reviewed'],
+            'pending': stats['anime_review_pending'] + stats['character_review_pending']
         }
     }
@@ -7,6 +7,7 @@ from datetime import datetime
 from fastapi import HTTPException, status
 from database import db, dict_from_row, dicts_from_rows
 from models.rating import RatingCreate, RatingUpdate, RatingResponse, UserRatingListResponse, RatingStatus
+from services.activity_sync_service import upsert_rating_activity
 
 
 def create_or_update_rating(user_id: int, rating_data: RatingCreate) -> RatingResponse:
@@ -27,22 +28,17 @@ def create_or_update_rating(user_id: int, rating_data: RatingCreate) -> RatingRe
 
     # 기존 평점 확인
     existing = db.execute_query(
-        "SELECT id FROM user_ratings WHERE user_id = ? AND anime_id = ?",
+        "SELECT id, rating, status FROM user_ratings WHERE user_id = ? AND anime_id = ?",
         (user_id, rating_data.anime_id),
         fetch_one=True
     )
 
-    # Delete from activities first (트리거가 동작하지 않을 경우를 대비)
-    db.execute_update(
-        """
-        DELETE FROM activities
-        WHERE activity_type = 'anime_rating'
-          AND user_id = ?
-          AND item_id = ?
-        """,
-        (user_id, rating_data.anime_id)
-    )
+    # 평점/상태가 그대로면 아무것도 쓰지 않음 (더블탭 시 피드 순서가 바뀌지 않도록)
+    requested_rating = rating_data.rating if rating_data.status == RatingStatus.RATED else None
+    if existing and existing['status'] == rating_data.status.value and existing['rating'] == requested_rating:
+        return _with_otaku_score(user_id, get_rating_by_id(existing['id']))
 
+    # activities는 트리거가 같은 upsert로 동기화 (RATED가 아니면 삭제)
     if existing:
         # 수정
         # WANT_TO_WATCH 또는 PASS로 변경 시 rating을 NULL로 설정
@@ -70,70 +66,82 @@ def create_or_update_rating(user_id: int, rating_data: RatingCreate) -> RatingRe
             (user_id, rating_data.anime_id, final_rating, rating_data.status.value)
         )
 
-    # RATED 상태일 때 activities 동기화 확인
-    # 트리거가 동작했는지 확인하고, 동작하지 않았으면 수동 동기화
+    # RATED면 activity_time을 현재 시각으로 올려 피드 최신으로 이동 (승급 메시지에 사용)
     rating_activity_time = None
     if rating_data.status == RatingStatus.RATED and rating_data.rating:
-        # Check if trigger worked
-        activity_exists = db.execute_query(
-            """
-            SELECT 1 FROM activities
-            WHERE activity_type = 'anime_rating'
-              AND user_id = ?
-              AND item_id = ?
-            """,
-            (user_id, rating_data.anime_id),
-            fetch_one=True
-        )
-
-        # If trigger didn't work, manually sync
-        if not activity_exists:
-            _sync_to_activities(user_id, rating_data.anime_id)
-
-        # Update activity_time to current time (move to recent feed)
-        db.execute_update("""
-            UPDATE activities
-            SET activity_time = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE activity_type = 'anime_rating'
-              AND user_id = ?
-              AND item_id = ?
-        """, (user_id, rating_data.anime_id))
-
-        # 업데이트된 activity_time을 조회 (승급 메시지에 사용)
-        activity_time_result = db.execute_query(
-            """
-            SELECT activity_time
-            FROM activities
-            WHERE activity_type = 'anime_rating'
-              AND user_id = ?
-              AND item_id = ?
-            """,
-            (user_id, rating_data.anime_id),
-            fetch_one=True
-        )
-        if activity_time_result:
-            rating_activity_time = activity_time_result['activity_time']
+        rating_activity_time = upsert_rating_activity('anime_rating', user_id, rating_data.anime_id, touch=True)
 
     # 사용자 통계 업데이트 (승급 시 사용할 activity_time 전달)
     _update_user_stats(user_id, rating_activity_time)
 
-    # 생성/수정된 평점 조회
-    rating_response = get_rating_by_id(rating_id)
+    # 생성/수정된 평점 조회 (업데이트된 otaku_score 포함)
+    return _with_otaku_score(user_id, get_rating_by_id(rating_id))
+
 
-    # 업데이트된 otaku_score 조회하여 함께 반환
+def _with_otaku_score(user_id: int, rating_response: Optional[RatingResponse]) -> Optional[RatingResponse]:
+    """평점 응답에 현재 otaku_score 추가"""
     updated_stats = db.execute_query(
         "SELECT otaku_score FROM user_stats WHERE user_id = ?",
         (user_id,),
         fetch_one=True
     )
     if updated_stats and rating_response:
-        # otaku_score를 rating_response에 추가
         rating_response.otaku_score = updated_stats['otaku_score']
 
     return rating_response
 
 
+def bulk_upsert_ratings(user_id: int, entries: List[Dict], overwrite: bool = False) -> int:
+    """
+    평점 일괄 저장 (외부 리스트 가져오기 등 대량 쓰기용)
+
+    create_or_update_rating과 달리 항목별 activities 정리/통계 재계산을 하지 않음
+    - 배치 전체를 executemany 한 번(단일 트랜잭션)으로 기록
+    - activities 동기화는 트리거가 담당 (RATED가 아니게 되면 삭제까지)
+    - 통계 재계산은 호출자가 마지막에 _update_user_stats로 한 번만 수행
+
+    Args:
+        user_id: 사용자 ID
+        entries: {'anime_id', 'rating', 'status', 'updated_at'(선택)} dict 목록
+                 외부 updated_at은 created_at으로만 사용 (updated_at은 델타 동기화 기준이라 항상 현재 시각)
+        overwrite: True면 기존 평점을 덮어씀, False면 기존 평점 유지
+
+    Returns:
+        새로 기록(또는 덮어쓴) 행 수
+    """
+    if not entries:
+        return 0
+
+    if overwrite:
+        conflict_clause = """
+            DO UPDATE SET rating = excluded.rating,
+                          status = excluded.status,
+                          updated_at = CURRENT_TIMESTAMP
+        """
+    else:
+        conflict_clause = "DO NOTHING"
+
+    written = db.execute_many(
+        f"""
+        INSERT INTO user_ratings (user_id, anime_id, rating, status, created_at, updated_at)
+        VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), CURRENT_TIMESTAMP)
+        ON CONFLICT(user_id, anime_id) {conflict_clause}
+        """,
+        [
+            (
+                user_id,
+                entry['anime_id'],
+                entry['rating'] if entry['status'] == RatingStatus.RATED.value else None,
+                entry['status'],
+                entry.get('updated_at')
+            )
+            for entry in entries
+        ]
+    )
+
+    return written
+
+
 def get_rating_by_id(rating_id: int) -> Optional[RatingResponse]:
     """평점 ID로 조회"""
     row = db.execute_query(
@@ -467,73 +475,6 @@ def delete_rating(user_id: int, anime_id: int) -> bool:
     return False
 
 
-def _sync_to_activities(user_id: int, anime_id: int):
-    """user_ratings 데이터를 activities 테이블에 동기화 (트리거 대체)"""
-
-    # 사용자 정보와 평점 정보 조회
-    data = db.execute_query(
-        """
-        SELECT
-            ur.user_id,
-            ur.anime_id,
-            ur.rating,
-            ur.created_at,
-            ur.updated_at,
-            u.username,
-            u.display_name,
-            u.avatar_url,
-            COALESCE(us.otaku_score, 0) as otaku_score,
-            a.title_romaji,
-            a.title_korean,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as item_image,
-            r.title as review_title,
-            r.content as review_content,
-            COALESCE(r.is_spoiler, 0) as is_spoiler
-        FROM user_ratings ur
-        JOIN users u ON u.id = ur.user_id
-        JOIN anime a ON a.id = ur.anime_id
-        LEFT JOIN user_stats us ON us.user_id = ur.user_id
-        LEFT JOIN user_reviews r ON r.user_id = ur.user_id AND r.anime_id = ur.anime_id
-        WHERE ur.user_id = ? AND ur.anime_id = ? AND ur.status = 'RATED'
-        """,
-        (user_id, anime_id),
-        fetch_one=True
-    )
-
-    if data:
-        # activities 테이블에 INSERT (OR REPLACE로 중복 방지)
-        db.execute_update(
-            """
-            INSERT OR REPLACE INTO activities (
-                activity_type, user_id, item_id, activity_time,
-                username, display_name, avatar_url, otaku_score,
-                item_title, item_title_korean, item_image,
-                rating, review_title, review_content, is_spoiler,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                'anime_rating',
-                data['user_id'],
-                data['anime_id'],
-                data['created_at'],
-                data['username'],
-                data['display_name'],
-                data['avatar_url'],
-                data['otaku_score'],
-                data['title_romaji'],
-                data['title_korean'],
-                data['item_image'],
-                data['rating'],
-                data['review_title'],
-                data['review_content'],
-                data['is_spoiler'],
-                data['created_at'],
-                data['updated_at']
-            )
-        )
-
-
 def _get_rank_info(otaku_score: float) -> tuple[str, int]:
     """
     Get rank name and level from otaku score
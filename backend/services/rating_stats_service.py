@@ -0,0 +1,217 @@
+"""
+Rating Stats Service
+평가 페이지 / 리뷰 작성 페이지 통계 카운터 (rating_page_stats, 사용자당 1행)
+
+트리거(NEW/OLD 참조)와 재집계(테이블 별칭 참조)가 같은 식을 사용
+- user_ratings / character_ratings / activities 변경 시 트리거가 차이만큼 더하고 뺌
+  → 평가 API, 가져오기, 관리자 편집 등 어떤 경로로 바뀌어도 반영
+- 평균 평점은 합계/개수로 보관
+- available_characters (평가한 애니의 MAIN/SUPPORTING 캐릭터 수)는 평가가 RATED로 바뀌거나
+  RATED에서 빠질 때 다른 평가한 애니에 없는 캐릭터 수만큼 증감
+  anime_character는 크롤링으로 바뀌므로 catalog_version이 다르면 조회 시 재집계
+- INSERT OR REPLACE의 암묵적 삭제는 트리거를 부르지 않으므로 (마이그레이션 스크립트)
+  ensure_schema가 시작할 때마다 전체 재집계
+"""
+from typing import Dict, Optional
+from database import db
+from services.catalog_service import get_catalog_version
+
+
+# 카운터 컬럼 → 한 행의 기여분 ({r}: NEW / OLD / 테이블 별칭)
+_RATING_COUNTERS = {
+    'anime_rated': "CASE WHEN {r}.status = 'RATED' THEN 1 ELSE 0 END",
+    'anime_want_to_watch': "CASE WHEN {r}.status = 'WANT_TO_WATCH' THEN 1 ELSE 0 END",
+    'anime_pass': "CASE WHEN {r}.status = 'PASS' THEN 1 ELSE 0 END",
+    'anime_rating_sum': "CASE WHEN {r}.status = 'RATED' AND {r}.rating IS NOT NULL THEN {r}.rating ELSE 0 END",
+    'anime_rating_count': "CASE WHEN {r}.status = 'RATED' AND {r}.rating IS NOT NULL THEN 1 ELSE 0 END",
+}
+
+_CHARACTER_COUNTERS = {
+    'character_rated': "CASE WHEN {r}.status = 'RATED' THEN 1 ELSE 0 END",
+    'character_want_to_know': "CASE WHEN {r}.status = 'WANT_TO_KNOW' THEN 1 ELSE 0 END",
+    'character_not_interested': "CASE WHEN {r}.status = 'NOT_INTERESTED' THEN 1 ELSE 0 END",
+    'character_rating_sum': "CASE WHEN {r}.status = 'RATED' AND {r}.rating IS NOT NULL THEN {r}.rating ELSE 0 END",
+    'character_rating_count': "CASE WHEN {r}.status = 'RATED' AND {r}.rating IS NOT NULL THEN 1 ELSE 0 END",
+}
+
+_REVIEW_COUNTERS = {
+    'anime_reviewed':
+        "CASE WHEN {r}.activity_type = 'anime_rating' AND COALESCE({r}.review_content, '') != '' THEN 1 ELSE 0 END",
+    'anime_review_pending':
+        "CASE WHEN {r}.activity_type = 'anime_rating' AND COALESCE({r}.review_content, '') = '' THEN 1 ELSE 0 END",
+    'character_reviewed':
+        "CASE WHEN {r}.activity_type = 'character_rating' AND COALESCE({r}.review_content, '') != '' THEN 1 ELSE 0 END",
+    'character_review_pending':
+        "CASE WHEN {r}.activity_type = 'character_rating' AND COALESCE({r}.review_content, '') = '' THEN 1 ELSE 0 END",
+}
+
+# {r}의 애니가 새로 더하는 캐릭터 수 (같은 사용자가 평가한 다른 애니에 없는 MAIN/SUPPORTING 캐릭터)
+_NEW_CHARACTERS = """(
+    SELECT COUNT(DISTINCT ac.character_id)
+    FROM anime_character ac
+    JOIN character c ON c.id = ac.character_id
+    WHERE ac.anime_id = {r}.anime_id
+      AND ac.role IN ('MAIN', 'SUPPORTING')
+      AND NOT EXISTS (
+          SELECT 1
+          FROM anime_character other
+          JOIN user_ratings ur2 ON ur2.anime_id = other.anime_id
+          WHERE other.character_id = ac.character_id
+            AND other.role IN ('MAIN', 'SUPPORTING')
+            AND other.anime_id != {r}.anime_id
+            AND ur2.user_id = {r}.user_id
+            AND ur2.status = 'RATED'
+      )
+)"""
+
+_COLUMNS = list(_RATING_COUNTERS) + list(_CHARACTER_COUNTERS) + list(_REVIEW_COUNTERS) + ['available_characters']
+
+_REVIEW_ACTIVITY_TYPES = "('anime_rating', 'character_rating')"
+
+
+def install_rating_stats_triggers():
+    """rating_page_stats 테이블과 유지 트리거 생성 (ensure_schema에서 호출)"""
+    db.execute_update(f"""
+        CREATE TABLE IF NOT EXISTS rating_page_stats (
+            user_id INTEGER PRIMARY KEY,
+            {', '.join(f'{column} {"REAL" if column.endswith("_sum") else "INTEGER"} NOT NULL DEFAULT 0'
+                       for column in _COLUMNS)},
+            catalog_version TEXT
+        )
+    """)
+
+    # 기존 정의가 바뀌었을 수 있으므로 다시 생성
+    for name in (
+        'trg_rating_stats_anime_insert', 'trg_rating_stats_anime_update', 'trg_rating_stats_anime_delete',
+        'trg_rating_stats_character_insert', 'trg_rating_stats_character_update',
+        'trg_rating_stats_character_delete',
+        'trg_rating_stats_review_insert', 'trg_rating_stats_review_update', 'trg_rating_stats_review_delete',
+    ):
+        db.execute_update(f"DROP TRIGGER IF EXISTS {name}")
+
+    anime_insert = dict(_RATING_COUNTERS, available_characters=(
+        f"CASE WHEN {{r}}.status = 'RATED' THEN {_NEW_CHARACTERS} ELSE 0 END"
+    ))
+    _create_triggers('anime', 'user_ratings', 'status, rating', anime_insert, anime_update={
+        **{column: _delta(expression) for column, expression in _RATING_COUNTERS.items()},
+        'available_characters': (
+            f"CASE WHEN NEW.status = 'RATED' AND OLD.status IS NOT 'RATED' "
+            f"THEN {_NEW_CHARACTERS.format(r='NEW')} "
+            f"WHEN OLD.status = 'RATED' AND NEW.status IS NOT 'RATED' "
+            f"THEN -{_NEW_CHARACTERS.format(r='OLD')} ELSE 0 END"
+        ),
+    })
+    _create_triggers('character', 'character_ratings', 'status, rating', _CHARACTER_COUNTERS)
+    _create_triggers(
+        'review', 'activities', 'activity_type, review_content', _REVIEW_COUNTERS,
+        when=f"{{r}}.activity_type IN {_REVIEW_ACTIVITY_TYPES}"
+    )
+
+
+def recount_rating_stats(user_id: Optional[int] = None) -> int:
+    """rating_page_stats를 원본 테이블에서 다시 집계 (user_id 없으면 전체 사용자)"""
+    user_filter = "= ?" if user_id is not None else "IS NOT NULL"
+    params = (get_catalog_version(),) + ((user_id,) * 5 if user_id is not None else ())
+
+    def sums(counters: Dict[str, str], alias: str) -> str:
+        return ', '.join(f"SUM({expression.format(r=alias)}) as {column}" for column, expression in counters.items())
+
+    values = ', '.join(f"COALESCE({column}, 0)" for column in _COLUMNS)
+    return db.execute_update(
+        f"""
+        INSERT OR REPLACE INTO rating_page_stats (user_id, {', '.join(_COLUMNS)}, catalog_version)
+        SELECT u.id, {values}, ?
+        FROM users u
+        LEFT JOIN (
+            SELECT ur.user_id, {sums(_RATING_COUNTERS, 'ur')}
+            FROM user_ratings ur
+            WHERE ur.user_id {user_filter}
+            GROUP BY ur.user_id
+        ) ar ON ar.user_id = u.id
+        LEFT JOIN (
+            SELECT cr.user_id, {sums(_CHARACTER_COUNTERS, 'cr')}
+            FROM character_ratings cr
+            WHERE cr.user_id {user_filter}
+            GROUP BY cr.user_id
+        ) crt ON crt.user_id = u.id
+        LEFT JOIN (
+            SELECT act.user_id, {sums(_REVIEW_COUNTERS, 'act')}
+            FROM activities act
+            WHERE act.user_id {user_filter} AND act.activity_type IN {_REVIEW_ACTIVITY_TYPES}
+            GROUP BY act.user_id
+        ) rv ON rv.user_id = u.id
+        LEFT JOIN (
+            SELECT ur.user_id, COUNT(DISTINCT c.id) as available_characters
+            FROM user_ratings ur
+            JOIN anime_character ac ON ac.anime_id = ur.anime_id
+            JOIN character c ON c.id = ac.character_id
+            WHERE ur.user_id {user_filter} AND ur.status = 'RATED'
+              AND ac.role IN ('MAIN', 'SUPPORTING')
+            GROUP BY ur.user_id
+        ) ch ON ch.user_id = u.id
+        WHERE u.id {user_filter}
+        """,
+        params
+    )
+
+
+def get_rating_stats(user_id: int) -> Dict:
+    """사용자의 카운터 행 (없거나 카탈로그가 바뀌었으면 재집계)"""
+    row = db.execute_query("SELECT * FROM rating_page_stats WHERE user_id = ?", (user_id,), fetch_one=True)
+    if row is None or row['catalog_version'] != get_catalog_version():
+        recount_rating_stats(user_id)
+        row = db.execute_query("SELECT * FROM rating_page_stats WHERE user_id = ?", (user_id,), fetch_one=True)
+    if row is None:  # users에 없는 ID
+        return {column: 0 for column in _COLUMNS}
+    return {column: row[column] for column in _COLUMNS}
+
+
+def _delta(expression: str) -> str:
+    return f"({expression.format(r='NEW')}) - ({expression.format(r='OLD')})"
+
+
+def _create_triggers(name: str, table: str, update_columns: str, counters: Dict[str, str],
+                     anime_update: Optional[Dict[str, str]] = None, when: Optional[str] = None):
+    """
+    INSERT(+NEW) / DELETE(-OLD) / UPDATE(NEW - OLD) 트리거
+    (행 생성은 NOT EXISTS로: 바깥 UPSERT의 충돌 정책이 트리거 안의 OR IGNORE를 덮어씀)
+    """
+
+    def body(row: str, assignments: str) -> str:
+        return f"""
+            INSERT INTO rating_page_stats (user_id)
+            SELECT {row}.user_id WHERE NOT EXISTS (SELECT 1 FROM rating_page_stats WHERE user_id = {row}.user_id);
+            UPDATE rating_page_stats SET {assignments} WHERE user_id = {row}.user_id;
+        """
+
+    def condition(*rows: str) -> str:
+        if not when:
+            return ""
+        return "WHEN " + " OR ".join(f"({when.format(r=row)})" for row in rows)
+
+    update = anime_update or {column: _delta(expression) for column, expression in counters.items()}
+
+    db.execute_update(f"""
+        CREATE TRIGGER trg_rating_stats_{name}_insert
+        AFTER INSERT ON {table}
+        {condition('NEW')}
+        BEGIN
+            {body('NEW', ', '.join(f"{c} = {c} + ({e.format(r='NEW')})" for c, e in counters.items()))}
+        END
+    """)
+    db.execute_update(f"""
+        CREATE TRIGGER trg_rating_stats_{name}_delete
+        AFTER DELETE ON {table}
+        {condition('OLD')}
+        BEGIN
+            {body('OLD', ', '.join(f"{c} = {c} - ({e.format(r='OLD')})" for c, e in counters.items()))}
+        END
+    """)
+    db.execute_update(f"""
+        CREATE TRIGGER trg_rating_stats_{name}_update
+        AFTER UPDATE OF {update_columns} ON {table}
+        {condition('NEW', 'OLD')}
+        BEGIN
+            {body('NEW', ', '.join(f"{c} = {c} + {e}" for c, e in update.items()))}
+        END
+    """)
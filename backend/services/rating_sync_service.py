@@ -0,0 +1,123 @@
+"""
+Rating Sync Service
+평점 라이브러리 델타 동기화 (since 커서 이후 변경분만)
+
+- 변경/추가: user_ratings, character_ratings의 (user_id, updated_at) 인덱스로 조회
+- 삭제: rating_deletions 툼스톤 (AFTER DELETE 트리거로 기록)
+- 커서는 DB 기준 시각, 조회는 >= 비교 → 같은 초에 들어온 변경도 놓치지 않음 (중복은 upsert라 무해)
+"""
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from fastapi import HTTPException, status
+from database import db, dicts_from_rows
+from config import RATING_DELETION_RETENTION_DAYS
+
+
+CURSOR_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def get_rating_changes(user_id: int, since: Optional[str] = None) -> Dict:
+    """
+    since 이후 변경된 애니/캐릭터 평점과 삭제된 항목 ID
+
+    since가 없거나 툼스톤 보관 기간보다 오래되면 전체 목록을 반환 (full_sync=True)
+    """
+    # 조회 전에 커서를 잡아야 조회 중에 들어온 변경이 다음 동기화에 포함됨
+    now_row = db.execute_query(
+        "SELECT CURRENT_TIMESTAMP as now, datetime('now', ?) as oldest",
+        (f"-{RATING_DELETION_RETENTION_DAYS} days",),
+        fetch_one=True
+    )
+    cursor = now_row['now']
+
+    since = _parse_cursor(since)
+    full_sync = since is None or since < now_row['oldest']
+
+    anime_query = """
+        SELECT
+            ur.anime_id,
+            ur.rating,
+            ur.status,
+            a.title_romaji,
+            a.title_korean,
+            a.title_native,
+            a.cover_image_url as image_url,
+            ur.updated_at
+        FROM user_ratings ur
+        JOIN anime a ON ur.anime_id = a.id
+        WHERE ur.user_id = ?
+    """
+    character_query = """
+        SELECT
+            cr.character_id,
+            cr.rating,
+            cr.status,
+            c.name_full,
+            c.name_native,
+            c.name_korean,
+            COALESCE('/' || c.image_local, c.image_url) as image_url,
+            cr.updated_at
+        FROM character_ratings cr
+        JOIN character c ON cr.character_id = c.id
+        WHERE cr.user_id = ?
+    """
+
+    if full_sync:
+        anime_rows = db.execute_query(anime_query, (user_id,))
+        character_rows = db.execute_query(character_query, (user_id,))
+        deleted_anime = []
+        deleted_characters = []
+    else:
+        anime_rows = db.execute_query(anime_query + " AND ur.updated_at >= ?", (user_id, since))
+        character_rows = db.execute_query(character_query + " AND cr.updated_at >= ?", (user_id, since))
+        deleted_anime = _get_deleted_ids(user_id, 'anime', since)
+        deleted_characters = _get_deleted_ids(user_id, 'character', since)
+
+    return {
+        'cursor': cursor,
+        'full_sync': full_sync,
+        'anime': {
+            'upserts': dicts_from_rows(anime_rows),
+            'deleted': deleted_anime,
+        },
+        'characters': {
+            'upserts': dicts_from_rows(character_rows),
+            'deleted': deleted_characters,
+        },
+    }
+
+
+def _get_deleted_ids(user_id: int, item_type: str, since: str) -> list:
+    """since 이후 삭제된 항목 (그 뒤 다시 평가한 항목은 upserts에 있으므로 제외)"""
+    if item_type == 'anime':
+        still_exists = "SELECT 1 FROM user_ratings r WHERE r.user_id = d.user_id AND r.anime_id = d.item_id"
+    else:
+        still_exists = "SELECT 1 FROM character_ratings r WHERE r.user_id = d.user_id AND r.character_id = d.item_id"
+
+    rows = db.execute_query(
+        f"""
+        SELECT DISTINCT d.item_id
+        FROM rating_deletions d
+        WHERE d.user_id = ? AND d.item_type = ? AND d.deleted_at >= ?
+          AND NOT EXISTS ({still_exists})
+        """,
+        (user_id, item_type, since)
+    )
+    return [row['item_id'] for row in rows]
+
+
+def _parse_cursor(since: Optional[str]) -> Optional[str]:
+    """커서 문자열 검증 후 SQLite DATETIME 형식으로 정규화 (ISO 8601도 허용)"""
+    if not since:
+        return None
+    try:
+        parsed = datetime.fromisoformat(since.strip().replace('Z', '+00:00'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    # CURRENT_TIMESTAMP는 UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime(CURSOR_FORMAT)
@@ -0,0 +1,703 @@
+"""
+Recommendation Service
+user_ratings 기반 협업 필터링 (아이템-아이템 / 사용자-사용자)
+
+- 오프라인/주기 작업 (build_item_similarities):
+  사용자별 평균을 뺀 평점으로 애니 간 코사인 유사도(adjusted cosine)를 계산해
+  애니마다 상위 ITEM_NEIGHBORS_K개 이웃을 anime_similarity에 저장
+  (함께 평가한 사용자 수로 축소: sim × n / (n + ITEM_SIMILARITY_SHRINKAGE))
+- 요청 시 (recommend_for_user): 사용자가 평가한 애니의 이웃만 읽어 미평가 애니 점수 계산
+  예측 평점 = 사용자 평균 + Σ sim × (평점 - 평균) / (Σ|sim| + 감쇠)
+  평가가 많은 사용자는 평균에서 먼 평가 RECOMMENDATION_MAX_SOURCE_RATINGS개의 이웃만 읽음
+- 취향 이웃 (refresh_user_similarities): 공통 평가 애니만으로 평균 중심 코사인(Pearson),
+  USER_SIMILARITY_MIN_OVERLAP개 이상 겹치는 사용자 중 상위 TOP_K_SIMILAR_USERS명을 user_similarity에,
+  이웃이 높게 준 미평가 애니("비슷한 취향이 좋아한")를 recommendation_cache에 저장
+  평가가 바뀌었거나 RECOMMENDATION_CACHE_DAYS가 지난 사용자만 다시 계산 (요청 시에는 읽기만)
+- SciPy가 있으면 희소 행렬 곱으로, 없으면 순수 Python (애니 하나씩 누적해 메모리 일정)
+"""
+import heapq
+import json
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+from database import db, dict_from_row
+from services.relation_loader import attach_anime_relations, fetch_by_ids
+from services.content_similarity_service import build_content_similarities, content_similarities_are_stale
+from config import (
+    MIN_RATINGS_FOR_RECOMMENDATION, ITEM_NEIGHBORS_K, ITEM_SIMILARITY_MIN_CO_RATERS,
+    ITEM_SIMILARITY_SHRINKAGE, ITEM_SIMILARITY_REFRESH_HOURS, RECOMMENDATION_PREDICTION_DAMPING,
+    RECOMMENDATION_MAX_SOURCE_RATINGS, RECOMMENDATION_CACHE_DAYS, RECOMMENDATION_REFRESH_CHECK_MINUTES,
+    TOP_K_SIMILAR_USERS, USER_SIMILARITY_MIN_OVERLAP, USER_SIMILARITY_SHRINKAGE, USER_SIMILARITY_BATCH_SIZE,
+    TWINS_LOVED_MIN_RATING, TWINS_LOVED_CACHE_SIZE
+)
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy / scipy는 선택 의존성
+    np = None
+    sparse = None
+
+
+ITEM_SIMILARITY_BUILT_KEY = 'item_similarity_built_at'
+
+# recommendation_cache.reason의 source (다른 추천 종류와 구분)
+TWINS_LOVED_SOURCE = 'taste_twins'
+
+_build_lock = threading.Lock()
+_refresher_started = False
+
+_RECOMMENDATION_COLUMNS = """
+    a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean,
+    COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+    a.format, a.episodes, a.status, a.season, a.season_year, a.average_score, a.popularity
+"""
+
+
+def build_item_similarities() -> Dict:
+    """anime_similarity 전체 재계산 (오래 걸리므로 요청 경로에서 호출하지 않음)"""
+    with _build_lock:
+        started = time.perf_counter()
+        item_users = _item_users(_load_user_deviations())
+
+        if sparse is not None:
+            neighbors = _neighbors_scipy(item_users)
+        else:
+            neighbors = _neighbors_python(item_users)
+
+        rows = [
+            (anime_id, other_id, round(similarity, 6), co_raters)
+            for anime_id, items in neighbors.items()
+            for similarity, other_id, co_raters in items
+        ]
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM anime_similarity")
+            conn.executemany(
+                """
+                INSERT INTO anime_similarity (anime_id, similar_anime_id, similarity, co_raters)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows
+            )
+            conn.execute(
+                """
+                INSERT INTO crawl_meta (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+                """,
+                (ITEM_SIMILARITY_BUILT_KEY, str(int(time.time())))
+            )
+            conn.commit()
+
+        elapsed = (time.perf_counter() - started) * 1000
+        stats = {
+            'anime': len(item_users),
+            'anime_with_neighbors': len(neighbors),
+            'pairs': len(rows),
+            'elapsed_ms': round(elapsed),
+            'engine': 'scipy' if sparse is not None else 'python',
+        }
+        print(f"[Recommendation] Item similarities built: {stats}")
+        return stats
+
+
+def recommend_for_user(user_id: int, limit: int = 20) -> Dict:
+    """
+    사용자 맞춤 추천 (평가/보고싶어요/관심없음 표시한 애니 제외)
+    평가가 MIN_RATINGS_FOR_RECOMMENDATION개 미만이면 빈 목록
+    """
+    user_rows = db.execute_query(
+        "SELECT anime_id, rating, status FROM user_ratings WHERE user_id = ? ORDER BY updated_at DESC",
+        (user_id,)
+    )
+    rated = {
+        row['anime_id']: row['rating'] for row in user_rows
+        if row['status'] == 'RATED' and row['rating'] is not None
+    }
+    result = {
+        'items': [],
+        'rated_count': len(rated),
+        'min_ratings': MIN_RATINGS_FOR_RECOMMENDATION,
+    }
+    if len(rated) < MIN_RATINGS_FOR_RECOMMENDATION:
+        return result
+
+    seen = {row['anime_id'] for row in user_rows}
+    mean = sum(rated.values()) / len(rated)
+    # 최근 순으로 정렬돼 있으므로 편차가 같으면 최근 평가가 앞
+    sources = sorted(rated, key=lambda anime_id: -abs(rated[anime_id] - mean))[:RECOMMENDATION_MAX_SOURCE_RATINGS]
+
+    # 후보 → [Σ sim × 편차, Σ|sim|, (가장 크게 기여한 기여도, 평가한 애니)]
+    scores: Dict[int, list] = {}
+    for anime_id, row in fetch_by_ids(
+        """
+        SELECT anime_id, similar_anime_id, similarity
+        FROM anime_similarity
+        WHERE anime_id IN ({placeholders})
+        """,
+        sources
+    ):
+        candidate = row['similar_anime_id']
+        if candidate in seen:
+            continue
+        contribution = row['similarity'] * (rated[anime_id] - mean)
+        entry = scores.setdefault(candidate, [0.0, 0.0, (0.0, None)])
+        entry[0] += contribution
+        entry[1] += abs(row['similarity'])
+        if contribution > entry[2][0]:
+            entry[2] = (contribution, anime_id)
+
+    ranked = heapq.nlargest(
+        limit,
+        (
+            (mean + weighted / (total + RECOMMENDATION_PREDICTION_DAMPING), candidate, because)
+            for candidate, (weighted, total, (_, because)) in scores.items()
+            if weighted > 0
+        )
+    )
+    if not ranked:
+        return result
+
+    anime_ids = [candidate for _, candidate, _ in ranked]
+    reason_ids = {because for _, _, because in ranked if because is not None}
+    rows = _load_anime(anime_ids + list(reason_ids))
+
+    items = []
+    for predicted, candidate, because in ranked:
+        if candidate not in rows:
+            continue
+        item = dict(rows[candidate])
+        item['predicted_rating'] = round(min(predicted, 5.0), 2)
+        reason = rows.get(because)
+        item['because_of'] = {
+            'id': because,
+            'title_korean': reason['title_korean'],
+            'title_romaji': reason['title_romaji'],
+            'my_rating': rated[because],
+        } if reason else None
+        items.append(item)
+
+    result['items'] = attach_anime_relations(items, genres=True, site_stats=True)
+    return result
+
+
+def similarities_are_stale() -> bool:
+    row = db.execute_query(
+        "SELECT value FROM crawl_meta WHERE key = ?",
+        (ITEM_SIMILARITY_BUILT_KEY,),
+        fetch_one=True
+    )
+    if not row or not row['value']:
+        return True
+    return time.time() - int(row['value']) >= ITEM_SIMILARITY_REFRESH_HOURS * 3600
+
+
+def refresh_user_similarities(user_ids: Optional[List[int]] = None) -> Dict:
+    """
+    취향 이웃 / "비슷한 취향이 좋아한" 목록 재계산
+    user_ids가 없으면 평가가 바뀌었거나 만료된 사용자만 (user_similarity_state 기준)
+    다시 계산한 사용자와의 유사도는 다른 사용자의 이웃 목록에도 반영
+    """
+    with _build_lock:
+        started = time.perf_counter()
+        computed_at = db.execute_query("SELECT datetime('now') as now", fetch_one=True)['now']
+        if user_ids is None:
+            user_ids = _users_needing_similarity()
+        if not user_ids:
+            return {'users': 0}
+
+        deviations = _load_user_deviations()
+        user_ids = [
+            user_id for user_id in user_ids
+            if len(deviations.get(user_id, ())) >= MIN_RATINGS_FOR_RECOMMENDATION
+        ]
+        pairs = 0
+        for start in range(0, len(user_ids), USER_SIMILARITY_BATCH_SIZE):
+            batch = user_ids[start:start + USER_SIMILARITY_BATCH_SIZE]
+            if sparse is not None:
+                similar = _similar_users_scipy(deviations, batch)
+            else:
+                similar = _similar_users_python(deviations, batch)
+            pairs += _save_user_similarities(similar, computed_at)
+            _save_twins_loved(batch, computed_at)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        stats = {
+            'users': len(user_ids),
+            'pairs': pairs,
+            'elapsed_ms': round(elapsed),
+            'engine': 'scipy' if sparse is not None else 'python',
+        }
+        print(f"[Recommendation] User similarities refreshed: {stats}")
+        return stats
+
+
+def get_taste_twins(user_id: int, limit: int = TOP_K_SIMILAR_USERS, exclude_following: bool = False) -> Dict:
+    """취향이 비슷한 사용자 (미리 계산한 목록, 만료되면 빈 목록)"""
+    state = _similarity_state(user_id)
+    result = {'items': [], 'computed_at': state}
+    if state is None:
+        return result
+
+    rows = db.execute_query(
+        f"""
+        SELECT u.id, u.username, u.display_name, u.avatar_url,
+               s.similarity, s.overlap,
+               CASE WHEN f.id IS NULL THEN 0 ELSE 1 END as is_following
+        FROM user_similarity s
+        JOIN users u ON u.id = s.similar_user_id
+        LEFT JOIN user_follows f ON f.follower_id = s.user_id AND f.following_id = s.similar_user_id
+        WHERE s.user_id = ?
+        {'AND f.id IS NULL' if exclude_following else ''}
+        ORDER BY s.similarity DESC
+        LIMIT ?
+        """,
+        (user_id, limit)
+    )
+    result['items'] = [
+        {**dict_from_row(row), 'similarity': round(row['similarity'], 3), 'is_following': bool(row['is_following'])}
+        for row in rows
+    ]
+    return result
+
+
+def get_twins_loved(user_id: int, limit: int = 20) -> Dict:
+    """취향 이웃이 높게 평가한 애니 (미리 계산한 목록, 그 뒤 평가/표시한 애니는 제외)"""
+    state = _similarity_state(user_id)
+    result = {'items': [], 'computed_at': state}
+    if state is None:
+        return result
+
+    cached = db.execute_query(
+        """
+        SELECT c.anime_id, c.score, c.reason
+        FROM recommendation_cache c
+        WHERE c.user_id = ?
+          AND json_extract(c.reason, '$.source') = ?
+          AND c.created_at >= datetime('now', ?)
+          AND NOT EXISTS (
+              SELECT 1 FROM user_ratings ur WHERE ur.user_id = c.user_id AND ur.anime_id = c.anime_id
+          )
+        ORDER BY c.score DESC
+        LIMIT ?
+        """,
+        (user_id, TWINS_LOVED_SOURCE, f"-{RECOMMENDATION_CACHE_DAYS} days", limit)
+    )
+    if not cached:
+        return result
+
+    reasons = {row['anime_id']: json.loads(row['reason']) for row in cached}
+    twin_ids = {twin_id for reason in reasons.values() for twin_id in reason['user_ids']}
+    twins = {
+        row['id']: dict_from_row(row)
+        for _, row in fetch_by_ids(
+            "SELECT id, username, display_name, avatar_url FROM users WHERE id IN ({placeholders})",
+            twin_ids,
+            key='id'
+        )
+    }
+    anime = _load_anime([row['anime_id'] for row in cached])
+
+    items = []
+    for row in cached:
+        if row['anime_id'] not in anime:
+            continue
+        item = dict(anime[row['anime_id']])
+        item['twin_score'] = round(row['score'], 3)
+        item['loved_by'] = [twins[twin_id] for twin_id in reasons[row['anime_id']]['user_ids'] if twin_id in twins]
+        items.append(item)
+
+    result['items'] = attach_anime_relations(items, genres=True, site_stats=True)
+    return result
+
+
+def start_similarity_refresher():
+    """
+    RECOMMENDATION_REFRESH_CHECK_MINUTES마다 백그라운드에서
+    오래된 아이템 유사도 재계산 + 평가가 바뀐 사용자의 취향 이웃 갱신
+    + 장르/태그/스튜디오 데이터가 바뀌었으면 내용 기반 유사도 재계산
+    """
+    global _refresher_started
+    if _refresher_started:
+        return
+    _refresher_started = True
+
+    def refresh_item():
+        if similarities_are_stale():
+            build_item_similarities()
+
+    def refresh_content():
+        if content_similarities_are_stale():
+            build_content_similarities()
+
+    # 작업별로 따로 실패 처리 (하나가 실패해도 나머지는 매 주기 실행)
+    jobs = (
+        ('Item similarity', refresh_item),
+        ('User similarity', refresh_user_similarities),
+        ('Content similarity', refresh_content),
+    )
+
+    def run():
+        while True:
+            for name, job in jobs:
+                try:
+                    job()
+                except Exception as e:
+                    print(f"[Recommendation] {name} refresh failed: {e}")
+            time.sleep(RECOMMENDATION_REFRESH_CHECK_MINUTES * 60)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _load_user_deviations() -> Dict[int, Dict[int, float]]:
+    """user_id → {anime_id: 평점 - 사용자 평균} (평가 2개 미만 사용자는 제외)"""
+    by_user: Dict[int, Dict[int, float]] = {}
+    for row in db.iter_query(
+        "SELECT user_id, anime_id, rating FROM user_ratings WHERE status = 'RATED' AND rating IS NOT NULL"
+    ):
+        by_user.setdefault(row['user_id'], {})[row['anime_id']] = row['rating']
+
+    deviations = {}
+    for user_id, ratings in by_user.items():
+        if len(ratings) < 2:
+            continue
+        mean = sum(ratings.values()) / len(ratings)
+        deviations[user_id] = {anime_id: rating - mean for anime_id, rating in ratings.items()}
+    return deviations
+
+
+def _item_users(deviations: Dict[int, Dict[int, float]]) -> Dict[int, Dict[int, float]]:
+    """anime_id → {user_id: 편차} (편차 0은 내적/노름에 기여하지 않으므로 제외)"""
+    item_users: Dict[int, Dict[int, float]] = {}
+    for user_id, ratings in deviations.items():
+        for anime_id, deviation in ratings.items():
+            if deviation:
+                item_users.setdefault(anime_id, {})[user_id] = deviation
+    return item_users
+
+
+def _load_anime(anime_ids: List[int]) -> Dict[int, Dict]:
+    return {
+        row['id']: dict_from_row(row)
+        for _, row in fetch_by_ids(
+            f"SELECT {_RECOMMENDATION_COLUMNS} FROM anime a WHERE a.id IN ({{placeholders}})",
+            anime_ids,
+            key='id'
+        )
+    }
+
+
+def _users_needing_similarity() -> List[int]:
+    """평가 수가 충분하고, 계산한 적 없거나 그 뒤 평가가 바뀌었거나 만료된 사용자"""
+    rows = db.execute_query(
+        """
+        SELECT r.user_id
+        FROM (
+            SELECT user_id, COUNT(*) as rated_count, MAX(updated_at) as last_rated_at
+            FROM user_ratings
+            WHERE status = 'RATED' AND rating IS NOT NULL
+            GROUP BY user_id
+        ) r
+        LEFT JOIN user_similarity_state s ON s.user_id = r.user_id
+        WHERE r.rated_count >= ?
+          AND (
+              s.user_id IS NULL
+              OR s.computed_at <= r.last_rated_at
+              OR s.computed_at < datetime('now', ?)
+              OR EXISTS (
+                  SELECT 1 FROM rating_deletions d
+                  WHERE d.user_id = r.user_id AND d.item_type = 'anime' AND d.deleted_at >= s.computed_at
+              )
+          )
+        """,
+        (MIN_RATINGS_FOR_RECOMMENDATION, f"-{RECOMMENDATION_CACHE_DAYS} days")
+    )
+    return [row['user_id'] for row in rows]
+
+
+def _similarity_state(user_id: int) -> Optional[str]:
+    """마지막 계산 시각 (없거나 RECOMMENDATION_CACHE_DAYS가 지났으면 None)"""
+    row = db.execute_query(
+        """
+        SELECT computed_at FROM user_similarity_state
+        WHERE user_id = ? AND computed_at >= datetime('now', ?)
+        """,
+        (user_id, f"-{RECOMMENDATION_CACHE_DAYS} days"),
+        fetch_one=True
+    )
+    return row['computed_at'] if row else None
+
+
+def _similar_users_python(deviations: Dict[int, Dict[int, float]], user_ids: List[int]) -> Dict[int, Dict[int, tuple]]:
+    """
+    user_id → {다른 사용자: (축소한 유사도, 공통 평가 수)}
+    애니별 평가자 목록을 따라 공통 평가 애니의 Σxy, Σx², Σy², n 누적
+    """
+    raters: Dict[int, List[tuple]] = {}
+    for other_id, ratings in deviations.items():
+        for anime_id, deviation in ratings.items():
+            raters.setdefault(anime_id, []).append((other_id, deviation))
+
+    similar = {}
+    for user_id in user_ids:
+        sums: Dict[int, list] = {}
+        for anime_id, deviation in deviations[user_id].items():
+            for other_id, other_deviation in raters[anime_id]:
+                entry = sums.get(other_id)
+                if entry is None:
+                    entry = sums[other_id] = [0.0, 0.0, 0.0, 0]
+                entry[0] += deviation * other_deviation
+                entry[1] += deviation * deviation
+                entry[2] += other_deviation * other_deviation
+                entry[3] += 1
+        del sums[user_id]
+        similar[user_id] = _pearson_neighbors(
+            (other_id, dot, user_square, other_square, overlap)
+            for other_id, (dot, user_square, other_square, overlap) in sums.items()
+        )
+    return similar
+
+
+def _similar_users_scipy(deviations: Dict[int, Dict[int, float]], user_ids: List[int]) -> Dict[int, Dict[int, tuple]]:
+    """같은 계산을 배치 희소 행렬 곱으로: X_b X^T, X_b² M^T, M_b (X²)^T, M_b M^T"""
+    users = list(deviations)
+    user_index = {user_id: i for i, user_id in enumerate(users)}
+    anime_index: Dict[int, int] = {}
+    rows, cols, values = [], [], []
+    for i, user_id in enumerate(users):
+        for anime_id, deviation in deviations[user_id].items():
+            rows.append(i)
+            cols.append(anime_index.setdefault(anime_id, len(anime_index)))
+            values.append(deviation)
+
+    shape = (len(users), len(anime_index))
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=shape)
+    mask = sparse.csr_matrix((np.ones(len(values)), (rows, cols)), shape=shape)
+    squares = matrix.multiply(matrix).tocsr()
+
+    batch = [user_index[user_id] for user_id in user_ids]
+    dots = (matrix[batch] @ matrix.T).tocsr()
+    user_squares = (squares[batch] @ mask.T).tocsr()
+    other_squares = (mask[batch] @ squares.T).tocsr()
+    overlaps = (mask[batch] @ mask.T).tocsr()
+
+    def row_dict(m, i):
+        start, end = m.indptr[i], m.indptr[i + 1]
+        return dict(zip(m.indices[start:end], m.data[start:end]))
+
+    similar = {}
+    for i, user_id in enumerate(user_ids):
+        dot, user_square, other_square = row_dict(dots, i), row_dict(user_squares, i), row_dict(other_squares, i)
+        similar[user_id] = _pearson_neighbors(
+            (users[j], float(dot.get(j, 0.0)), float(user_square.get(j, 0.0)),
+             float(other_square.get(j, 0.0)), int(overlap))
+            for j, overlap in row_dict(overlaps, i).items()
+            if j != batch[i]
+        )
+    return similar
+
+
+def _pearson_neighbors(candidates) -> Dict[int, tuple]:
+    """(다른 사용자, Σxy, Σx², Σy², n) → 상위 TOP_K_SIMILAR_USERS {다른 사용자: (축소한 유사도, n)}"""
+    scored = []
+    for other_id, dot, user_square, other_square, overlap in candidates:
+        if overlap < USER_SIMILARITY_MIN_OVERLAP or dot <= 0:
+            continue
+        similarity = dot / math.sqrt(user_square * other_square)
+        scored.append((similarity * overlap / (overlap + USER_SIMILARITY_SHRINKAGE), other_id, overlap))
+    return {
+        other_id: (similarity, overlap)
+        for similarity, other_id, overlap in heapq.nlargest(TOP_K_SIMILAR_USERS, scored)
+    }
+
+
+def _save_user_similarities(similar: Dict[int, Dict[int, tuple]], computed_at: str) -> int:
+    """
+    다시 계산한 사용자의 목록을 교체하고,
+    그 사용자와의 새 유사도를 다른 사용자의 목록에도 합쳐서 상위 TOP_K_SIMILAR_USERS 유지
+    """
+    changed = set(similar)
+    affected = {other_id for neighbors in similar.values() for other_id in neighbors} - changed
+    for _, row in fetch_by_ids(
+        "SELECT user_id FROM user_similarity WHERE similar_user_id IN ({placeholders})",
+        changed,
+        key='user_id'
+    ):
+        affected.add(row['user_id'])
+    affected -= changed
+
+    merged: Dict[int, Dict[int, tuple]] = {user_id: {} for user_id in affected}
+    for user_id, row in fetch_by_ids(
+        "SELECT user_id, similar_user_id, similarity, overlap FROM user_similarity WHERE user_id IN ({placeholders})",
+        affected,
+        key='user_id'
+    ):
+        if row['similar_user_id'] not in changed:
+            merged[user_id][row['similar_user_id']] = (row['similarity'], row['overlap'])
+    for user_id, neighbors in similar.items():
+        for other_id, pair in neighbors.items():
+            if other_id in merged:
+                merged[other_id][user_id] = pair
+    for user_id, neighbors in merged.items():
+        top = heapq.nlargest(TOP_K_SIMILAR_USERS, neighbors.items(), key=lambda e: e[1][0])
+        merged[user_id] = dict(top)
+    merged.update(similar)
+
+    rows = [
+        (user_id, other_id, round(similarity, 6), overlap)
+        for user_id, neighbors in merged.items()
+        for other_id, (similarity, overlap) in neighbors.items()
+    ]
+    with db.get_connection() as conn:
+        conn.executemany("DELETE FROM user_similarity WHERE user_id = ?", [(user_id,) for user_id in merged])
+        conn.executemany(
+            "INSERT INTO user_similarity (user_id, similar_user_id, similarity, overlap) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.executemany(
+            """
+            INSERT INTO user_similarity_state (user_id, computed_at) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET computed_at = excluded.computed_at
+            """,
+            [(user_id, computed_at) for user_id in similar]
+        )
+        conn.commit()
+    return len(rows)
+
+
+def _save_twins_loved(user_ids: List[int], computed_at: str):
+    """이웃이 TWINS_LOVED_MIN_RATING 이상 준 애니 중 본인이 평가/표시하지 않은 것 (Σ 유사도 순)"""
+    twins: Dict[int, List[tuple]] = {user_id: [] for user_id in user_ids}
+    for user_id, row in fetch_by_ids(
+        "SELECT user_id, similar_user_id, similarity FROM user_similarity WHERE user_id IN ({placeholders})",
+        user_ids,
+        key='user_id'
+    ):
+        twins[user_id].append((row['similarity'], row['similar_user_id']))
+
+    loved: Dict[int, List[int]] = {}
+    for _, row in fetch_by_ids(
+        """
+        SELECT user_id, anime_id, rating FROM user_ratings
+        WHERE user_id IN ({placeholders}) AND status = 'RATED'
+        """,
+        {twin_id for neighbors in twins.values() for _, twin_id in neighbors},
+        key='user_id'
+    ):
+        if row['rating'] is not None and row['rating'] >= TWINS_LOVED_MIN_RATING:
+            loved.setdefault(row['user_id'], []).append(row['anime_id'])
+
+    seen: Dict[int, set] = {user_id: set() for user_id in user_ids}
+    for user_id, row in fetch_by_ids(
+        "SELECT user_id, anime_id FROM user_ratings WHERE user_id IN ({placeholders})",
+        user_ids,
+        key='user_id'
+    ):
+        seen[user_id].add(row['anime_id'])
+
+    rows = []
+    for user_id in user_ids:
+        scores: Dict[int, list] = {}
+        for similarity, twin_id in sorted(twins[user_id], reverse=True):
+            for anime_id in loved.get(twin_id, ()):
+                if anime_id in seen[user_id]:
+                    continue
+                entry = scores.setdefault(anime_id, [0.0, []])
+                entry[0] += similarity
+                entry[1].append(twin_id)
+        for anime_id, (score, twin_ids) in heapq.nlargest(
+            TWINS_LOVED_CACHE_SIZE, scores.items(), key=lambda e: e[1][0]
+        ):
+            reason = json.dumps({'source': TWINS_LOVED_SOURCE, 'user_ids': twin_ids[:3]})
+            rows.append((user_id, anime_id, round(score, 6), reason, computed_at))
+
+    with db.get_connection() as conn:
+        conn.executemany(
+            "DELETE FROM recommendation_cache WHERE user_id = ? AND json_extract(reason, '$.source') = ?",
+            [(user_id, TWINS_LOVED_SOURCE) for user_id in user_ids]
+        )
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO recommendation_cache (user_id, anime_id, score, reason, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+        conn.commit()
+
+
+def _neighbors_python(item_users: Dict[int, Dict[int, float]]) -> Dict[int, List[tuple]]:
+    """애니 하나씩: 그 애니를 평가한 사용자의 다른 평가를 누적 (Σ n_user² 연산, 메모리는 애니 수 비례)"""
+    user_items: Dict[int, List[tuple]] = {}
+    for anime_id, users in item_users.items():
+        for user_id, deviation in users.items():
+            user_items.setdefault(user_id, []).append((anime_id, deviation))
+    norms = {
+        anime_id: math.sqrt(sum(d * d for d in users.values()))
+        for anime_id, users in item_users.items()
+    }
+
+    neighbors = {}
+    for anime_id, users in item_users.items():
+        if len(users) < ITEM_SIMILARITY_MIN_CO_RATERS:
+            continue
+        dots: Dict[int, float] = {}
+        counts: Dict[int, int] = {}
+        for user_id, deviation in users.items():
+            for other_id, other_deviation in user_items[user_id]:
+                dots[other_id] = dots.get(other_id, 0.0) + deviation * other_deviation
+                counts[other_id] = counts.get(other_id, 0) + 1
+        del dots[anime_id]
+
+        top = _top_neighbors(
+            (other_id, dot / (norms[anime_id] * norms[other_id]), counts[other_id])
+            for other_id, dot in dots.items()
+        )
+        if top:
+            neighbors[anime_id] = top
+    return neighbors
+
+
+def _neighbors_scipy(item_users: Dict[int, Dict[int, float]]) -> Dict[int, List[tuple]]:
+    """사용자 × 애니 희소 행렬로 X^T X (내적) / B^T B (함께 평가한 수)"""
+    anime_ids = list(item_users)
+    user_index: Dict[int, int] = {}
+    rows, cols, values = [], [], []
+    for col, anime_id in enumerate(anime_ids):
+        for user_id, deviation in item_users[anime_id].items():
+            rows.append(user_index.setdefault(user_id, len(user_index)))
+            cols.append(col)
+            values.append(deviation)
+
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(user_index), len(anime_ids)))
+    binary = (matrix != 0).astype(np.float32)
+    dots = (matrix.T @ matrix).tocsr()
+    counts = (binary.T @ binary).tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+
+    neighbors = {}
+    for i, anime_id in enumerate(anime_ids):
+        if len(item_users[anime_id]) < ITEM_SIMILARITY_MIN_CO_RATERS:
+            continue
+        start, end = dots.indptr[i], dots.indptr[i + 1]
+        row_counts = dict(zip(counts.indices[counts.indptr[i]:counts.indptr[i + 1]],
+                              counts.data[counts.indptr[i]:counts.indptr[i + 1]]))
+        top = _top_neighbors(
+            (anime_ids[j], float(dot) / (norms[i] * norms[j]), int(row_counts.get(j, 0)))
+            for j, dot in zip(dots.indices[start:end], dots.data[start:end])
+            if j != i
+        )
+        if top:
+            neighbors[anime_id] = top
+    return neighbors
+
+
+def _top_neighbors(candidates) -> List[tuple]:
+    """(축소한 유사도, 이웃 ID, 함께 평가한 수) 상위 ITEM_NEIGHBORS_K개 (양의 유사도만)"""
+    shrunk = (
+        (similarity * co_raters / (co_raters + ITEM_SIMILARITY_SHRINKAGE), other_id, co_raters)
+        for other_id, similarity, co_raters in candidates
+        if co_raters >= ITEM_SIMILARITY_MIN_CO_RATERS and similarity > 0
+    )
+    return heapq.nlargest(ITEM_NEIGHBORS_K, shrunk)
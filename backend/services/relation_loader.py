@@ -0,0 +1,134 @@
+"""
+Relation Loader
+애니 목록 한 페이지 분량의 연관 데이터를 IN (...) 쿼리 한 번으로 일괄 조회
+
+행마다 SELECT를 날리는 대신 페이지 전체 ID로 한 번 조회 → 페이지 크기와 무관한 쿼리 수
+(anime_service, series_service, search_service 등 목록을 반환하는 서비스에서 공유)
+"""
+from typing import Dict, Iterable, List, Tuple
+from database import db, dict_from_row
+
+# SQLite 바인딩 변수 제한(기본 999) 이하로 나눠서 조회
+_MAX_IN_PARAMS = 900
+
+
+def load_genres(anime_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """anime_id → 장르 이름 목록"""
+    genres = {}
+    for anime_id, row in fetch_by_ids(
+        """
+        SELECT ag.anime_id, g.name
+        FROM anime_genre ag
+        JOIN genre g ON ag.genre_id = g.id
+        WHERE ag.anime_id IN ({placeholders})
+        """,
+        anime_ids
+    ):
+        genres.setdefault(anime_id, []).append(row['name'])
+    return genres
+
+
+def load_tags(anime_ids: Iterable[int], limit_per_anime: int = 10) -> Dict[int, List[Dict]]:
+    """anime_id → 태그 목록 (rank 높은 순, 애니당 limit_per_anime개)"""
+    tags = {}
+    for anime_id, row in fetch_by_ids(
+        """
+        SELECT at.anime_id, t.id, t.name, t.description, t.category, at.rank, at.is_spoiler
+        FROM anime_tag at
+        JOIN tag t ON at.tag_id = t.id
+        WHERE at.anime_id IN ({placeholders})
+        ORDER BY at.anime_id, at.rank DESC
+        """,
+        anime_ids
+    ):
+        items = tags.setdefault(anime_id, [])
+        if len(items) < limit_per_anime:
+            tag = dict_from_row(row)
+            del tag['anime_id']
+            items.append(tag)
+    return tags
+
+
+def load_studios(anime_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+    """anime_id → 스튜디오 목록 (메인 스튜디오 우선)"""
+    studios = {}
+    for anime_id, row in fetch_by_ids(
+        """
+        SELECT ast.anime_id, s.id, s.name, s.is_animation_studio, ast.is_main
+        FROM anime_studio ast
+        JOIN studio s ON ast.studio_id = s.id
+        WHERE ast.anime_id IN ({placeholders})
+        ORDER BY ast.anime_id, ast.is_main DESC
+        """,
+        anime_ids
+    ):
+        studio = dict_from_row(row)
+        del studio['anime_id']
+        studios.setdefault(anime_id, []).append(studio)
+    return studios
+
+
+def load_site_rating_stats(anime_ids: Iterable[int]) -> Dict[int, Tuple[int, float]]:
+    """
+    anime_id → (우리 사이트 평가 수, 평균 평점) - 행마다 상관 서브쿼리 2개 대신 GROUP BY 한 번
+    (+status: ANALYZE 통계가 없을 때 status 인덱스를 고르지 않도록 anime_id 인덱스 사용 강제)
+    """
+    return {
+        anime_id: (row['site_rating_count'], row['site_average_rating'])
+        for anime_id, row in fetch_by_ids(
+            """
+            SELECT anime_id, COUNT(*) as site_rating_count, AVG(rating) as site_average_rating
+            FROM user_ratings
+            WHERE anime_id IN ({placeholders}) AND +status = 'RATED' AND rating IS NOT NULL
+            GROUP BY anime_id
+            """,
+            anime_ids
+        )
+    }
+
+
+def attach_anime_relations(
+    items: List[Dict],
+    genres: bool = True,
+    site_stats: bool = False,
+    tags: bool = False,
+    studios: bool = False
+) -> List[Dict]:
+    """
+    애니 dict 목록에 연관 데이터를 일괄로 채움 (각 dict의 'id' 기준)
+
+    - genres: 'genres'
+    - site_stats: 'site_rating_count', 'site_average_rating'
+    - tags / studios: 'tags', 'studios'
+    """
+    anime_ids = [item['id'] for item in items]
+    if not anime_ids:
+        return items
+
+    genre_map = load_genres(anime_ids) if genres else None
+    stats_map = load_site_rating_stats(anime_ids) if site_stats else None
+    tag_map = load_tags(anime_ids) if tags else None
+    studio_map = load_studios(anime_ids) if studios else None
+
+    for item in items:
+        anime_id = item['id']
+        if genre_map is not None:
+            item['genres'] = genre_map.get(anime_id, [])
+        if stats_map is not None:
+            item['site_rating_count'], item['site_average_rating'] = stats_map.get(anime_id, (0, None))
+        if tag_map is not None:
+            item['tags'] = tag_map.get(anime_id, [])
+        if studio_map is not None:
+            item['studios'] = studio_map.get(anime_id, [])
+
+    return items
+
+
+def fetch_by_ids(query: str, ids: Iterable[int], key: str = 'anime_id'):
+    """IN (...) 쿼리를 청크 단위로 실행하며 (row[key], row) yield"""
+    ids = list(dict.fromkeys(ids))
+    for start in range(0, len(ids), _MAX_IN_PARAMS):
+        chunk = ids[start:start + _MAX_IN_PARAMS]
+        placeholders = ','.join('?' * len(chunk))
+        for row in db.execute_query(query.format(placeholders=placeholders), tuple(chunk)):
+            yield row[key], row
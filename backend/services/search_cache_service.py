@@ -0,0 +1,183 @@
+"""
+Search Cache Service
+통합 검색 결과 캐시 (인기 검색어 몇백 개에 트래픽이 몰림)
+
+- 키: (카탈로그 버전, 정규화한 검색어, sort, limit) → LRU + TTL (사이트 평점 변화는 TTL로 반영)
+- 카탈로그 버전이 바뀌면 전체 비움 (제목/이름 수정, 크롤러)
+- 검색어별 횟수는 메모리에 모았다가 주기적으로 search_query_log에 저장,
+  시작 시 상위 검색어로 캐시를 미리 채움 (SEARCH_CACHE_PREWARM_COUNT)
+- search_query_log는 저장할 때마다 정리 (SEARCH_QUERY_LOG_RETENTION_DAYS 동안 검색되지 않은 검색어 삭제,
+  검색 횟수 상위 SEARCH_QUERY_LOG_MAX_ROWS개만 보관)
+"""
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict
+from database import db
+from services.catalog_service import get_catalog_version
+from services.search_service import (
+    SEARCH_SORTS, normalize_search_query, search_anime_summaries, search_character_summaries
+)
+from utils.cache import TTLCache
+from config import (
+    SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_PREWARM_COUNT, SEARCH_QUERY_LOG_FLUSH_SECONDS,
+    SEARCH_QUERY_LOG_MAX_ROWS, SEARCH_QUERY_LOG_RETENTION_DAYS
+)
+
+
+_results = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL_SECONDS)
+_cached_version = None
+
+# search_query_log에 아직 쓰지 않은 (검색어, sort, limit) → 횟수
+_pending_counts: Counter = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def unified_search(query: str, sort: str = "popularity_desc", limit: int = 20) -> Dict:
+    """애니 + 캐릭터 통합 검색 (캐시 우선)"""
+    global _cached_version
+
+    query_key = cache_query_key(query)
+    version = get_catalog_version()
+    if version != _cached_version:
+        _results.clear()
+        _cached_version = version
+
+    _record_query(query_key, sort, limit)
+
+    key = (version, query_key, sort, limit)
+    results = _results.get(key)
+    if results is not None:
+        return results
+
+    results, complete = _search(query, sort, limit)
+    if complete:
+        _results.set(key, results)
+    return results
+
+
+def cache_query_key(query: str) -> str:
+    """
+    캐시 키용 검색어 (공백 제거, 영문은 소문자)
+    검색 자체가 공백을 무시하고 영문 대소문자를 구분하지 않으므로 결과가 같은 검색어끼리 같은 키
+    """
+    compact = normalize_search_query(query)
+    return compact.lower() if compact.isascii() else compact
+
+
+def get_search_cache_stats() -> Dict:
+    stats = _results.stats()
+    stats['catalog_version'] = _cached_version
+    with _pending_lock:
+        stats['pending_query_log'] = len(_pending_counts)
+    return stats
+
+
+def prewarm_search_cache(count: int = SEARCH_CACHE_PREWARM_COUNT) -> int:
+    """search_query_log 상위 검색어로 캐시 미리 채우기 (채운 개수)"""
+    global _cached_version
+
+    if count <= 0:
+        return 0
+
+    rows = db.execute_query(
+        """
+        SELECT query, sort, result_limit
+        FROM search_query_log
+        ORDER BY search_count DESC
+        LIMIT ?
+        """,
+        (count,)
+    )
+    version = get_catalog_version()
+    if version != _cached_version:
+        _results.clear()
+        _cached_version = version  # 첫 unified_search가 미리 채운 항목을 비우지 않도록
+
+    warmed = 0
+    for row in rows:
+        results, complete = _search(row['query'], row['sort'], row['result_limit'])
+        if complete:
+            _results.set((version, row['query'], row['sort'], row['result_limit']), results)
+            warmed += 1
+    return warmed
+
+
+def flush_query_log():
+    """모아둔 검색어 횟수를 search_query_log에 저장"""
+    global _last_flush
+
+    with _pending_lock:
+        pending = list(_pending_counts.items())
+        _pending_counts.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+
+    db.execute_many(
+        """
+        INSERT INTO search_query_log (query, sort, result_limit, search_count, last_searched_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(query, sort, result_limit) DO UPDATE SET
+            search_count = search_count + excluded.search_count,
+            last_searched_at = CURRENT_TIMESTAMP
+        """,
+        [(query, sort, limit, count) for (query, sort, limit), count in pending]
+    )
+    prune_query_log()
+
+
+def prune_query_log() -> int:
+    """오래된 검색어 / 지원하지 않는 sort / 상위 SEARCH_QUERY_LOG_MAX_ROWS개 밖의 행 삭제 (삭제한 행 수)"""
+    placeholders = ','.join('?' * len(SEARCH_SORTS))
+    deleted = db.execute_update(
+        f"""
+        DELETE FROM search_query_log
+        WHERE last_searched_at < datetime('now', ?)
+           OR sort NOT IN ({placeholders})
+        """,
+        (f'-{SEARCH_QUERY_LOG_RETENTION_DAYS} days', *SEARCH_SORTS)
+    )
+    deleted += db.execute_update(
+        """
+        DELETE FROM search_query_log
+        WHERE rowid NOT IN (
+            SELECT rowid FROM search_query_log
+            ORDER BY search_count DESC
+            LIMIT ?
+        )
+        """,
+        (SEARCH_QUERY_LOG_MAX_ROWS,)
+    )
+    return deleted
+
+
+def _search(query: str, sort: str, limit: int):
+    """(결과, 두 검색이 모두 성공했는지) - 실패한 결과는 캐시하지 않음"""
+    results = {"anime": [], "characters": []}
+    complete = True
+
+    try:
+        results["anime"] = search_anime_summaries(query, sort, limit)
+    except sqlite3.OperationalError:
+        complete = False  # Table doesn't exist in local dev
+
+    try:
+        results["characters"] = search_character_summaries(query, sort, limit)
+    except sqlite3.OperationalError:
+        complete = False  # Table doesn't exist in local dev
+
+    return results, complete
+
+
+def _record_query(query_key: str, sort: str, limit: int):
+    with _pending_lock:
+        _pending_counts[(query_key, sort, limit)] += 1
+        due = time.monotonic() - _last_flush >= SEARCH_QUERY_LOG_FLUSH_SECONDS
+    if due:
+        try:
+            flush_query_log()
+        except sqlite3.Error as e:
+            print(f"[SearchCache] Failed to flush query log: {e}")
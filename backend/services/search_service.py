@@ -0,0 +1,466 @@
+"""
+Search Service
+FTS5 trigram 인덱스 기반 애니메이션/캐릭터 검색
+
+- 공백을 제거한 제목/이름을 trigram으로 색인 (scripts/ensure_schema.ensure_search_index, 트리거로 동기화)
+- 3글자 이상: MATCH + bm25 관련도에 인기도(popularity / favourites)를 곱해 재정렬
+  (매칭이 SEARCH_BM25_MAX_MATCHES개를 넘는 흔한 검색어는 인기순)
+- 1~2글자: trigram으로는 찾을 수 없으므로 원본 테이블 LIKE (인기순)
+- 초성 검색어("ㄱㅁㅇㅋㄴ")와 1~2글자 한글: korean_search_key 인덱스로 접두사 → 부분 일치 순
+  (한국어 제목/이름의 초성·공백 제거 형태, refresh_korean_search_keys로 갱신)
+- 일본어 원제/원어 이름은 가나 정규화 키(*_kana)와 한글 읽기(*_reading)도 색인
+  → 히라가나/반각 검색어, "에렌" 같은 한국어 발음 검색어도 매칭 (refresh_native_readings로 갱신)
+- 3글자 이상인데 결과가 FUZZY_FALLBACK_MIN_RESULTS개보다 적으면 오타 허용 검색으로 보충
+  (services.fuzzy_search_service, "shingeki no kyojn" → 진격의 거인)
+"""
+import math
+from typing import Dict, List, Optional
+from database import db, dict_from_row, dicts_from_rows
+from services.relation_loader import fetch_by_ids, load_site_rating_stats
+from services.fuzzy_search_service import fuzzy_search_ids
+from services.character_primary_anime_service import primary_anime_id_sql, ensure_character_primary_anime
+from utils.hangul import to_chosung, is_chosung_query, has_hangul
+from utils.kana import fold_kana, fold_reading, native_reading
+from config import (
+    SEARCH_MAX_CANDIDATES, SEARCH_POPULARITY_WEIGHT, SEARCH_BM25_MAX_MATCHES, FUZZY_FALLBACK_MIN_RESULTS
+)
+
+
+# 인덱스별 설정 (컬럼 순서는 ensure_schema.SEARCH_INDEXES와 동일)
+# 한국어 제목/이름 가중치 2배, 발음 변환인 한글 읽기는 0.5배
+_ANIME_INDEX = {
+    'item_type': 'anime',
+    'fts': 'anime_fts',
+    'table': 'anime',
+    'popularity': 'popularity',
+    'columns': (
+        'title_romaji', 'title_english', 'title_native', 'title_korean',
+        'title_native_kana', 'title_native_reading',
+    ),
+    'weights': (1.0, 1.0, 1.0, 2.0, 1.0, 0.5),
+    'native': 'title_native',
+    'kana': 'title_native_kana',
+    'reading': 'title_native_reading',
+}
+_CHARACTER_INDEX = {
+    'item_type': 'character',
+    'fts': 'character_fts',
+    'table': 'character',
+    'popularity': 'favourites',
+    'columns': ('name_full', 'name_native', 'name_korean', 'name_native_kana', 'name_native_reading'),
+    'weights': (1.0, 1.0, 2.0, 1.0, 0.5),
+    'native': 'name_native',
+    'kana': 'name_native_kana',
+    'reading': 'name_native_reading',
+}
+_INDEXES = {'anime': _ANIME_INDEX, 'character': _CHARACTER_INDEX}
+
+# korean_search_key에 넣는 한국어 컬럼 (원어 이름의 한글 읽기 포함)
+KOREAN_KEY_FIELDS = {
+    'anime': ('anime', ('title_korean', 'title_native_reading')),
+    'character': ('character', ('name_korean', 'name_native_reading')),
+}
+
+_MAX_IN_PARAMS = 900
+
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH로 찾지 못함
+_MIN_MATCH_LENGTH = 3
+
+# 통합 검색 결과에 필요한 원본 컬럼 (후보 조회와 같은 쿼리에서 가져옴)
+_ANIME_SUMMARY_COLUMNS = """,
+    t.title_korean, t.title_romaji, t.title_english, t.title_native,
+    COALESCE('/' || t.cover_image_local, t.cover_image_url) as cover_image,
+    t.format, t.episodes, t.status, t.season_year, t.average_score
+"""
+_CHARACTER_SUMMARY_COLUMNS = """,
+    t.name_korean, t.name_full, t.name_native,
+    COALESCE('/' || t.image_local, t.image_url) as image_large
+"""
+
+# 검색 결과 캐릭터의 대표 애니
+_CHARACTER_PRIMARY_ANIME_ID = primary_anime_id_sql('c.id')
+
+# 관련도 순 외의 정렬 (SQL ORDER BY와 같은 NULL 처리: DESC는 뒤로, ASC는 앞으로)
+_SORT_KEYS = ('rating_desc', 'rating_asc', 'title_asc')
+
+# 통합 검색에서 허용하는 sort 값
+SEARCH_SORTS = ('popularity_desc',) + _SORT_KEYS
+
+
+def normalize_search_query(query: str) -> str:
+    """색인과 같은 형태로 정규화 (공백 제거)"""
+    return ''.join(query.split())
+
+
+def search_anime_ids(query: str, max_results: Optional[int] = SEARCH_MAX_CANDIDATES) -> List[int]:
+    """검색어에 맞는 애니 ID (관련도 × 인기도 순, 띄어쓰기 무시)"""
+    return [row['id'] for row in _search_rows(_ANIME_INDEX, query, max_results)]
+
+
+def search_character_ids(query: str, max_results: Optional[int] = SEARCH_MAX_CANDIDATES) -> List[int]:
+    """검색어에 맞는 캐릭터 ID (관련도 × 즐겨찾기 수 순, 띄어쓰기 무시)"""
+    return [row['id'] for row in _search_rows(_CHARACTER_INDEX, query, max_results)]
+
+
+def search_anime_summaries(query: str, sort: str = "popularity_desc", limit: int = 20) -> List[Dict]:
+    """통합 검색용 애니 결과 (사이트 평점 포함)"""
+    # 관련도 순이면 최종 limit개만, 다른 정렬이면 후보 전체를 조회 후 정렬
+    rows = _search_rows(_ANIME_INDEX, query, _result_count(sort, limit), _ANIME_SUMMARY_COLUMNS)
+
+    stats = load_site_rating_stats([row['id'] for row in rows])
+    results = []
+    for row in rows:
+        rating_count, site_average = stats.get(row['id'], (0, None))
+        results.append({
+            "id": row['id'],
+            "title_korean": row['title_korean'],
+            "title_romaji": row['title_romaji'],
+            "title_english": row['title_english'],
+            "title_native": row['title_native'],
+            "cover_image_url": row['cover_image'],  # Match field name expected by frontend
+            "format": row['format'],
+            "episodes": row['episodes'],
+            "status": row['status'],
+            "season_year": row['season_year'],
+            "rating": site_average if site_average is not None else row['average_score'],
+            "rating_count": rating_count,
+            "popularity": row['popularity']
+        })
+
+    if sort in _SORT_KEYS:
+        results = _sort_results(results, sort, ('title_korean', 'title_romaji', 'title_english'))
+    return results[:limit]
+
+
+def search_character_summaries(query: str, sort: str = "popularity_desc", limit: int = 20) -> List[Dict]:
+    """통합 검색용 캐릭터 결과 (사이트 평점, 대표 출연 애니 포함)"""
+    rows = _search_rows(_CHARACTER_INDEX, query, _result_count(sort, limit), _CHARACTER_SUMMARY_COLUMNS)
+
+    extras = _load_character_extras([row['id'] for row in rows])
+    results = []
+    for row in rows:
+        extra = extras.get(row['id'], {})
+        results.append({
+            "id": row['id'],
+            "name_korean": row['name_korean'],
+            "name_full": row['name_full'],
+            "name_native": row['name_native'],
+            "image_large": row['image_large'],
+            "favourites": row['popularity'],
+            "rating": extra.get('site_avg_rating'),
+            "rating_count": extra.get('site_rating_count', 0),
+            "anime_id": extra.get('anime_id'),
+            "anime_title_korean": extra.get('anime_title_korean'),
+            "anime_title_romaji": extra.get('anime_title_romaji')
+        })
+
+    if sort in _SORT_KEYS:
+        results = _sort_results(results, sort, ('name_korean', 'name_full'))
+    return results[:limit]
+
+
+def _search_rows(index: Dict, query: str, max_results: Optional[int], columns: str = '') -> List[Dict]:
+    """
+    검색어에 맞는 행 (id, popularity + columns), 관련도 × 인기도 순으로 최대 max_results개
+    columns는 원본 테이블 별칭 t 기준 추가 컬럼 (예: ", t.title_korean")
+    결과가 적으면 오타 허용 검색 결과를 뒤에 붙임 (유사도 순)
+    """
+    query = normalize_search_query(query)
+    if not query:
+        return []
+    rows = _match_rows(index, query, max_results, columns)
+
+    wanted = FUZZY_FALLBACK_MIN_RESULTS if max_results is None else min(FUZZY_FALLBACK_MIN_RESULTS, max_results)
+    if len(rows) >= wanted or len(query) < _MIN_MATCH_LENGTH or is_chosung_query(query):
+        return rows
+
+    found = {row['id'] for row in rows}
+    limit = SEARCH_MAX_CANDIDATES if max_results is None else max_results - len(rows)
+    fuzzy_ids = fuzzy_search_ids(index['item_type'], query, limit, exclude_ids=found)
+    if not fuzzy_ids:
+        return rows
+
+    fuzzy_rows = db.execute_query(
+        f"""
+        SELECT t.id, t.{index['popularity']} as popularity {columns}
+        FROM {index['table']} t
+        WHERE t.id IN ({','.join('?' * len(fuzzy_ids))})
+        """,
+        tuple(fuzzy_ids)
+    )
+    by_id = {row['id']: dict_from_row(row) for row in fuzzy_rows}
+    return rows + [by_id[item_id] for item_id in fuzzy_ids if item_id in by_id]
+
+
+def _match_rows(index: Dict, query: str, max_results: Optional[int], columns: str) -> List[Dict]:
+    """정확/FTS 검색 (query는 정규화된 검색어)"""
+    limit = max_results if max_results is not None else -1
+
+    # 초성 / 짧은 한글: 한국어 키 인덱스 (한글은 한국어 컬럼에만 있으므로 원본 스캔 불필요)
+    if is_chosung_query(query):
+        return _search_korean_rows(index, 'chosung', query, limit, columns)
+    if len(query) < _MIN_MATCH_LENGTH and has_hangul(query):
+        return _search_korean_rows(index, 'compact', query.lower(), limit, columns)
+
+    if len(query) < _MIN_MATCH_LENGTH:
+        # 원본 테이블을 인기순 인덱스로 훑으며 LIKE (limit개 찾으면 조기 종료, 가나 컬럼은 정규화한 검색어로)
+        pattern = f"%{query}%"
+        conditions = ' OR '.join(f"t.{column} LIKE ?" for column in index['columns'])
+        params = tuple(
+            f"%{fold_kana(query)}%" if column == index['kana'] else pattern
+            for column in index['columns']
+        )
+        rows = db.execute_query(
+            f"""
+            SELECT t.id, t.{index['popularity']} as popularity {columns}
+            FROM {index['table']} t
+            WHERE {conditions}
+            ORDER BY t.{index['popularity']} DESC
+            LIMIT ?
+            """,
+            params + (limit,)
+        )
+        return dicts_from_rows(rows)
+
+    match = _match_expression(index, query)
+    weights = ', '.join(str(w) for w in index['weights'])
+    with db.get_connection() as conn:
+        match_count = conn.execute(
+            f"SELECT COUNT(*) FROM {index['fts']} WHERE {index['fts']} MATCH ?", (match,)
+        ).fetchone()[0]
+
+        # 매칭이 너무 많으면 (흔한 3글자) bm25 계산 비용만 크고 관련도 차이는 거의 없음 → 인기순
+        if match_count > SEARCH_BM25_MAX_MATCHES:
+            rows = conn.execute(
+                f"""
+                SELECT f.rowid as id, t.{index['popularity']} as popularity {columns}
+                FROM {index['fts']} f
+                JOIN {index['table']} t ON t.id = f.rowid
+                WHERE {index['fts']} MATCH ?
+                ORDER BY t.{index['popularity']} DESC
+                LIMIT ?
+                """,
+                (match, limit)
+            ).fetchall()
+            return dicts_from_rows(rows)
+
+        rows = conn.execute(
+            f"""
+            SELECT f.rowid as id, bm25({index['fts']}, {weights}) as score,
+                   t.{index['popularity']} as popularity {columns}
+            FROM {index['fts']} f
+            JOIN {index['table']} t ON t.id = f.rowid
+            WHERE {index['fts']} MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, max(limit, SEARCH_MAX_CANDIDATES) if limit >= 0 else -1)
+        ).fetchall()
+
+    # bm25는 작을수록 관련도가 높음 → 부호를 바꿔 인기도 가중치를 곱함
+    ranked = sorted(
+        dicts_from_rows(rows),
+        key=lambda r: (
+            -r['score'] * (1 + SEARCH_POPULARITY_WEIGHT * math.log10(1 + max(r['popularity'] or 0, 0))),
+            r['popularity'] or 0
+        ),
+        reverse=True
+    )
+    return ranked if max_results is None else ranked[:max_results]
+
+
+def _search_korean_rows(index: Dict, key_column: str, key: str, limit: int, columns: str) -> List[Dict]:
+    """korean_search_key 접두사 일치(인덱스 범위 조회) 먼저, 모자라면 부분 일치 (각각 인기순)"""
+    sql = f"""
+        SELECT t.id, t.{index['popularity']} as popularity {columns}
+        FROM {index['table']} t
+        WHERE t.id IN (
+            SELECT item_id FROM korean_search_key
+            WHERE item_type = ? AND {{condition}}
+        )
+        ORDER BY t.{index['popularity']} DESC
+        LIMIT ?
+    """
+    with db.get_connection() as conn:
+        rows = dicts_from_rows(conn.execute(
+            sql.format(condition=f"{key_column} >= ? AND {key_column} < ?"),
+            (index['item_type'], key, key + '\U0010ffff', limit)
+        ).fetchall())
+
+        if limit < 0 or len(rows) < limit:
+            found = {row['id'] for row in rows}
+            infix = conn.execute(
+                sql.format(condition=f"{key_column} LIKE ?"),
+                (index['item_type'], f"%{key}%", limit if limit < 0 else limit + len(found))
+            ).fetchall()
+            rows += [row for row in dicts_from_rows(infix) if row['id'] not in found]
+
+    return rows if limit < 0 else rows[:limit]
+
+
+def refresh_korean_search_keys(item_type: str, item_ids: Optional[List[int]] = None, conn=None) -> int:
+    """
+    korean_search_key 갱신 (초성 / 공백 제거 키, 바뀐 행만 쓰기)
+
+    Args:
+        item_type: 'anime' 또는 'character'
+        item_ids: 갱신할 ID (없으면 전체 재동기화)
+        conn: 스크립트의 sqlite3 연결 (넘기면 그 트랜잭션 안에서 실행)
+
+    Returns:
+        추가/변경/삭제된 키 수
+    """
+    if conn is None:
+        with db.get_connection() as conn:
+            return refresh_korean_search_keys(item_type, item_ids, conn)
+
+    table, fields = KOREAN_KEY_FIELDS[item_type]
+    changed = 0
+    for id_filter, params in _id_chunks(item_ids):
+        desired = {}
+        for row in conn.execute(
+            f"SELECT id, {', '.join(fields)} FROM {table}" + (f" WHERE id{id_filter}" if params else ""),
+            params
+        ):
+            for field, value in zip(fields, row[1:]):
+                compact = ''.join((value or '').split()).lower()
+                if compact:
+                    desired[(row[0], field)] = (compact, to_chosung(compact))
+
+        existing = {
+            (row[0], row[1]): (row[2], row[3])
+            for row in conn.execute(
+                "SELECT item_id, field, compact, chosung FROM korean_search_key WHERE item_type = ?"
+                + (f" AND item_id{id_filter}" if params else ""),
+                (item_type,) + params
+            )
+        }
+
+        stale = [(item_type, item_id, field) for (item_id, field) in existing if (item_id, field) not in desired]
+        upserts = [
+            (item_type, item_id, field, compact, chosung)
+            for (item_id, field), (compact, chosung) in desired.items()
+            if existing.get((item_id, field)) != (compact, chosung)
+        ]
+        if stale:
+            conn.executemany(
+                "DELETE FROM korean_search_key WHERE item_type = ? AND item_id = ? AND field = ?", stale
+            )
+        if upserts:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO korean_search_key (item_type, item_id, field, compact, chosung)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                upserts
+            )
+        changed += len(stale) + len(upserts)
+
+    return changed
+
+
+def refresh_native_readings(item_type: str, item_ids: Optional[List[int]] = None, conn=None) -> int:
+    """
+    원어 제목/이름의 가나 정규화 키와 한글 읽기 컬럼 갱신 (바뀐 행만 쓰기, FTS는 트리거로 동기화)
+    korean_search_key가 한글 읽기를 읽으므로 refresh_korean_search_keys보다 먼저 호출
+
+    Returns:
+        갱신된 행 수
+    """
+    if conn is None:
+        with db.get_connection() as conn:
+            return refresh_native_readings(item_type, item_ids, conn)
+
+    index = _INDEXES[item_type]
+    changed = 0
+    for id_filter, params in _id_chunks(item_ids):
+        updates = []
+        for row in conn.execute(
+            f"SELECT id, {index['native']}, {index['kana']}, {index['reading']} FROM {index['table']}"
+            + (f" WHERE id{id_filter}" if params else ""),
+            params
+        ):
+            native = row[1] or ''
+            computed = (fold_kana(native) or None, native_reading(native) or None)
+            if (row[2], row[3]) != computed:
+                updates.append(computed + (row[0],))
+        if updates:
+            conn.executemany(
+                f"UPDATE {index['table']} SET {index['kana']} = ?, {index['reading']} = ? WHERE id = ?",
+                updates
+            )
+        changed += len(updates)
+
+    return changed
+
+
+def _id_chunks(item_ids: Optional[List[int]]):
+    """(" IN (?, ...)", params) 묶음 (item_ids가 없으면 전체 대상 한 번)"""
+    if item_ids is None:
+        return [("", ())]
+    ids = list(dict.fromkeys(int(i) for i in item_ids))
+    return [
+        (f" IN ({','.join('?' * len(chunk))})", tuple(chunk))
+        for chunk in (ids[i:i + _MAX_IN_PARAMS] for i in range(0, len(ids), _MAX_IN_PARAMS))
+    ]
+
+
+def _result_count(sort: str, limit: int) -> int:
+    return SEARCH_MAX_CANDIDATES if sort in _SORT_KEYS else limit
+
+
+def _load_character_extras(character_ids: List[int]) -> Dict[int, Dict]:
+    """character_id → 사이트 평가 수/평균, 대표 출연 애니 (character_primary_anime)"""
+    ensure_character_primary_anime()
+    return {
+        character_id: dict_from_row(row)
+        for character_id, row in fetch_by_ids(
+            f"""
+            SELECT
+                c.id,
+                (SELECT AVG(cr.rating) FROM character_ratings cr
+                 WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_avg_rating,
+                (SELECT COUNT(*) FROM character_ratings cr
+                 WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_rating_count,
+                pa.id as anime_id,
+                pa.title_korean as anime_title_korean,
+                pa.title_romaji as anime_title_romaji
+            FROM character c
+            LEFT JOIN anime pa ON pa.id = {_CHARACTER_PRIMARY_ANIME_ID}
+            WHERE c.id IN ({{placeholders}})
+            """,
+            character_ids,
+            key='id'
+        )
+    }
+
+
+def _phrase(query: str) -> str:
+    """FTS5 구문 검색 문자열 (따옴표 이스케이프 → 연산자로 해석되지 않음)"""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _match_expression(index: Dict, query: str) -> str:
+    """
+    원래 검색어 + 정규화한 검색어 (가나 키 컬럼 / 한글 읽기 컬럼 한정)
+    예: "たんじろう" → ... OR name_native_kana : "タンジロ"
+    """
+    parts = [_phrase(query)]
+    kana = fold_kana(query)
+    if kana != query.lower() and len(kana) >= _MIN_MATCH_LENGTH:
+        parts.append(f"{index['kana']} : {_phrase(kana)}")
+    if has_hangul(query):
+        reading = fold_reading(query)
+        if reading != query and len(reading) >= _MIN_MATCH_LENGTH:
+            parts.append(f"{index['reading']} : {_phrase(reading)}")
+    return ' OR '.join(parts)
+
+
+def _sort_results(results: List[Dict], sort: str, title_fields: tuple) -> List[Dict]:
+    if sort == 'title_asc':
+        def title(r):
+            return next((r[f] for f in title_fields if r[f] is not None), None)
+        return sorted(results, key=lambda r: (title(r) is not None, title(r) or ''))
+
+    key = lambda r: (r['rating'] is not None, r['rating'] or 0)
+    return sorted(results, key=key, reverse=(sort == 'rating_desc'))
@@ -0,0 +1,177 @@
+"""
+Season Chart Service
+시즌별 애니 차트 (GET /api/anime/seasons/{year}/{season}) 사전 계산
+
+- 시즌 애니 전체(인기순) + 장르 + 우리 사이트 평가 통계를 JSON으로 만들어
+  gzip 압축 blob으로 season_chart 테이블에 저장 → 응답은 blob 그대로 (Content-Encoding: gzip)
+- 다시 만드는 조건 (SEASON_CHART_CHECK_SECONDS마다 확인)
+  · 카탈로그 버전이 바뀌었고 그 시즌 애니 데이터(행 + 장르) 해시가 달라졌을 때
+  · 시즌 애니의 사이트 평가 수가 SEASON_CHART_MIN_RATING_CHANGE개 이상이면서
+    SEASON_CHART_RATING_CHANGE_RATIO 이상 바뀌었을 때
+  · SEASON_CHART_MAX_AGE_HOURS가 지났을 때 (재평가로 평균만 바뀐 경우)
+- ETag = 내용 해시 → CDN / 브라우저는 If-None-Match로 304
+"""
+import hashlib
+import json
+import threading
+import time
+import zlib
+from typing import Optional
+from database import db, dicts_from_rows
+from models.anime import AnimeResponse
+from services.anime_service import _ANIME_LIST_COLUMNS
+from services.catalog_service import get_catalog_version
+from services.relation_loader import attach_anime_relations
+from services.series_service import get_franchise_graph
+from utils.cache import TTLCache
+from config import (
+    SEASON_CHART_CACHE_SIZE, SEASON_CHART_CHECK_SECONDS, SEASON_CHART_MIN_RATING_CHANGE,
+    SEASON_CHART_RATING_CHANGE_RATIO, SEASON_CHART_MAX_AGE_HOURS
+)
+
+
+SEASONS = ('WINTER', 'SPRING', 'SUMMER', 'FALL')
+
+# (year, season) → SeasonChart (만료되면 season_chart 행을 다시 읽고 갱신 여부 확인)
+_charts = TTLCache(maxsize=SEASON_CHART_CACHE_SIZE, ttl=SEASON_CHART_CHECK_SECONDS)
+_build_lock = threading.Lock()
+
+
+class SeasonChart:
+    """압축된 차트 응답 (payload: gzip JSON)"""
+
+    def __init__(self, row):
+        self.etag = row['etag']
+        self.payload = row['payload']
+        self.catalog_version = row['catalog_version']
+        self.data_hash = row['data_hash']
+        self.rating_count = row['rating_count']
+        self.built_at = row['built_at']
+
+    def json_bytes(self) -> bytes:
+        return zlib.decompress(self.payload, 31)
+
+
+def get_season_chart(year: int, season: str) -> SeasonChart:
+    """캐시된 차트 (없거나 의미 있게 바뀌었으면 다시 만듦)"""
+    key = (year, season)
+    chart = _charts.get(key)
+    if chart is not None:
+        return chart
+
+    with _build_lock:
+        chart = _charts.get(key)
+        if chart is not None:
+            return chart
+
+        row = db.execute_query(
+            "SELECT * FROM season_chart WHERE season_year = ? AND season = ?", (year, season), fetch_one=True
+        )
+        chart = SeasonChart(row) if row else None
+        if chart is None or _needs_rebuild(chart, year, season):
+            chart = _build_season_chart(year, season, chart)
+        _charts.set(key, chart)
+        return chart
+
+
+def _needs_rebuild(chart: SeasonChart, year: int, season: str) -> bool:
+    if chart.built_at < time.time() - SEASON_CHART_MAX_AGE_HOURS * 3600:
+        return True
+
+    rating_count = _season_rating_count(year, season)
+    change = abs(rating_count - chart.rating_count)
+    if change >= SEASON_CHART_MIN_RATING_CHANGE and change >= chart.rating_count * SEASON_CHART_RATING_CHANGE_RATIO:
+        return True
+
+    version = get_catalog_version()
+    if chart.catalog_version == version:
+        return False
+    # 카탈로그가 바뀌어도 이 시즌 데이터가 그대로면 버전만 기록
+    if _data_hash(_load_season_anime(year, season)) != chart.data_hash:
+        return True
+    db.execute_update(
+        "UPDATE season_chart SET catalog_version = ? WHERE season_year = ? AND season = ?",
+        (version, year, season)
+    )
+    chart.catalog_version = version
+    return False
+
+
+def _build_season_chart(year: int, season: str, previous: Optional[SeasonChart]) -> SeasonChart:
+    version = get_catalog_version()
+    get_franchise_graph()  # season_number가 현재 카탈로그 기준인지 확인
+
+    anime = _load_season_anime(year, season)
+    data_hash = _data_hash(anime)
+    items = []
+    for anime_dict in attach_anime_relations([dict(a) for a in anime], genres=False, site_stats=True):
+        anime_dict['airing_status'] = anime_dict.get('status')
+        items.append(AnimeResponse(**anime_dict).model_dump(mode='json'))
+
+    body = json.dumps(
+        {'year': year, 'season': season, 'total': len(items), 'items': items},
+        ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    if previous is not None and previous.etag == etag:
+        payload = previous.payload
+    else:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+        payload = compressor.compress(body) + compressor.flush()
+
+    rating_count = sum(item['site_rating_count'] or 0 for item in items)
+    db.execute_update(
+        """
+        INSERT INTO season_chart (season_year, season, catalog_version, data_hash, rating_count, etag, payload, built_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(season_year, season) DO UPDATE SET
+            catalog_version = excluded.catalog_version,
+            data_hash = excluded.data_hash,
+            rating_count = excluded.rating_count,
+            etag = excluded.etag,
+            payload = excluded.payload,
+            built_at = excluded.built_at
+        """,
+        (year, season, version, data_hash, rating_count, etag, payload, int(time.time()))
+    )
+    return SeasonChart({
+        'etag': etag,
+        'payload': payload,
+        'catalog_version': version,
+        'data_hash': data_hash,
+        'rating_count': rating_count,
+        'built_at': int(time.time()),
+    })
+
+
+def _load_season_anime(year: int, season: str):
+    """시즌 애니 행 (인기순) + 장르"""
+    rows = db.execute_query(
+        f"""
+        SELECT {_ANIME_LIST_COLUMNS}
+        FROM anime a
+        WHERE a.season_year = ? AND a.season = ?
+        ORDER BY a.popularity DESC, a.id
+        """,
+        (year, season)
+    )
+    return attach_anime_relations(dicts_from_rows(rows), genres=True)
+
+
+def _data_hash(anime) -> str:
+    return hashlib.sha1(json.dumps(anime, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _season_rating_count(year: int, season: str) -> int:
+    """시즌 애니의 사이트 평가 수 (+status: load_site_rating_stats와 같이 anime_id 인덱스 사용)"""
+    return db.execute_query(
+        """
+        SELECT COUNT(*) as cnt
+        FROM anime a
+        JOIN user_ratings ur ON ur.anime_id = a.id
+        WHERE a.season_year = ? AND a.season = ?
+          AND +ur.status = 'RATED' AND ur.rating IS NOT NULL
+        """,
+        (year, season),
+        fetch_one=True
+    )['cnt']
@@ -1,45 +1,178 @@
 """
 Series Service
 시리즈 관계 조회 및 처리
+
+anime_relation 전체를 메모리 그래프로 한 번 올려서 사용 (카탈로그 버전이 바뀌면 재구성)
+- 후속작 조회: 그래프 순회 (방문 체크로 순환 관계에도 안전)
+- 프랜차이즈 ID / 프랜차이즈 내 순서 / 시즌 번호는 anime 컬럼에 사전 계산해서 저장
+  → 목록의 season_number, 프랜차이즈 전체 조회가 단순 컬럼 조회가 됨
 """
-from typing import List, Dict
-from database import db, dict_from_row
+import threading
+import time
+from typing import List, Dict, Optional
+from database import db, dict_from_row, dicts_from_rows
+from services.catalog_service import get_catalog_version
+
+
+# 같은 프랜차이즈로 묶는 관계 (CHARACTER/OTHER는 크로스오버까지 묶여서 제외)
+FRANCHISE_RELATION_TYPES = (
+    'PREQUEL', 'SEQUEL', 'PARENT', 'SIDE_STORY', 'SPIN_OFF',
+    'ALTERNATIVE', 'SUMMARY', 'COMPILATION', 'CONTAINS',
+)
+
+# 시즌 번호를 세는 포맷 (극장판/OVA/스페셜은 "N기"로 세지 않음)
+SERIES_FORMATS = ('TV', 'TV_SHORT', 'ONA')
+
+FRANCHISE_INDEX_VERSION_KEY = 'franchise_index_version'
+
+_SEASON_ORDER = {'WINTER': 1, 'SPRING': 2, 'SUMMER': 3, 'FALL': 4}
+
+_SERIES_COLUMNS = """
+    a.id,
+    a.title_romaji,
+    a.title_english,
+    a.title_korean,
+    a.title_korean_official,
+    COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url
+"""
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+class FranchiseGraph:
+    """anime_relation 인접 리스트 + 사전 계산 결과"""
+
+    def __init__(self, version: str, anime_rows: List, relation_rows: List):
+        self.version = version
+        self.ids = [row['id'] for row in anime_rows]
+        self.stored = {
+            row['id']: (row['franchise_id'], row['franchise_order'], row['season_number'])
+            for row in anime_rows
+        }
+        formats = {row['id']: row['format'] for row in anime_rows}
+        chrono = {row['id']: _chronological_key(row) for row in anime_rows}
+
+        # 후속작 방향 인접 리스트 (SEQUEL, 반대편의 PREQUEL 모두 반영)
+        self.sequels: Dict[int, List[int]] = {}
+        self.prequels: Dict[int, List[int]] = {}
+        parent = {anime_id: anime_id for anime_id in self.ids}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for row in relation_rows:
+            a, b, relation_type = row['anime_id'], row['related_anime_id'], row['relation_type']
+            if a == b or a not in parent or b not in parent:
+                continue
+            if relation_type == 'SEQUEL':
+                _add_edge(self.sequels, self.prequels, a, b)
+            elif relation_type == 'PREQUEL':
+                _add_edge(self.sequels, self.prequels, b, a)
+            if relation_type in FRANCHISE_RELATION_TYPES:
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b:
+                    # 작은 ID(대체로 원작 1기)를 대표로
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        for edges in (self.sequels, self.prequels):
+            for anime_id in edges:
+                edges[anime_id].sort(key=chrono.__getitem__)
+
+        # 프랜차이즈 → 멤버 (방영 순)
+        self.franchise_of = {anime_id: find(anime_id) for anime_id in self.ids}
+        self.members: Dict[int, List[int]] = {}
+        for anime_id in sorted(self.ids, key=chrono.__getitem__):
+            self.members.setdefault(self.franchise_of[anime_id], []).append(anime_id)
+        self.franchise_order = {
+            anime_id: order
+            for member_ids in self.members.values()
+            for order, anime_id in enumerate(member_ids, start=1)
+        }
+
+        self.season_number = self._compute_season_numbers(formats)
+
+    def _compute_season_numbers(self, formats: Dict[int, str]) -> Dict[int, int]:
+        """
+        시즌 번호 = 가장 긴 전작 체인에 있는 TV 시리즈 수 (자기 자신 포함)
+        반복 DFS, 현재 경로에 있는 노드는 건너뛰어 순환 관계에서도 종료
+        """
+        depth = {}
+        for start in self.ids:
+            if start in depth:
+                continue
+            stack = [(start, iter(self.prequels.get(start, ())))]
+            on_path = {start}
+            while stack:
+                node, prequels = stack[-1]
+                for prev in prequels:
+                    if prev not in depth and prev not in on_path:
+                        stack.append((prev, iter(self.prequels.get(prev, ()))))
+                        on_path.add(prev)
+                        break
+                else:
+                    stack.pop()
+                    on_path.discard(node)
+                    weight = 1 if formats.get(node) in SERIES_FORMATS else 0
+                    depth[node] = weight + max(
+                        (depth[p] for p in self.prequels.get(node, ()) if p in depth), default=0
+                    )
+
+        return {
+            anime_id: max(depth[anime_id], 1) if formats.get(anime_id) in SERIES_FORMATS else 1
+            for anime_id in self.ids
+        }
+
+    def sequel_chain(self, anime_id: int) -> List[int]:
+        """anime_id의 모든 후속작 (깊이 우선, 방영 순, 중복/순환 제외)"""
+        visited = {anime_id}
+        chain = []
+        stack = list(reversed(self.sequels.get(anime_id, [])))
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+            chain.append(current)
+            stack.extend(reversed(self.sequels.get(current, [])))
+        return chain
+
+
+def get_franchise_graph() -> FranchiseGraph:
+    """현재 카탈로그 버전의 그래프 (재구성 시 anime 컬럼도 갱신)"""
+    global _graph
+
+    version = get_catalog_version()
+    graph = _graph
+    if graph is not None and graph.version == version:
+        return graph
+
+    with _graph_lock:
+        if _graph is None or _graph.version != version:
+            _graph = _build_graph(version)
+            _store_franchise_index(_graph)
+        return _graph
 
 
 def get_sequel_series(anime_id: int) -> List[Dict]:
     """
-    현재 애니메이션의 후속작들 조회 (재귀적으로)
+    현재 애니메이션의 후속작들 조회
     2기 -> 3기 -> 4기 식으로 모든 후속작을 찾음
     """
-    sequels = []
-
-    def find_sequels(current_id: int):
-        # 현재 애니메이션의 직접적인 후속작 찾기
-        rows = db.execute_query(
-            """
-            SELECT
-                a.id,
-                a.title_romaji,
-                a.title_english,
-                a.title_korean,
-                a.title_korean_official,
-                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url
-            FROM anime_relation ar
-            JOIN anime a ON ar.related_anime_id = a.id
-            WHERE ar.anime_id = ? AND ar.relation_type = 'SEQUEL'
-            ORDER BY a.season_year ASC, a.season ASC
-            """,
-            (current_id,)
-        )
+    sequel_ids = get_franchise_graph().sequel_chain(anime_id)
+    if not sequel_ids:
+        return []
 
-        for row in rows:
-            sequel_dict = dict_from_row(row)
-            sequels.append(sequel_dict)
-            # 재귀적으로 그 다음 후속작 찾기
-            find_sequels(sequel_dict['id'])
-
-    find_sequels(anime_id)
-    return sequels
+    placeholders = ','.join('?' * len(sequel_ids))
+    rows = db.execute_query(
+        f"SELECT {_SERIES_COLUMNS} FROM anime a WHERE a.id IN ({placeholders})",
+        tuple(sequel_ids)
+    )
+    by_id = {row['id']: dict_from_row(row) for row in rows}
+    return [by_id[sequel_id] for sequel_id in sequel_ids if sequel_id in by_id]
 
 
 def get_series_info(anime_id: int) -> Dict:
@@ -48,17 +181,7 @@ def get_series_info(anime_id: int) -> Dict:
     """
     # 현재 애니메이션 정보
     current = db.execute_query(
-        """
-        SELECT
-            id,
-            title_romaji,
-            title_english,
-            title_korean,
-            title_korean_official,
-            COALESCE('/' || cover_image_local, cover_image_url) as cover_image_url
-        FROM anime
-        WHERE id = ?
-        """,
+        f"SELECT {_SERIES_COLUMNS} FROM anime a WHERE a.id = ?",
         (anime_id,),
         fetch_one=True
     )
@@ -74,3 +197,101 @@ def get_series_info(anime_id: int) -> Dict:
         'sequels': sequels,
         'total_sequels': len(sequels)
     }
+
+
+def get_franchise(anime_id: int) -> Optional[Dict]:
+    """
+    anime_id가 속한 프랜차이즈 전체 (방영 순, 시즌 번호 포함)
+    사전 계산된 franchise_id 컬럼으로 한 번에 조회
+    """
+    get_franchise_graph()
+
+    rows = db.execute_query(
+        f"""
+        SELECT {_SERIES_COLUMNS},
+               a.format, a.season, a.season_year,
+               a.franchise_id, a.franchise_order, a.season_number
+        FROM anime a
+        WHERE a.franchise_id = (SELECT franchise_id FROM anime WHERE id = ?)
+        ORDER BY a.franchise_order
+        """,
+        (anime_id,)
+    )
+
+    if not rows:
+        return None
+
+    items = dicts_from_rows(rows)
+    return {
+        'franchise_id': items[0]['franchise_id'],
+        'current_id': anime_id,
+        'items': items,
+        'total': len(items)
+    }
+
+
+def _build_graph(version: str) -> FranchiseGraph:
+    started = time.perf_counter()
+    anime_rows = db.execute_query(
+        """
+        SELECT id, format, season, season_year, start_date,
+               franchise_id, franchise_order, season_number
+        FROM anime
+        """
+    )
+    relation_rows = db.execute_query(
+        "SELECT anime_id, related_anime_id, relation_type FROM anime_relation"
+    )
+    graph = FranchiseGraph(version, anime_rows, relation_rows)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"[Series] Franchise graph v{version} built: {len(graph.ids)} anime, "
+          f"{len(graph.members)} franchises in {elapsed:.0f}ms")
+    return graph
+
+
+def _store_franchise_index(graph: FranchiseGraph):
+    """바뀐 행만 anime.franchise_id / franchise_order / season_number 갱신"""
+    row = db.execute_query(
+        "SELECT value FROM crawl_meta WHERE key = ?",
+        (FRANCHISE_INDEX_VERSION_KEY,),
+        fetch_one=True
+    )
+    if row and row['value'] == graph.version:
+        return
+
+    updates = []
+    for anime_id in graph.ids:
+        computed = (graph.franchise_of[anime_id], graph.franchise_order[anime_id], graph.season_number[anime_id])
+        if graph.stored[anime_id] != computed:
+            updates.append(computed + (anime_id,))
+
+    if updates:
+        db.execute_many(
+            "UPDATE anime SET franchise_id = ?, franchise_order = ?, season_number = ? WHERE id = ?",
+            updates
+        )
+    db.execute_update(
+        """
+        INSERT INTO crawl_meta (key, value, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+        """,
+        (FRANCHISE_INDEX_VERSION_KEY, graph.version)
+    )
+    print(f"[Series] Franchise index stored ({len(updates)} rows changed)")
+
+
+def _add_edge(sequels: Dict, prequels: Dict, earlier: int, later: int):
+    if later not in sequels.setdefault(earlier, []):
+        sequels[earlier].append(later)
+        prequels.setdefault(later, []).append(earlier)
+
+
+def _chronological_key(row):
+    """방영 순 정렬 키 (연도/시즌 없는 작품은 뒤로)"""
+    return (
+        row['season_year'] is None, row['season_year'] or 0,
+        _SEASON_ORDER.get(row['season'], 5),
+        row['start_date'] or '',
+        row['id'],
+    )
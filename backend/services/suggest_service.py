@@ -0,0 +1,368 @@
+"""
+Suggest Service
+검색창 자동완성 (메모리 접두사 인덱스)
+
+- 애니 제목(로마자/영어/일본어/한국어)과 캐릭터 이름을 정규화한 키(소문자, 공백 제거)를
+  정렬 배열로 보관하고 bisect로 접두사 범위를 찾음 (SQLite 조회 없음)
+- 두 번째 단어부터 시작하는 키("kyojin")와 한국어 초성 키("ㅈㄱㅇㄱㅇ")도 함께 색인
+- 점수 = log10(1 + popularity / favourites), 제목 맨 앞부터 일치하면 가산
+- 범위가 넓은 짧은 접두사는 상위 결과를 미리 계산 (매번 훑지 않음)
+- 키 수 예산(SUGGEST_MAX_KEYS)을 넘으면 인기 낮은 항목부터 제외
+- 어드민 수정은 해당 항목 키만 교체 (update_suggestions),
+  그 외 카탈로그 버전 변경(크롤러)은 백그라운드에서 재구성하는 동안 기존 인덱스로 응답
+"""
+import heapq
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+from database import db
+from services.catalog_service import get_catalog_version
+from utils.hangul import to_chosung, has_hangul
+from config import SUGGEST_MAX_KEYS, SUGGEST_MAX_SCAN, SUGGEST_MAX_LIMIT
+
+
+# 항목 종류별 원본 컬럼 (names: 색인하는 이름 컬럼, korean: 초성 키도 만드는 컬럼)
+_SOURCES = {
+    'anime': {
+        'sql': """
+            SELECT id, popularity as weight, title_korean, title_romaji, title_english, title_native,
+                   COALESCE('/' || cover_image_local, cover_image_url) as image
+            FROM anime
+        """,
+        'names': ('title_korean', 'title_romaji', 'title_english', 'title_native'),
+        'korean': ('title_korean',),
+        'title': ('title_korean', 'title_romaji'),
+        'subtitle': ('title_romaji', 'title_english', 'title_native'),
+    },
+    'character': {
+        'sql': """
+            SELECT id, favourites as weight, name_korean, name_full, name_native,
+                   COALESCE('/' || image_local, image_url) as image
+            FROM character
+        """,
+        'names': ('name_korean', 'name_full', 'name_native'),
+        'korean': ('name_korean',),
+        'title': ('name_korean', 'name_full'),
+        'subtitle': ('name_full', 'name_native'),
+    },
+}
+
+# 제목 맨 앞부터 일치하는 키 가산점 (중간 단어 일치보다 우선)
+_PREFIX_BONUS = 1.0
+
+# 이름 하나에서 만드는 중간 단어 키 최대 개수
+_MAX_WORD_KEYS = 4
+
+# 미리 계산하는 상위 결과 수 (수정으로 빠지는 항목 대비 SUGGEST_MAX_LIMIT의 2배)
+_TOP_SIZE = SUGGEST_MAX_LIMIT * 2
+
+_DISPLAY_FIELDS = ('type', 'id', 'title', 'subtitle', 'image')
+
+_index = None
+_index_lock = threading.Lock()
+_rebuilding = False
+
+
+class SuggestIndex:
+    """정렬된 키 배열 + 키별 (점수, 항목 슬롯)"""
+
+    def __init__(self, version: str, items: List[Dict]):
+        self.version = version
+        self.lock = threading.RLock()
+        self.items: List[Optional[tuple]] = []  # 슬롯 → 표시용 튜플 (_DISPLAY_FIELDS 순)
+        self.slot_of: Dict[tuple, int] = {}
+        self.keys_of: Dict[int, tuple] = {}
+
+        entries = []
+        # 인기순으로 넣다가 예산을 넘으면 중단
+        for item in sorted(items, key=lambda i: i['weight'], reverse=True):
+            item_keys = _item_keys(item)
+            if len(entries) + len(item_keys) > SUGGEST_MAX_KEYS:
+                break
+            slot = self._add_item(item, item_keys)
+            entries.extend((key, score, slot) for key, score in item_keys.items())
+        self.skipped = len(items) - len(self.slot_of)
+
+        entries.sort(key=lambda e: e[0])
+        self.keys = [e[0] for e in entries]
+        self.scores = array('d', (e[1] for e in entries))
+        self.slots = array('l', (e[2] for e in entries))
+
+        # 범위가 SUGGEST_MAX_SCAN보다 넓은 접두사 → 상위 (점수, 슬롯)
+        self.top: Dict[str, List[tuple]] = {}
+        self._precompute_top('', 0, len(self.keys))
+
+    def suggest(self, query: str, limit: int) -> List[Dict]:
+        with self.lock:
+            top = self.top.get(query)
+            if top is None or len(top) < limit:
+                top = self._top_entries(*self._range(query), limit)
+            return [dict(zip(_DISPLAY_FIELDS, self.items[slot])) for _, slot in top[:limit]]
+
+    def update(self, items: List[Dict], removed: List[tuple]):
+        """항목 키 교체 (items: 새 값, removed: 삭제된 (type, id))"""
+        with self.lock:
+            for item_ref in removed:
+                slot = self.slot_of.pop(item_ref, None)
+                if slot is not None:
+                    self._remove_keys(slot)
+                    self.items[slot] = None
+
+            for item in items:
+                item_keys = _item_keys(item)
+                slot = self.slot_of.get((item['type'], item['id']))
+                if slot is None:
+                    if len(self.keys) + len(item_keys) > SUGGEST_MAX_KEYS:
+                        continue
+                    slot = self._add_item(item, item_keys)
+                else:
+                    self._remove_keys(slot)
+                    self.items[slot] = _display(item)
+                    self.keys_of[slot] = tuple(item_keys)
+                for key, score in item_keys.items():
+                    i = bisect_left(self.keys, key)
+                    self.keys.insert(i, key)
+                    self.scores.insert(i, score)
+                    self.slots.insert(i, slot)
+                    self._offer_top(key, score, slot)
+
+    def stats(self) -> Dict:
+        return {
+            'version': self.version,
+            'items': len(self.slot_of),
+            'keys': len(self.keys),
+            'skipped_items': self.skipped,
+            'precomputed_prefixes': len(self.top),
+        }
+
+    def _add_item(self, item: Dict, item_keys: Dict[str, float]) -> int:
+        slot = len(self.items)
+        self.items.append(_display(item))
+        self.slot_of[(item['type'], item['id'])] = slot
+        self.keys_of[slot] = tuple(item_keys)
+        return slot
+
+    def _remove_keys(self, slot: int):
+        for key in self.keys_of.pop(slot, ()):
+            lo, hi = self._range(key)
+            for i in range(lo, hi):
+                if self.keys[i] == key and self.slots[i] == slot:
+                    del self.keys[i]
+                    del self.scores[i]
+                    del self.slots[i]
+                    break
+            self._drop_top(key, slot)
+
+    def _range(self, prefix: str):
+        lo = bisect_left(self.keys, prefix)
+        return lo, bisect_left(self.keys, prefix + '\U0010ffff', lo)
+
+    def _top_entries(self, lo: int, hi: int, limit: int) -> List[tuple]:
+        """범위 안 상위 (점수, 슬롯), 한 항목의 여러 키는 최고 점수 하나만"""
+        n = limit
+        while True:
+            ranked = heapq.nlargest(n, range(lo, hi), key=self.scores.__getitem__)
+            entries = []
+            seen = set()
+            for i in ranked:
+                slot = self.slots[i]
+                if slot not in seen:
+                    seen.add(slot)
+                    entries.append((self.scores[i], slot))
+                    if len(entries) == limit:
+                        return entries
+            if len(ranked) < n:
+                return entries
+            # 같은 항목의 키가 겹쳐 모자라면 더 넓게
+            n *= 4
+
+    def _precompute_top(self, prefix: str, lo: int, hi: int):
+        if hi - lo <= SUGGEST_MAX_SCAN:
+            return
+        if prefix:
+            self.top[prefix] = self._top_entries(lo, hi, _TOP_SIZE)
+        # 다음 글자별 하위 범위
+        depth = len(prefix)
+        i = lo
+        while i < hi:
+            key = self.keys[i]
+            if len(key) <= depth:
+                i += 1
+                continue
+            child = key[:depth + 1]
+            end = bisect_left(self.keys, child + '\U0010ffff', i, hi)
+            self._precompute_top(child, i, end)
+            i = end
+
+    def _offer_top(self, key: str, score: float, slot: int):
+        """새 키를 미리 계산된 접두사 상위 목록에 반영"""
+        for length in range(1, len(key) + 1):
+            top = self.top.get(key[:length])
+            if top is None:
+                break
+            current = next((s for s, other in top if other == slot), None)
+            if current is not None:
+                if current >= score:
+                    continue
+                top.remove((current, slot))
+            insort(top, (score, slot), key=lambda e: -e[0])
+            del top[_TOP_SIZE:]
+
+    def _drop_top(self, key: str, slot: int):
+        """삭제된 키를 상위 목록에서 제거 (너무 줄어들면 그 접두사만 다시 계산)"""
+        for length in range(1, len(key) + 1):
+            prefix = key[:length]
+            top = self.top.get(prefix)
+            if top is None:
+                break
+            if any(other == slot for _, other in top):
+                top[:] = [entry for entry in top if entry[1] != slot]
+                if len(top) < SUGGEST_MAX_LIMIT:
+                    self.top[prefix] = self._top_entries(*self._range(prefix), _TOP_SIZE)
+
+
+def get_suggest_index() -> SuggestIndex:
+    """
+    현재 자동완성 인덱스
+    카탈로그 버전이 바뀌었으면 백그라운드 재구성을 시작하고 그동안 기존 인덱스 사용
+    """
+    global _index
+
+    index = _index
+    if index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _build_index(get_catalog_version())
+            return _index
+
+    version = get_catalog_version()
+    if index.version != version:
+        _start_rebuild(version)
+    return index
+
+
+def suggest(query: str, limit: int = 10) -> List[Dict]:
+    """접두사 자동완성 (애니 + 캐릭터, 점수순)"""
+    prefix = _normalize(query)
+    if not prefix:
+        return []
+    return get_suggest_index().suggest(prefix, min(limit, SUGGEST_MAX_LIMIT))
+
+
+def update_suggestions(item_type: str, item_ids: List[int], version: Optional[str] = None):
+    """
+    수정된 항목만 인덱스에 반영 (어드민 수정 후 호출)
+    version: 이 수정으로 올린 카탈로그 버전 → 인덱스가 직전 버전이었다면 재구성 없이 그 버전으로 간주
+    """
+    index = _index
+    if index is None or not item_ids:
+        return
+
+    source = _SOURCES[item_type]
+    placeholders = ','.join('?' * len(item_ids))
+    rows = db.execute_query(
+        f"SELECT * FROM ({source['sql']}) WHERE id IN ({placeholders})",
+        tuple(item_ids)
+    )
+    items = [_item_from_row(item_type, row) for row in rows]
+    found = {item['id'] for item in items}
+    index.update(items, [(item_type, item_id) for item_id in item_ids if item_id not in found])
+
+    if version is not None and _is_next_version(index.version, version):
+        index.version = version
+
+
+def get_suggest_stats() -> Dict:
+    index = _index
+    return index.stats() if index is not None else {'items': 0, 'keys': 0}
+
+
+def _start_rebuild(version: str):
+    global _rebuilding
+
+    with _index_lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+
+    def rebuild():
+        global _index, _rebuilding
+        try:
+            _index = _build_index(version)
+        except Exception as e:
+            print(f"[Suggest] Rebuild failed: {e}")
+        finally:
+            _rebuilding = False
+
+    threading.Thread(target=rebuild, daemon=True).start()
+
+
+def _build_index(version: str) -> SuggestIndex:
+    started = time.perf_counter()
+    items = []
+    for item_type, source in _SOURCES.items():
+        items.extend(_item_from_row(item_type, row) for row in db.iter_query(source['sql']))
+    index = SuggestIndex(version, items)
+    elapsed = (time.perf_counter() - started) * 1000
+    stats = index.stats()
+    print(f"[Suggest] Index v{version} built: {stats['items']} items, {stats['keys']} keys "
+          f"({stats['skipped_items']} over budget) in {elapsed:.0f}ms")
+    return index
+
+
+def _item_from_row(item_type: str, row) -> Dict:
+    source = _SOURCES[item_type]
+    item = {
+        'type': item_type,
+        'id': row['id'],
+        'weight': math.log10(1 + max(row['weight'] or 0, 0)),
+        'image': row['image'],
+    }
+    for column in source['names']:
+        item[column] = row[column]
+    return item
+
+
+def _item_keys(item: Dict) -> Dict[str, float]:
+    """항목의 색인 키 → 점수 (같은 키는 높은 점수 하나)"""
+    source = _SOURCES[item['type']]
+    keys: Dict[str, float] = {}
+
+    def add(key, score):
+        if key and keys.get(key, -1.0) < score:
+            keys[key] = score
+
+    for column in source['names']:
+        name = item.get(column)
+        if not name:
+            continue
+        words = name.lower().split()
+        add(''.join(words), item['weight'] + _PREFIX_BONUS)
+        for start in range(1, min(len(words), _MAX_WORD_KEYS + 1)):
+            add(''.join(words[start:]), item['weight'])
+        if column in source['korean'] and has_hangul(name):
+            add(to_chosung(name), item['weight'] + _PREFIX_BONUS)
+    return keys
+
+
+def _display(item: Dict) -> tuple:
+    """응답에 쓰는 값만 튜플로 (항목 수만큼 메모리에 남으므로 dict 대신)"""
+    source = _SOURCES[item['type']]
+    title = next((item[c] for c in source['title'] if item.get(c)), None)
+    subtitle = next((item[c] for c in source['subtitle'] if item.get(c) and item[c] != title), None)
+    return (item['type'], item['id'], title, subtitle, item['image'])
+
+
+def _normalize(query: str) -> str:
+    """색인 키와 같은 형태 (소문자, 공백 제거)"""
+    return ''.join(query.lower().split())
+
+
+def _is_next_version(current: str, version: str) -> bool:
+    try:
+        return int(current) + 1 == int(version)
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,232 @@
+"""
+Trending Service
+사이트 내 활동 기반 트렌딩 애니 / 캐릭터 (AniList trending 컬럼과 별개)
+
+- 새 평가(activities), 리뷰, 좋아요를 항목별 1시간 버킷(trending_bucket)에 누적
+- 소스 테이블마다 마지막으로 읽은 id를 워터마크로 보관 → 매 실행마다 그 이후 행만 집계
+- 점수 = Σ 버킷 (가중치 × 횟수) × 0.5^(경과 시간 / TRENDING_HALF_LIFE_HOURS)
+  TRENDING_WINDOW_HOURS보다 오래된 버킷은 삭제
+- 점수는 trending_score (item_type, score 인덱스)에 미리 계산 → 조회는 인덱스 범위 읽기
+- 평가 취소 / 좋아요 취소는 반영하지 않음 (발생한 활동량 기준)
+"""
+import json
+import threading
+import time
+from typing import Dict, List
+from database import db, dict_from_row, dicts_from_rows
+from services.relation_loader import attach_anime_relations
+from config import TRENDING_REFRESH_MINUTES, TRENDING_WINDOW_HOURS, TRENDING_HALF_LIFE_HOURS
+
+
+TRENDING_WATERMARK_KEY = 'trending_watermarks'
+
+# 활동 종류별 가중치
+_EVENT_WEIGHTS = {
+    'ratings': 1.0,
+    'reviews': 3.0,
+    'likes': 0.5,
+}
+
+# 소스 테이블 → (활동 종류, rowid > ? AND rowid <= ? 범위의 (item_type, item_id, hour) 쿼리)
+# 워터마크는 rowid 기준 (review_likes는 마이그레이션 001 스키마에 id 컬럼이 없음, 나머지는 rowid = id)
+_HOUR = "CAST(strftime('%s', {column}) AS INTEGER) / 3600"
+
+_SOURCES = {
+    # activities.created_at은 평점 행의 최초 생성 시각(보고싶어요/패스 포함)이므로 평가 시각인 activity_time 기준
+    'activities': ('ratings', f"""
+        SELECT CASE activity_type WHEN 'anime_rating' THEN 'anime' ELSE 'character' END as item_type,
+               item_id, {_HOUR.format(column='activity_time')} as hour
+        FROM activities
+        WHERE rowid > ? AND rowid <= ? AND activity_type IN ('anime_rating', 'character_rating')
+    """),
+    'user_reviews': ('reviews', f"""
+        SELECT 'anime' as item_type, anime_id as item_id, {_HOUR.format(column='created_at')} as hour
+        FROM user_reviews
+        WHERE rowid > ? AND rowid <= ?
+    """),
+    'character_reviews': ('reviews', f"""
+        SELECT 'character' as item_type, character_id as item_id, {_HOUR.format(column='created_at')} as hour
+        FROM character_reviews
+        WHERE rowid > ? AND rowid <= ?
+    """),
+    'activity_likes': ('likes', f"""
+        SELECT CASE WHEN activity_type LIKE 'anime%' THEN 'anime' ELSE 'character' END as item_type,
+               item_id, {_HOUR.format(column='created_at')} as hour
+        FROM activity_likes
+        WHERE rowid > ? AND rowid <= ?
+          AND activity_type IN ('anime_rating', 'anime_review', 'character_rating', 'character_review')
+    """),
+    'review_likes': ('likes', f"""
+        SELECT 'anime' as item_type, r.anime_id as item_id, {_HOUR.format(column='l.created_at')} as hour
+        FROM review_likes l
+        JOIN user_reviews r ON r.id = l.review_id
+        WHERE l.rowid > ? AND l.rowid <= ?
+    """),
+    'character_review_likes': ('likes', f"""
+        SELECT 'character' as item_type, r.character_id as item_id, {_HOUR.format(column='l.created_at')} as hour
+        FROM character_review_likes l
+        JOIN character_reviews r ON r.id = l.review_id
+        WHERE l.rowid > ? AND l.rowid <= ?
+    """),
+}
+
+_refresh_lock = threading.Lock()
+_aggregator_started = False
+
+
+def refresh_trending() -> Dict:
+    """워터마크 이후 활동을 버킷에 더하고 창 안의 모든 항목 점수를 다시 계산"""
+    with _refresh_lock:
+        started = time.perf_counter()
+        now_hour = int(time.time() // 3600)
+        window_start = now_hour - TRENDING_WINDOW_HOURS
+
+        row = db.execute_query(
+            "SELECT value FROM crawl_meta WHERE key = ?", (TRENDING_WATERMARK_KEY,), fetch_one=True
+        )
+        watermarks = json.loads(row['value']) if row else {}
+
+        # (item_type, item_id, hour) → {활동 종류: 횟수}
+        deltas: Dict[tuple, Dict[str, int]] = {}
+        scanned = 0
+        for source, (event, query) in _SOURCES.items():
+            # 소스별로 따로 처리: 한 테이블이 실패해도 나머지는 반영 (실패한 소스는 워터마크 유지 → 다음 실행에 재시도)
+            try:
+                low = watermarks.get(source, 0)
+                high = db.execute_query(
+                    f"SELECT COALESCE(MAX(rowid), 0) as high FROM {source}", fetch_one=True
+                )['high']
+                if high <= low:
+                    continue
+                source_counts: Dict[tuple, int] = {}
+                for event_row in db.iter_query(query, (low, high)):
+                    scanned += 1
+                    if event_row['item_id'] is None or event_row['hour'] is None or event_row['hour'] < window_start:
+                        continue
+                    key = (event_row['item_type'], event_row['item_id'], event_row['hour'])
+                    source_counts[key] = source_counts.get(key, 0) + 1
+            except Exception as e:
+                print(f"[Trending] Failed to scan {source}: {e}")
+                continue
+
+            for key, count in source_counts.items():
+                counts = deltas.setdefault(key, {})
+                counts[event] = counts.get(event, 0) + count
+            watermarks[source] = high
+
+        with db.get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO trending_bucket (item_type, item_id, hour, ratings, reviews, likes)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(item_type, item_id, hour) DO UPDATE SET
+                    ratings = ratings + excluded.ratings,
+                    reviews = reviews + excluded.reviews,
+                    likes = likes + excluded.likes
+                """,
+                [
+                    (*key, counts.get('ratings', 0), counts.get('reviews', 0), counts.get('likes', 0))
+                    for key, counts in deltas.items()
+                ]
+            )
+            conn.execute("DELETE FROM trending_bucket WHERE hour < ?", (window_start,))
+
+            # 시간이 지나면 모든 점수가 감쇠하므로 창 안의 항목 전체를 다시 계산 (버킷 수만큼)
+            scores: Dict[tuple, list] = {}
+            for bucket in conn.execute("SELECT item_type, item_id, hour, ratings, reviews, likes FROM trending_bucket"):
+                decay = 0.5 ** ((now_hour - bucket['hour']) / TRENDING_HALF_LIFE_HOURS)
+                total = scores.setdefault((bucket['item_type'], bucket['item_id']), [0.0, 0, 0, 0])
+                total[0] += decay * sum(bucket[event] * weight for event, weight in _EVENT_WEIGHTS.items())
+                total[1] += bucket['ratings']
+                total[2] += bucket['reviews']
+                total[3] += bucket['likes']
+
+            conn.execute("DELETE FROM trending_score")
+            conn.executemany(
+                """
+                INSERT INTO trending_score (item_type, item_id, score, ratings, reviews, likes)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(*key, round(total[0], 4), *total[1:]) for key, total in scores.items()]
+            )
+            conn.execute(
+                """
+                INSERT INTO crawl_meta (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+                """,
+                (TRENDING_WATERMARK_KEY, json.dumps(watermarks))
+            )
+            conn.commit()
+
+        return {
+            'scanned': scanned,
+            'buckets_updated': len(deltas),
+            'items': len(scores),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000),
+        }
+
+
+def start_trending_aggregator():
+    """TRENDING_REFRESH_MINUTES마다 백그라운드에서 refresh_trending"""
+    global _aggregator_started
+    if _aggregator_started:
+        return
+    _aggregator_started = True
+
+    def run():
+        while True:
+            try:
+                refresh_trending()
+            except Exception as e:
+                print(f"[Trending] Refresh failed: {e}")
+            time.sleep(TRENDING_REFRESH_MINUTES * 60)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_trending_anime(limit: int = 20) -> List[Dict]:
+    """트렌딩 애니 (점수 순) + 창 안의 평가/리뷰/좋아요 수"""
+    rows = db.execute_query(
+        """
+        SELECT a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean, a.title_korean_official,
+               a.type, a.format, a.status, a.description,
+               a.season, a.season_year, a.episodes, a.duration,
+               COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+               a.cover_image_color, a.banner_image_url,
+               a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
+               s.score as trending_score,
+               s.ratings as trending_ratings,
+               s.reviews as trending_reviews,
+               s.likes as trending_likes
+        FROM trending_score s
+        JOIN anime a ON a.id = s.item_id
+        WHERE s.item_type = 'anime'
+        ORDER BY s.score DESC
+        LIMIT ?
+        """,
+        (limit,)
+    )
+    return attach_anime_relations(dicts_from_rows(rows), genres=True, site_stats=True)
+
+
+def get_trending_characters(limit: int = 20) -> List[Dict]:
+    """트렌딩 캐릭터 (점수 순) + 창 안의 평가/리뷰/좋아요 수"""
+    rows = db.execute_query(
+        """
+        SELECT c.id, c.name_full, c.name_native, c.name_korean,
+               COALESCE('/' || c.image_local, c.image_url) as image_url,
+               c.favourites,
+               s.score as trending_score,
+               s.ratings as trending_ratings,
+               s.reviews as trending_reviews,
+               s.likes as trending_likes
+        FROM trending_score s
+        JOIN character c ON c.id = s.item_id
+        WHERE s.item_type = 'character'
+        ORDER BY s.score DESC
+        LIMIT ?
+        """,
+        (limit,)
+    )
+    return [dict_from_row(row) for row in rows]
@@ -0,0 +1,91 @@
+"""
+Test fuzzy search: trigram inverted index build time / memory / latency / recall
+실제 제목·이름에 오타(삭제, 치환, 자리 바꿈)를 넣은 검색어로 측정 (run from backend/)
+"""
+import random
+import statistics
+import time
+import tracemalloc
+from database import db
+from services.fuzzy_search_service import FuzzyIndex, _SOURCES
+from services.search_service import search_anime_ids, search_character_ids
+
+ROUNDS = 3
+QUERIES_PER_TYPE = 60
+
+
+def make_typo(text: str) -> str:
+    """한 글자 삭제 / 치환 / 인접 글자 자리 바꿈 중 하나"""
+    chars = list(text)
+    i = random.randrange(1, len(chars) - 1)
+    kind = random.choice(('delete', 'replace', 'swap'))
+    if kind == 'delete':
+        del chars[i]
+    elif kind == 'replace':
+        chars[i] = chr(0xAC00 + random.randrange(11172)) if '가' <= chars[i] <= '힣' else random.choice('aeiouknst')
+    else:
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return ''.join(chars)
+
+
+def sample_queries(item_type: str, columns):
+    rows = db.execute_query(
+        f"SELECT id, {', '.join(columns)} FROM {item_type} ORDER BY RANDOM() LIMIT {QUERIES_PER_TYPE * 3}"
+    )
+    queries = []
+    for row in rows:
+        name = next((row[c] for c in columns if row[c] and len(row[c]) >= 6), None)
+        if name:
+            queries.append((row['id'], make_typo(name)))
+    return queries[:QUERIES_PER_TYPE]
+
+
+def percentile(timings, p):
+    return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+
+random.seed(42)
+indexes = {}
+print("=" * 70)
+for item_type in ('anime', 'character'):
+    rows = db.execute_query(_SOURCES[item_type])
+    tracemalloc.start()
+    start = time.perf_counter()
+    indexes[item_type] = FuzzyIndex(item_type, 'bench', rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    FuzzyIndex(item_type, 'bench', rows)
+    plain_ms = (time.perf_counter() - start) * 1000
+    print(f"{item_type:9s}: {indexes[item_type].stats()}")
+    print(f"           build {plain_ms:.0f}ms (traced {build_ms:.0f}ms), retained {memory / 1024 / 1024:.1f}MB")
+
+checks = (
+    ('anime', ('title_romaji', 'title_korean'), search_anime_ids),
+    ('character', ('name_full', 'name_korean'), search_character_ids),
+)
+for item_type, columns, search_fn in checks:
+    queries = sample_queries(item_type, columns)
+    fuzzy_timings, search_timings = [], []
+    hits = exact_hits = 0
+    for _ in range(ROUNDS):
+        for item_id, query in queries:
+            start = time.perf_counter()
+            fuzzy = indexes[item_type].search(query, 10)
+            fuzzy_timings.append((time.perf_counter() - start) * 1000)
+            hits += item_id in [i for i, _ in fuzzy]
+
+            start = time.perf_counter()
+            found = search_fn(query, 10)
+            search_timings.append((time.perf_counter() - start) * 1000)
+            exact_hits += item_id in found
+    fuzzy_timings.sort()
+    search_timings.sort()
+    total = len(queries) * ROUNDS
+    print(f"{item_type:9s}: {len(queries)} typo queries x {ROUNDS} rounds")
+    print(f"           fuzzy only     p50 {statistics.median(fuzzy_timings):6.2f}ms  "
+          f"p99 {percentile(fuzzy_timings, 0.99):6.2f}ms  recall@10 {hits / total:.0%}")
+    print(f"           search + fallback p50 {statistics.median(search_timings):6.2f}ms  "
+          f"p99 {percentile(search_timings, 0.99):6.2f}ms  recall@10 {exact_hits / total:.0%}")
+print("=" * 70)
@@ -0,0 +1,100 @@
+"""
+Test search performance: LIKE '%q%' scan vs FTS5 trigram index
+p50 / p99 latency per query set (run from backend/ after ensure_schema)
+"""
+import random
+import statistics
+import time
+from database import db
+from services.search_service import search_anime_summaries, search_character_summaries
+
+ROUNDS = 5
+
+
+def legacy_search(q: str, limit: int = 20):
+    """기존 unified_search 쿼리 (LIKE + 상관 서브쿼리 + GROUP BY)"""
+    pattern = f"%{q}%"
+    db.execute_query(
+        """
+        SELECT a.id,
+            (SELECT AVG(ur.rating) FROM user_ratings ur
+             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_avg_rating,
+            (SELECT COUNT(*) FROM user_ratings ur
+             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count
+        FROM anime a
+        WHERE a.title_korean LIKE ? OR a.title_romaji LIKE ? OR a.title_english LIKE ? OR a.title_native LIKE ?
+        ORDER BY a.popularity DESC
+        LIMIT ?
+        """,
+        (pattern, pattern, pattern, pattern, limit)
+    )
+    db.execute_query(
+        """
+        SELECT c.id,
+            (SELECT AVG(cr.rating) FROM character_ratings cr
+             WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_avg_rating,
+            (SELECT COUNT(*) FROM character_ratings cr
+             WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_rating_count,
+            a.id as anime_id
+        FROM character c
+        LEFT JOIN anime_character ac ON c.id = ac.character_id
+        LEFT JOIN anime a ON ac.anime_id = a.id
+        WHERE c.name_korean LIKE ? OR c.name_full LIKE ? OR c.name_native LIKE ?
+        GROUP BY c.id
+        ORDER BY c.favourites DESC
+        LIMIT ?
+        """,
+        (pattern, pattern, pattern, limit)
+    )
+
+
+def fts_search(q: str, limit: int = 20):
+    search_anime_summaries(q, "popularity_desc", limit)
+    search_character_summaries(q, "popularity_desc", limit)
+
+
+def sample_queries():
+    """실제 제목/이름에서 잘라낸 검색어 (3~6글자) + 짧은 검색어"""
+    rows = db.execute_query(
+        """
+        SELECT title_romaji as t FROM anime WHERE title_romaji IS NOT NULL
+        UNION ALL SELECT title_korean FROM anime WHERE title_korean IS NOT NULL
+        UNION ALL SELECT name_full FROM character WHERE name_full IS NOT NULL
+        """
+    )
+    titles = [row['t'] for row in rows]
+    random.seed(42)
+    queries = []
+    for title in random.sample(titles, min(60, len(titles))):
+        length = random.randint(3, 6)
+        start = random.randint(0, max(len(title) - length, 0))
+        queries.append(title[start:start + length])
+    return queries + ['진격', 'no', 'ka']
+
+
+def measure(fn, queries):
+    timings = []
+    for _ in range(ROUNDS):
+        for q in queries:
+            start = time.perf_counter()
+            fn(q)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return (
+        statistics.median(timings),
+        timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    )
+
+
+queries = sample_queries()
+print(f"Benchmarking {len(queries)} queries x {ROUNDS} rounds...\n")
+
+legacy_p50, legacy_p99 = measure(legacy_search, queries)
+fts_p50, fts_p99 = measure(fts_search, queries)
+
+print("=" * 60)
+print(f"LIKE scan : p50 {legacy_p50:7.2f}ms   p99 {legacy_p99:7.2f}ms")
+print(f"FTS5      : p50 {fts_p50:7.2f}ms   p99 {fts_p99:7.2f}ms")
+print("=" * 60)
+print(f"p50 speedup: {legacy_p50 / max(fts_p50, 0.001):.1f}x")
+print(f"p99 speedup: {legacy_p99 / max(fts_p99, 0.001):.1f}x")
@@ -0,0 +1,56 @@
+"""
+Test search suggest performance: in-memory prefix index
+키 입력마다 호출되는 /api/search/suggest 지연 시간 (p50 / p99, run from backend/)
+"""
+import random
+import statistics
+import time
+import tracemalloc
+from database import db
+from services.suggest_service import get_suggest_index, suggest
+
+ROUNDS = 5
+
+
+def sample_prefixes():
+    """실제 제목/이름을 한 글자씩 입력하는 것처럼 잘라낸 접두사"""
+    rows = db.execute_query(
+        """
+        SELECT title_romaji as t FROM anime WHERE title_romaji IS NOT NULL
+        UNION ALL SELECT title_korean FROM anime WHERE title_korean IS NOT NULL
+        UNION ALL SELECT name_full FROM character WHERE name_full IS NOT NULL
+        UNION ALL SELECT name_korean FROM character WHERE name_korean IS NOT NULL
+        """
+    )
+    titles = [row['t'] for row in rows]
+    random.seed(42)
+    prefixes = []
+    for title in random.sample(titles, min(40, len(titles))):
+        prefixes.extend(title[:length] for length in range(1, min(len(title), 8) + 1))
+    return prefixes + ['ㄱ', 'ㄱㅁ', 'a', 'k', 'sh']
+
+
+tracemalloc.start()
+start = time.perf_counter()
+index = get_suggest_index()
+build_ms = (time.perf_counter() - start) * 1000
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+prefixes = sample_prefixes()
+timings = []
+for _ in range(ROUNDS):
+    for prefix in prefixes:
+        start = time.perf_counter()
+        suggest(prefix, 10)
+        timings.append((time.perf_counter() - start) * 1000)
+timings.sort()
+
+print("=" * 60)
+print(f"Index     : {index.stats()}")
+print(f"Build     : {build_ms:.0f}ms, peak memory {peak / 1024 / 1024:.1f}MB")
+print(f"Suggest   : {len(prefixes)} prefixes x {ROUNDS} rounds")
+print(f"            p50 {statistics.median(timings):.3f}ms   "
+      f"p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:.3f}ms   "
+      f"max {timings[-1]:.3f}ms")
+print("=" * 60)
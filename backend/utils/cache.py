@@ -0,0 +1,147 @@
+"""
+In-process cache utilities
+TTL + LRU 캐시 (단일 uvicorn 프로세스 기준, 스레드 안전)
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    크기 제한 TTL 캐시
+    - maxsize 초과 시 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    - ttl(초)이 지난 항목은 조회 시 만료 처리
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """히트/미스 통계"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class VersionedDocumentCache:
+    """
+    (key, version) 단위 JSON 문서 캐시
+    - 메모리: LRU (만료 없음, 버전이 바뀌면 키가 달라져 자연히 밀려남)
+    - directory를 지정하면 디스크에도 저장 → 재시작 후에도 재사용
+      ({directory}/{name}/{version}/{key}.json, 새 버전을 쓰면 이전 버전 디렉터리 삭제)
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, directory: Optional[str] = None):
+        self.name = name
+        self._memory = TTLCache(maxsize=maxsize, ttl=None)
+        self._root = Path(directory) / name if directory else None
+        self._disk_version = None
+        self._disk_lock = threading.Lock()
+        self.disk_hits = 0
+
+    def get(self, key: Hashable, version: str) -> Optional[Dict]:
+        document = self._memory.get((key, version))
+        if document is not None or self._root is None:
+            return document
+
+        try:
+            with open(self._root / str(version) / f"{key}.json", encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        self.disk_hits += 1
+        self._memory.set((key, version), document)
+        return document
+
+    def set(self, key: Hashable, version: str, document: Dict):
+        self._memory.set((key, version), document)
+        if self._root is None:
+            return
+
+        try:
+            version_dir = self._root / str(version)
+            with self._disk_lock:
+                if self._disk_version != version:
+                    self._prune_disk(version)
+                    version_dir.mkdir(parents=True, exist_ok=True)
+                    self._disk_version = version
+            path = version_dir / f"{key}.json"
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 디스크 캐시는 부가 기능 - 실패해도 메모리 캐시로 계속 동작
+            print(f"[Cache] {self.name} disk write failed: {e}")
+
+    def clear(self):
+        self._memory.clear()
+
+    def stats(self) -> Dict:
+        stats = self._memory.stats()
+        stats['disk_hits'] = self.disk_hits
+        return stats
+
+    def _prune_disk(self, current_version: str):
+        if not self._root.exists():
+            return
+        for child in self._root.iterdir():
+            if child.is_dir() and child.name != str(current_version):
+                shutil.rmtree(child, ignore_errors=True)
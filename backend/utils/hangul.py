@@ -0,0 +1,46 @@
+"""
+Hangul utilities
+한글 음절 → 초성 분해 (초성 검색용)
+"""
+
+_SYLLABLE_START = 0xAC00  # 가
+_SYLLABLE_END = 0xD7A3  # 힣
+_SYLLABLES_PER_CHOSUNG = 21 * 28  # 중성 21 × 종성 28
+
+CHOSUNG = (
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+)
+
+# 호환용 자음 자모 (ㄱ U+3131 ~ ㅎ U+314E, 겹받침 포함)
+_CONSONANT_JAMO = frozenset(chr(c) for c in range(0x3131, 0x314F))
+
+
+def is_hangul_syllable(char: str) -> bool:
+    return _SYLLABLE_START <= ord(char) <= _SYLLABLE_END
+
+
+def to_chosung(text: str) -> str:
+    """
+    초성 문자열 (공백 제거, 한글 외 문자는 소문자로 유지)
+    예: "귀멸의 칼날" → "ㄱㅁㅇㅋㄴ", "진격의 거인 2기" → "ㅈㄱㅇㄱㅇ2ㄱ"
+    """
+    result = []
+    for char in text:
+        if char.isspace():
+            continue
+        if is_hangul_syllable(char):
+            result.append(CHOSUNG[(ord(char) - _SYLLABLE_START) // _SYLLABLES_PER_CHOSUNG])
+        else:
+            result.append(char.lower())
+    return ''.join(result)
+
+
+def is_chosung_query(query: str) -> bool:
+    """공백을 제외한 모든 글자가 자음 자모인지 (예: "ㄱㅁㅇㅋㄴ")"""
+    compact = ''.join(query.split())
+    return bool(compact) and all(char in _CONSONANT_JAMO for char in compact)
+
+
+def has_hangul(text: str) -> bool:
+    return any(is_hangul_syllable(char) or char in _CONSONANT_JAMO for char in text)
@@ -0,0 +1,86 @@
+"""
+Idempotency-Key 처리
+더블탭/클라이언트 재시도 시 같은 키의 요청은 저장된 응답을 그대로 반환 (DB 접근 없음)
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, status
+from config import IDEMPOTENCY_CACHE_SIZE, IDEMPOTENCY_TTL_SECONDS, MAX_IDEMPOTENCY_KEY_LENGTH
+from utils.cache import TTLCache
+
+
+_responses = TTLCache(maxsize=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_TTL_SECONDS)
+
+# 같은 키로 동시에 들어온 요청은 먼저 온 요청이 끝날 때까지 대기
+# cache_key → [락, 이 락을 쓰는(실행 중 + 대기 중) 요청 수] - 마지막 요청이 끝나면 삭제
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def run_idempotent(
+    idempotency_key: Optional[str],
+    user_id: int,
+    scope: str,
+    payload: Any,
+    fn: Callable[[], Any]
+) -> Any:
+    """
+    Idempotency-Key가 있으면 (사용자, scope, 키) 단위로 응답을 캐시
+
+    Args:
+        idempotency_key: 요청 헤더 값 (없으면 fn을 그대로 실행)
+        user_id: 요청 사용자 ID
+        scope: 엔드포인트 구분 (예: "anime_rating")
+        payload: 요청 본문/경로 파라미터 - 같은 키를 다른 요청에 재사용하면 422
+        fn: 실제 처리 함수
+
+    성공한 응답만 저장하고, 예외(HTTPException 포함)는 저장하지 않음
+    """
+    if not idempotency_key:
+        return fn()
+
+    if len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Idempotency-Key too long"
+        )
+
+    cache_key = (user_id, scope, idempotency_key)
+    fingerprint = _fingerprint(payload)
+
+    with _inflight_lock:
+        entry = _inflight.get(cache_key)
+        if entry is None:
+            entry = _inflight[cache_key] = [threading.Lock(), 0]
+        entry[1] += 1
+    key_lock = entry[0]
+
+    try:
+        with key_lock:
+            cached = _responses.get(cache_key)
+            if cached is not None:
+                cached_fingerprint, response = cached
+                if cached_fingerprint != fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Idempotency-Key reused with a different request"
+                    )
+                return response
+
+            response = fn()
+            _responses.set(cache_key, (fingerprint, response))
+            return response
+    finally:
+        with _inflight_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _inflight[cache_key]
+
+
+def _fingerprint(payload: Any) -> str:
+    if hasattr(payload, 'model_dump'):
+        payload = payload.model_dump(mode='json')
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
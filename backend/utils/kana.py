@@ -0,0 +1,221 @@
+"""
+Kana utilities
+일본어 가나 정규화 / 한글 읽기 (검색 키용)
+
+- fold_kana: 전각·반각 통일, 히라가나 → 가타카나, 장음 제거 ("たんじろう" = "ﾀﾝｼﾞﾛｰ" = "タンジロ")
+- native_reading: 가나로만 된 이름/제목의 한글 읽기 ("エレン" → "에렌")
+- fold_reading: 한글 읽기 비교용 정규화 (검색어에도 같은 규칙 적용)
+변환 테이블은 data/match_by_pronunciation.py(이름 매칭 스크립트)와 공유
+"""
+import unicodedata
+from utils.hangul import is_hangul_syllable
+
+
+# 가타카나→한글 변환 테이블 (발음 기반)
+KATAKANA_TO_KOREAN = {
+    # 기본 모음
+    'ア': '아', 'イ': '이', 'ウ': '우', 'エ': '에', 'オ': '오',
+    # カ행
+    'カ': '카', 'キ': '키', 'ク': '쿠', 'ケ': '케', 'コ': '코',
+    'ガ': '가', 'ギ': '기', 'グ': '구', 'ゲ': '게', 'ゴ': '고',
+    # サ행
+    'サ': '사', 'シ': '시', 'ス': '스', 'セ': '세', 'ソ': '소',
+    'ザ': '자', 'ジ': '지', 'ズ': '즈', 'ゼ': '제', 'ゾ': '조',
+    # タ행
+    'タ': '타', 'チ': '치', 'ツ': '츠', 'テ': '테', 'ト': '토',
+    'ダ': '다', 'ヂ': '지', 'ヅ': '즈', 'デ': '데', 'ド': '도',
+    # ナ행
+    'ナ': '나', 'ニ': '니', 'ヌ': '누', 'ネ': '네', 'ノ': '노',
+    # ハ행
+    'ハ': '하', 'ヒ': '히', 'フ': '후', 'ヘ': '헤', 'ホ': '호',
+    'バ': '바', 'ビ': '비', 'ブ': '부', 'ベ': '베', 'ボ': '보',
+    'パ': '파', 'ピ': '피', 'プ': '푸', 'ペ': '페', 'ポ': '포',
+    # マ행
+    'マ': '마', 'ミ': '미', 'ム': '무', 'メ': '메', 'モ': '모',
+    # ヤ행
+    'ヤ': '야', 'ユ': '유', 'ヨ': '요',
+    # ラ행
+    'ラ': '라', 'リ': '리', 'ル': '루', 'レ': '레', 'ロ': '로',
+    # ワ행
+    'ワ': '와', 'ヲ': '오', 'ン': '은',
+    # 소문자 (요음)
+    'ャ': '야', 'ュ': '유', 'ョ': '요',
+    'ッ': '', 'ー': '',  # 촉음, 장음
+    # 확장
+    'ヴ': '브',
+    'ァ': '아', 'ィ': '이', 'ゥ': '우', 'ェ': '에', 'ォ': '오',
+}
+
+# 히라가나→가타카나 변환 (발음 동일)
+HIRAGANA_TO_KATAKANA = {
+    'あ': 'ア', 'い': 'イ', 'う': 'ウ', 'え': 'エ', 'お': 'オ',
+    'か': 'カ', 'き': 'キ', 'く': 'ク', 'け': 'ケ', 'こ': 'コ',
+    'が': 'ガ', 'ぎ': 'ギ', 'ぐ': 'グ', 'げ': 'ゲ', 'ご': 'ゴ',
+    'さ': 'サ', 'し': 'シ', 'す': 'ス', 'せ': 'セ', 'そ': 'ソ',
+    'ざ': 'ザ', 'じ': 'ジ', 'ず': 'ズ', 'ぜ': 'ゼ', 'ぞ': 'ゾ',
+    'た': 'タ', 'ち': 'チ', 'つ': 'ツ', 'て': 'テ', 'と': 'ト',
+    'だ': 'ダ', 'ぢ': 'ヂ', 'づ': 'ヅ', 'で': 'デ', 'ど': 'ド',
+    'な': 'ナ', 'に': 'ニ', 'ぬ': 'ヌ', 'ね': 'ネ', 'の': 'ノ',
+    'は': 'ハ', 'ひ': 'ヒ', 'ふ': 'フ', 'へ': 'ヘ', 'ほ': 'ホ',
+    'ば': 'バ', 'び': 'ビ', 'ぶ': 'ブ', 'べ': 'ベ', 'ぼ': 'ボ',
+    'ぱ': 'パ', 'ぴ': 'ピ', 'ぷ': 'プ', 'ぺ': 'ペ', 'ぽ': 'ポ',
+    'ま': 'マ', 'み': 'ミ', 'む': 'ム', 'め': 'メ', 'も': 'モ',
+    'や': 'ヤ', 'ゆ': 'ユ', 'よ': 'ヨ',
+    'ら': 'ラ', 'り': 'リ', 'る': 'ル', 'れ': 'レ', 'ろ': 'ロ',
+    'わ': 'ワ', 'を': 'ヲ', 'ん': 'ン',
+    'ゃ': 'ャ', 'ゅ': 'ュ', 'ょ': 'ョ',
+    'っ': 'ッ',
+}
+
+
+def extract_kana(text):
+    """히라가나/가타카나만 추출"""
+    kana = ''
+    for char in text:
+        if '\u3040' <= char <= '\u309F':  # 히라가나
+            kana += HIRAGANA_TO_KATAKANA.get(char, char)
+        elif '\u30A0' <= char <= '\u30FF':  # 가타카나
+            kana += char
+    return kana
+
+
+def kana_to_korean(kana):
+    """가타카나를 한글로 변환 (기본 발음)"""
+    result = ''
+    i = 0
+    while i < len(kana):
+        char = kana[i]
+
+        # 요음 처리 (キャ, シュ 등)
+        if i + 1 < len(kana) and kana[i+1] in 'ャュョァィゥェォ':
+            combo = char + kana[i+1]
+            # 특수 조합
+            if combo in ['キャ', 'キュ', 'キョ']:
+                result += {'キャ': '캬', 'キュ': '큐', 'キョ': '쿄'}[combo]
+            elif combo in ['シャ', 'シュ', 'ショ']:
+                result += {'シャ': '샤', 'シュ': '슈', 'ショ': '쇼'}[combo]
+            elif combo in ['チャ', 'チュ', 'チョ']:
+                result += {'チャ': '차', 'チュ': '추', 'チョ': '초'}[combo]
+            elif combo in ['ニャ', 'ニュ', 'ニョ']:
+                result += {'ニャ': '냐', 'ニュ': '뉴', 'ニョ': '뇨'}[combo]
+            elif combo in ['ヒャ', 'ヒュ', 'ヒョ']:
+                result += {'ヒャ': '햐', 'ヒュ': '휴', 'ヒョ': '효'}[combo]
+            elif combo in ['ミャ', 'ミュ', 'ミョ']:
+                result += {'ミャ': '먀', 'ミュ': '뮤', 'ミョ': '묘'}[combo]
+            elif combo in ['リャ', 'リュ', 'リョ']:
+                result += {'リャ': '랴', 'リュ': '류', 'リョ': '료'}[combo]
+            elif combo in ['ギャ', 'ギュ', 'ギョ']:
+                result += {'ギャ': '갸', 'ギュ': '규', 'ギョ': '교'}[combo]
+            elif combo in ['ジャ', 'ジュ', 'ジョ']:
+                result += {'ジャ': '쟈', 'ジュ': '쥬', 'ジョ': '죠'}[combo]
+            elif combo in ['ビャ', 'ビュ', 'ビョ']:
+                result += {'ビャ': '뱌', 'ビュ': '뷰', 'ビョ': '뵤'}[combo]
+            elif combo in ['ピャ', 'ピュ', 'ピョ']:
+                result += {'ピャ': '퍄', 'ピュ': '퓨', 'ピョ': '표'}[combo]
+            # 외래어 표기
+            elif combo in ['ファ', 'フィ', 'フェ', 'フォ']:
+                result += {'ファ': '파', 'フィ': '피', 'フェ': '페', 'フォ': '포'}[combo]
+            elif combo in ['ティ', 'ディ']:
+                result += {'ティ': '티', 'ディ': '디'}[combo]
+            elif combo in ['ヴァ', 'ヴィ', 'ヴェ', 'ヴォ']:
+                result += {'ヴァ': '바', 'ヴィ': '비', 'ヴェ': '베', 'ヴォ': '보'}[combo]
+            else:
+                # 기본: 첫 글자 + 요음
+                result += KATAKANA_TO_KOREAN.get(char, '')
+                result += KATAKANA_TO_KOREAN.get(kana[i+1], '')
+            i += 2
+        else:
+            result += KATAKANA_TO_KOREAN.get(char, '')
+            i += 1
+
+    return result
+
+
+_HIRAGANA_START = 0x3041  # ぁ
+_HIRAGANA_END = 0x3096  # ゖ
+_KATAKANA_OFFSET = 0x60  # ぁ → ァ
+_KATAKANA_START = 0x30A1  # ァ
+_KATAKANA_END = 0x30FA  # ヺ
+
+# 이름 사이 구분 기호 (NFKC 이후 기준)
+_SEPARATORS = frozenset('・=·･')
+
+# 뒤에 오는 ウ를 장음으로 읽는 글자 (オ단 / ウ단)
+_LONG_U_AFTER = frozenset('オコゴソゾトドノホボポモヨョロヲウクグスズツヅヌフブプムユュルヴ')
+
+# 한글 음절 분해 (초성 19 × 중성 21 × 종성 28)
+_JUNGSUNG_COUNT = 21
+_JONGSUNG_COUNT = 28
+_JONGSUNG_N = 4  # ㄴ
+_JONGSUNG_S = 19  # ㅅ
+_LONG_U_VOWELS = frozenset((8, 12, 13, 17))  # ㅗ ㅛ ㅜ ㅠ
+
+
+def fold_kana(text: str) -> str:
+    """
+    일본어 표기 정규화 (공백/가운뎃점 제거)
+    NFKC(반각 가나·전각 영숫자 통일) → 소문자 → 히라가나를 가타카나로 → 장음(ー, オ단·ウ단 뒤 ウ) 제거
+    """
+    result = []
+    for char in unicodedata.normalize('NFKC', text).lower():
+        if char.isspace() or char in _SEPARATORS or char == 'ー':
+            continue
+        code = ord(char)
+        if _HIRAGANA_START <= code <= _HIRAGANA_END:
+            char = chr(code + _KATAKANA_OFFSET)
+        if char == 'ウ' and result and result[-1] in _LONG_U_AFTER:
+            continue
+        result.append(char)
+    return ''.join(result)
+
+
+def is_kana_text(text: str) -> bool:
+    """fold_kana 결과가 가타카나로만 되어 있는지"""
+    return bool(text) and all(_KATAKANA_START <= ord(char) <= _KATAKANA_END for char in text)
+
+
+def native_reading(text: str) -> str:
+    """
+    가나로만 된 일본어 이름/제목의 한글 읽기 (한자가 섞이면 읽을 수 없으므로 '')
+    예: "エレン・イェーガー" → "에렌이에가", "たんじろう" → "탄지로"
+    """
+    # 문장 부호/기호("！", "☆")는 읽기에서 제외
+    folded = ''.join(
+        char for char in fold_kana(text or '')
+        if not unicodedata.category(char).startswith(('P', 'S'))
+    )
+    if not is_kana_text(folded):
+        return ''
+    return fold_reading(kana_to_korean(folded))
+
+
+def fold_reading(text: str) -> str:
+    """
+    한글 읽기 비교용 정규화 (공백 제거)
+    - 단독 "은"(ン)은 앞 음절 받침 ㄴ으로: "타은지로" → "탄지로"
+    - 받침 ㅅ(ッ) 제거: "잇토" → "이토"
+    - ㅗ/ㅛ/ㅜ/ㅠ 뒤 장음 "우" 제거: "유우키" → "유키"
+    """
+    result = []
+    for char in text:
+        if char.isspace():
+            continue
+        previous = result[-1] if result and is_hangul_syllable(result[-1]) else None
+        if previous is not None and _jongsung(previous) == 0:
+            if char == '은':
+                result[-1] = chr(ord(previous) + _JONGSUNG_N)
+                continue
+            if char == '우' and _jungsung(previous) in _LONG_U_VOWELS:
+                continue
+        if is_hangul_syllable(char) and _jongsung(char) == _JONGSUNG_S:
+            char = chr(ord(char) - _JONGSUNG_S)
+        result.append(char)
+    return ''.join(result)
+
+
+def _jongsung(char: str) -> int:
+    return (ord(char) - 0xAC00) % _JONGSUNG_COUNT
+
+
+def _jungsung(char: str) -> int:
+    return (ord(char) - 0xAC00) // _JONGSUNG_COUNT % _JUNGSUNG_COUNT
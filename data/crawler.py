@@ -170,6 +170,8 @@ class AnimeCrawler:
         
         self.conn.commit()
         self._update_meta('total_anime', str(total_crawled))
+        self._bump_catalog_version()
+        self.conn.commit()
         print(f"\n✅ 애니메이션: {total_crawled}개 완료")
     
     def _save_anime(self, anime: Dict):
@@ -575,6 +577,17 @@ class AnimeCrawler:
             VALUES (?, ?, ?)
         ''', (key, value, datetime.now().isoformat()))
     
+    def _bump_catalog_version(self):
+        """백엔드 카탈로그 스냅샷/캐시 재구성 신호"""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT INTO crawl_meta (key, value, updated_at)
+            VALUES ('catalog_version', '1', ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = CAST(COALESCE(CAST(value AS INTEGER), 0) + 1 AS TEXT),
+                updated_at = excluded.updated_at
+        ''', (datetime.now().isoformat(),))
+
     def init_db(self):
         """DB 초기화"""
         with open('schema.sql', 'r') as f:
@@ -59,8 +59,24 @@ class AnimeDB:
         return anime
     
     def search_anime(self, query: str, limit: int = 20) -> List[Dict]:
-        """애니메이션 검색"""
+        """애니메이션 검색 (백엔드가 만든 anime_fts 인덱스 사용, 없으면 LIKE)"""
         cursor = self.conn.cursor()
+        compact = ''.join(query.split())
+        if len(compact) >= 3:
+            try:
+                cursor.execute('''
+                    SELECT a.id, a.title_romaji, a.title_english, a.title_native,
+                           a.cover_image_url, a.average_score, a.popularity, a.episodes, a.format
+                    FROM anime_fts f
+                    JOIN anime a ON a.id = f.rowid
+                    WHERE anime_fts MATCH ?
+                    ORDER BY a.popularity DESC
+                    LIMIT ?
+                ''', ('"' + compact.replace('"', '""') + '"', limit))
+                return [dict(r) for r in cursor.fetchall()]
+            except sqlite3.OperationalError:
+                pass  # 인덱스가 아직 없는 DB
+
         search = f'%{query}%'
         cursor.execute('''
             SELECT id, title_romaji, title_english, title_native,
@@ -18,132 +18,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
 
 from database import db
+# 가타카나/히라가나 변환 테이블은 검색 인덱스와 공유
+from utils.kana import extract_kana, kana_to_korean
 
 
 def log(msg):
     print(msg, flush=True)
 
 
-# 가타카나→한글 변환 테이블 (발음 기반)
-KATAKANA_TO_KOREAN = {
-    # 기본 모음
-    'ア': '아', 'イ': '이', 'ウ': '우', 'エ': '에', 'オ': '오',
-    # カ행
-    'カ': '카', 'キ': '키', 'ク': '쿠', 'ケ': '케', 'コ': '코',
-    'ガ': '가', 'ギ': '기', 'グ': '구', 'ゲ': '게', 'ゴ': '고',
-    # サ행
-    'サ': '사', 'シ': '시', 'ス': '스', 'セ': '세', 'ソ': '소',
-    'ザ': '자', 'ジ': '지', 'ズ': '즈', 'ゼ': '제', 'ゾ': '조',
-    # タ행
-    'タ': '타', 'チ': '치', 'ツ': '츠', 'テ': '테', 'ト': '토',
-    'ダ': '다', 'ヂ': '지', 'ヅ': '즈', 'デ': '데', 'ド': '도',
-    # ナ행
-    'ナ': '나', 'ニ': '니', 'ヌ': '누', 'ネ': '네', 'ノ': '노',
-    # ハ행
-    'ハ': '하', 'ヒ': '히', 'フ': '후', 'ヘ': '헤', 'ホ': '호',
-    'バ': '바', 'ビ': '비', 'ブ': '부', 'ベ': '베', 'ボ': '보',
-    'パ': '파', 'ピ': '피', 'プ': '푸', 'ペ': '페', 'ポ': '포',
-    # マ행
-    'マ': '마', 'ミ': '미', 'ム': '무', 'メ': '메', 'モ': '모',
-    # ヤ행
-    'ヤ': '야', 'ユ': '유', 'ヨ': '요',
-    # ラ행
-    'ラ': '라', 'リ': '리', 'ル': '루', 'レ': '레', 'ロ': '로',
-    # ワ행
-    'ワ': '와', 'ヲ': '오', 'ン': '은',
-    # 소문자 (요음)
-    'ャ': '야', 'ュ': '유', 'ョ': '요',
-    'ッ': '', 'ー': '',  # 촉음, 장음
-    # 확장
-    'ヴ': '브',
-    'ァ': '아', 'ィ': '이', 'ゥ': '우', 'ェ': '에', 'ォ': '오',
-}
-
-# 히라가나→가타카나 변환 (발음 동일)
-HIRAGANA_TO_KATAKANA = {
-    'あ': 'ア', 'い': 'イ', 'う': 'ウ', 'え': 'エ', 'お': 'オ',
-    'か': 'カ', 'き': 'キ', 'く': 'ク', 'け': 'ケ', 'こ': 'コ',
-    'が': 'ガ', 'ぎ': 'ギ', 'ぐ': 'グ', 'げ': 'ゲ', 'ご': 'ゴ',
-    'さ': 'サ', 'し': 'シ', 'す': 'ス', 'せ': 'セ', 'そ': 'ソ',
-    'ざ': 'ザ', 'じ': 'ジ', 'ず': 'ズ', 'ぜ': 'ゼ', 'ぞ': 'ゾ',
-    'た': 'タ', 'ち': 'チ', 'つ': 'ツ', 'て': 'テ', 'と': 'ト',
-    'だ': 'ダ', 'ぢ': 'ヂ', 'づ': 'ヅ', 'で': 'デ', 'ど': 'ド',
-    'な': 'ナ', 'に': 'ニ', 'ぬ': 'ヌ', 'ね': 'ネ', 'の': 'ノ',
-    'は': 'ハ', 'ひ': 'ヒ', 'ふ': 'フ', 'へ': 'ヘ', 'ほ': 'ホ',
-    'ば': 'バ', 'び': 'ビ', 'ぶ': 'ブ', 'べ': 'ベ', 'ぼ': 'ボ',
-    'ぱ': 'パ', 'ぴ': 'ピ', 'ぷ': 'プ', 'ぺ': 'ペ', 'ぽ': 'ポ',
-    'ま': 'マ', 'み': 'ミ', 'む': 'ム', 'め': 'メ', 'も': 'モ',
-    'や': 'ヤ', 'ゆ': 'ユ', 'よ': 'ヨ',
-    'ら': 'ラ', 'り': 'リ', 'る': 'ル', 'れ': 'レ', 'ろ': 'ロ',
-    'わ': 'ワ', 'を': 'ヲ', 'ん': 'ン',
-    'ゃ': 'ャ', 'ゅ': 'ュ', 'ょ': 'ョ',
-    'っ': 'ッ',
-}
-
-
-def extract_kana(text):
-    """히라가나/가타카나만 추출"""
-    kana = ''
-    for char in text:
-        if '\u3040' <= char <= '\u309F':  # 히라가나
-            kana += HIRAGANA_TO_KATAKANA.get(char, char)
-        elif '\u30A0' <= char <= '\u30FF':  # 가타카나
-            kana += char
-    return kana
-
-
-def kana_to_korean(kana):
-    """가타카나를 한글로 변환 (기본 발음)"""
-    result = ''
-    i = 0
-    while i < len(kana):
-        char = kana[i]
-
-        # 요음 처리 (キャ, シュ 등)
-        if i + 1 < len(kana) and kana[i+1] in 'ャュョァィゥェォ':
-            combo = char + kana[i+1]
-            # 특수 조합
-            if combo in ['キャ', 'キュ', 'キョ']:
-                result += {'キャ': '캬', 'キュ': '큐', 'キョ': '쿄'}[combo]
-            elif combo in ['シャ', 'シュ', 'ショ']:
-                result += {'シャ': '샤', 'シュ': '슈', 'ショ': '쇼'}[combo]
-            elif combo in ['チャ', 'チュ', 'チョ']:
-                result += {'チャ': '차', 'チュ': '추', 'チョ': '초'}[combo]
-            elif combo in ['ニャ', 'ニュ', 'ニョ']:
-                result += {'ニャ': '냐', 'ニュ': '뉴', 'ニョ': '뇨'}[combo]
-            elif combo in ['ヒャ', 'ヒュ', 'ヒョ']:
-                result += {'ヒャ': '햐', 'ヒュ': '휴', 'ヒョ': '효'}[combo]
-            elif combo in ['ミャ', 'ミュ', 'ミョ']:
-                result += {'ミャ': '먀', 'ミュ': '뮤', 'ミョ': '묘'}[combo]
-            elif combo in ['リャ', 'リュ', 'リョ']:
-                result += {'リャ': '랴', 'リュ': '류', 'リョ': '료'}[combo]
-            elif combo in ['ギャ', 'ギュ', 'ギョ']:
-                result += {'ギャ': '갸', 'ギュ': '규', 'ギョ': '교'}[combo]
-            elif combo in ['ジャ', 'ジュ', 'ジョ']:
-                result += {'ジャ': '쟈', 'ジュ': '쥬', 'ジョ': '죠'}[combo]
-            elif combo in ['ビャ', 'ビュ', 'ビョ']:
-                result += {'ビャ': '뱌', 'ビュ': '뷰', 'ビョ': '뵤'}[combo]
-            elif combo in ['ピャ', 'ピュ', 'ピョ']:
-                result += {'ピャ': '퍄', 'ピュ': '퓨', 'ピョ': '표'}[combo]
-            # 외래어 표기
-            elif combo in ['ファ', 'フィ', 'フェ', 'フォ']:
-                result += {'ファ': '파', 'フィ': '피', 'フェ': '페', 'フォ': '포'}[combo]
-            elif combo in ['ティ', 'ディ']:
-                result += {'ティ': '티', 'ディ': '디'}[combo]
-            elif combo in ['ヴァ', 'ヴィ', 'ヴェ', 'ヴォ']:
-                result += {'ヴァ': '바', 'ヴィ': '비', 'ヴェ': '베', 'ヴォ': '보'}[combo]
-            else:
-                # 기본: 첫 글자 + 요음
-                result += KATAKANA_TO_KOREAN.get(char, '')
-                result += KATAKANA_TO_KOREAN.get(kana[i+1], '')
-            i += 2
-        else:
-            result += KATAKANA_TO_KOREAN.get(char, '')
-            i += 1
-
-    return result
-
-
 def normalize_korean(text):
     """한글 이름 정규화 (비교용)"""
     # 공백, 특수문자 제거